@@ -0,0 +1,342 @@
+"""Benchmark suite for the stats package.
+
+Times the calculator, the row formatter, the CSV writer and a full runner
+pass at scales from the shipped banner configs up to 100k-config sweeps,
+prints the results as JSON and compares them with a stored baseline.
+
+Run from the stats directory::
+
+    python -m benchmarks.run_benchmarks [--quick] [--output results.json]
+
+Each metric is the median of several calls. A fixed reference workload
+that no package change affects is timed in the same process, and baseline
+timings are scaled by how much slower or faster it ran than when the
+baseline was recorded, so the comparison holds across machines and load.
+
+The process exits with status 1 when any tracked metric is slower than its
+scaled baseline by more than the tolerance. ``--update-baseline`` records
+the current timings as the new baseline instead.
+"""
+
+import argparse
+import dataclasses
+import json
+import logging
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Final, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.calculator import ProbabilityCalculator
+from core.config.banner_config import BANNER_CONFIGS, BannerConfig
+from output.csv_handler import CSVOutputHandler
+from output.row_formatter import (
+    format_number,
+    format_results,
+    get_headers,
+)
+from runner import BannerStatisticsRunner
+
+BASELINE_PATH: Final[Path] = Path(__file__).with_name("baseline.json")
+DEFAULT_TOLERANCE: Final[float] = 1.5
+# Slowdowns smaller than this are timer noise, whatever the ratio
+MIN_REGRESSION_SECONDS: Final[float] = 0.005
+# Repeat a benchmark until this much time was spent, within the repeat limits
+MIN_TOTAL_SECONDS: Final[float] = 0.5
+MIN_REPEATS: Final[int] = 3
+MAX_REPEATS: Final[int] = 21
+# Metric of the fixed workload that baselines are scaled by
+REFERENCE_METRIC: Final[str] = "reference"
+# Sweeps beyond this size are skipped with --quick
+QUICK_LIMIT: Final[int] = 1_000
+
+SHIPPED: Final[str] = "shipped"
+SCALES: Final[Dict[str, int]] = {"1k": 1_000, "10k": 10_000, "100k": 100_000}
+
+# Takes the configs and a scratch directory, returns the function to time
+Setup = Callable[[Sequence[BannerConfig], Path], Callable[[], Any]]
+
+
+def shipped_configs() -> List[BannerConfig]:
+    """Return every banner config that ships with the package."""
+    return [
+        config for banners in BANNER_CONFIGS.values() for config in banners.values()
+    ]
+
+
+def sweep_configs(count: int) -> List[BannerConfig]:
+    """Build ``count`` configs with distinct calculation parameters.
+
+    The shipped configs are cycled through with a slightly different base
+    rate each time, so no two configs share a calculation cache entry.
+
+    Args:
+        count: Number of configs
+
+    Returns:
+        List of valid banner configs
+    """
+    shipped = shipped_configs()
+    return [
+        dataclasses.replace(
+            shipped[i % len(shipped)],
+            base_rate=shipped[i % len(shipped)].base_rate * (1.0 + i / (10 * count)),
+        )
+        for i in range(count)
+    ]
+
+
+def configs_for(scale: str) -> List[BannerConfig]:
+    """Return the configs of a named scale."""
+    return shipped_configs() if scale == SHIPPED else sweep_configs(SCALES[scale])
+
+
+def as_games(configs: Sequence[BannerConfig]) -> Dict[str, Dict[str, BannerConfig]]:
+    """Group configs by game the way the runner expects, one key per config."""
+    games: Dict[str, Dict[str, BannerConfig]] = {}
+    for i, config in enumerate(configs):
+        games.setdefault(config.game_name, {})[f"banner_{i}"] = config
+    return games
+
+
+def time_call(func: Callable[[], Any]) -> Dict[str, Any]:
+    """Time repeated calls of a function.
+
+    Args:
+        func: Function to benchmark, called with no arguments
+
+    Returns:
+        Dictionary with the repeat count, best, median and mean seconds
+    """
+    timings: List[float] = []
+    while len(timings) < MIN_REPEATS or (
+        len(timings) < MAX_REPEATS and sum(timings) < MIN_TOTAL_SECONDS
+    ):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {
+        "repeats": len(timings),
+        "best_s": min(timings),
+        "median_s": float(np.median(timings)),
+        "mean_s": sum(timings) / len(timings),
+    }
+
+
+def reference_workload() -> None:
+    """Fixed Python and NumPy work measuring the speed of the machine."""
+    total = 0.0
+    for i in range(200_000):
+        total += (i % 7) * 0.5
+    values = np.arange(1_000_000, dtype=np.float64)
+    np.cumsum(np.sqrt(values))
+
+
+def bench_calculator(configs: Sequence[BannerConfig], _: Path) -> Callable[[], Any]:
+    """Calculate the curves of every config."""
+    return lambda: [
+        ProbabilityCalculator(config).calculate_probabilities() for config in configs
+    ]
+
+
+def bench_format_number(configs: Sequence[BannerConfig], _: Path) -> Callable[[], Any]:
+    """Format the cumulative column of every config one number at a time."""
+    values = [
+        value
+        for config in configs
+        for value in ProbabilityCalculator(config).calculate_probabilities()[1]
+    ]
+    return lambda: [format_number(value) for value in values]
+
+
+def bench_format_results(configs: Sequence[BannerConfig], _: Path) -> Callable[[], Any]:
+    """Format the rows of every config."""
+    curves = [ProbabilityCalculator(c).calculate_probabilities() for c in configs]
+    return lambda: [
+        format_results(config, *probabilities)
+        for config, probabilities in zip(configs, curves)
+    ]
+
+
+def bench_csv_write(
+    configs: Sequence[BannerConfig], workdir: Path
+) -> Callable[[], Any]:
+    """Write the formatted rows of every config to one CSV file."""
+    rows = [
+        row
+        for config in configs
+        for row in format_results(
+            config, *ProbabilityCalculator(config).calculate_probabilities()
+        )
+    ]
+    handler = CSVOutputHandler()
+    path = str(workdir / "bench.csv")
+    return lambda: handler.write(path, get_headers(), rows)
+
+
+def bench_runner(configs: Sequence[BannerConfig], workdir: Path) -> Callable[[], Any]:
+    """Run the whole pipeline with a fresh cache on every call."""
+    games = as_games(configs)
+    logger = logging.getLogger("benchmarks.runner")
+    logger.setLevel(logging.WARNING)
+    return lambda: BannerStatisticsRunner(
+        banner_configs=games, logger=logger, output_dir=str(workdir / "runner")
+    ).run()
+
+
+# Benchmark name -> (setup function, scales it runs at)
+BENCHMARKS: Final[Dict[str, Tuple[Setup, Tuple[str, ...]]]] = {
+    "calculate_probabilities": (bench_calculator, (SHIPPED, "1k", "10k", "100k")),
+    "format_number": (bench_format_number, (SHIPPED, "1k")),
+    "format_results": (bench_format_results, (SHIPPED, "1k", "10k")),
+    "csv_write": (bench_csv_write, (SHIPPED, "1k", "10k")),
+    "runner": (bench_runner, (SHIPPED, "1k", "10k")),
+}
+
+
+def run_benchmarks(
+    quick: bool = False, only: Optional[Sequence[str]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """Run the benchmark suite.
+
+    Args:
+        quick: Skip sweeps larger than QUICK_LIMIT configs
+        only: Benchmark names to run (defaults to all)
+
+    Returns:
+        Results keyed by metric name ``"<benchmark>[<scale>]"``, plus
+        REFERENCE_METRIC
+    """
+    results: Dict[str, Dict[str, Any]] = {
+        REFERENCE_METRIC: time_call(reference_workload)
+    }
+    with tempfile.TemporaryDirectory() as temp_dir:
+        workdir = Path(temp_dir)
+        for name, (setup, scales) in BENCHMARKS.items():
+            if only and name not in only:
+                continue
+            for scale in scales:
+                if quick and SCALES.get(scale, 0) > QUICK_LIMIT:
+                    continue
+                configs = configs_for(scale)
+                timing = time_call(setup(configs, workdir))
+                timing["configs"] = len(configs)
+                timing["per_config_us"] = timing["median_s"] / len(configs) * 1e6
+                results[f"{name}[{scale}]"] = timing
+    return results
+
+
+def compare_to_baseline(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, float],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> List[str]:
+    """Find metrics that regressed past the baseline.
+
+    Only metrics present in both results and baseline are compared. When
+    both hold REFERENCE_METRIC, baselines are first scaled by the ratio of
+    its current to its recorded time.
+
+    Args:
+        results: Output of run_benchmarks
+        baseline: Median seconds per metric name
+        tolerance: Allowed slowdown factor
+
+    Returns:
+        One message per regressed metric
+    """
+    scale = 1.0
+    if REFERENCE_METRIC in results and baseline.get(REFERENCE_METRIC):
+        scale = results[REFERENCE_METRIC]["median_s"] / baseline[REFERENCE_METRIC]
+
+    regressions = []
+    for metric, timing in results.items():
+        if metric == REFERENCE_METRIC or metric not in baseline:
+            continue
+        expected = baseline[metric] * scale
+        limit = max(expected * tolerance, expected + MIN_REGRESSION_SECONDS)
+        if timing["median_s"] > limit:
+            regressions.append(
+                f"{metric}: {timing['median_s']:.4f}s exceeds {limit:.4f}s "
+                f"(baseline {baseline[metric]:.4f}s, machine factor {scale:.2f})"
+            )
+    return regressions
+
+
+def load_baseline(path: Path) -> Dict[str, float]:
+    """Load the stored median seconds per metric, empty if there is no file."""
+    if not path.exists():
+        return {}
+    with open(path, encoding="utf-8") as file:
+        return {k: float(v) for k, v in json.load(file)["metrics"].items()}
+
+
+def save_baseline(path: Path, results: Dict[str, Dict[str, Any]]) -> None:
+    """Store the median seconds of each metric as the new baseline.
+
+    Recorded metrics missing from the results are rescaled to the new
+    reference time, so that a partial run keeps the baseline consistent.
+    """
+    baseline = load_baseline(path)
+    if REFERENCE_METRIC in results and baseline.get(REFERENCE_METRIC):
+        scale = results[REFERENCE_METRIC]["median_s"] / baseline[REFERENCE_METRIC]
+        baseline = {metric: seconds * scale for metric, seconds in baseline.items()}
+    baseline.update({metric: t["median_s"] for metric, t in results.items()})
+    data = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "metrics": dict(sorted(baseline.items())),
+    }
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=2)
+        file.write("\n")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the suite from the command line and return the exit status."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="skip large sweeps")
+    parser.add_argument(
+        "--only", nargs="+", choices=list(BENCHMARKS), help="benchmarks to run"
+    )
+    parser.add_argument("--output", type=Path, help="write JSON results here")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="record these timings as the baseline instead of comparing",
+    )
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(quick=args.quick, only=args.only)
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    encoded = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(encoded + "\n", encoding="utf-8")
+    else:
+        print(encoded)
+
+    if args.update_baseline:
+        save_baseline(args.baseline, results)
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+        return 0
+
+    regressions = compare_to_baseline(
+        results, load_baseline(args.baseline), args.tolerance
+    )
+    for message in regressions:
+        print(f"REGRESSION {message}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""Batched probability calculation over many banner parameter sets.
+
+All curves are computed in one pass over a 2D array of shape
+``(n_configs, max_hard_pity)``. Rows with a shorter hard pity are padded
+with zero per-roll and first 5* probability, and the cumulative curve holds
+its final value past hard pity.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Sequence, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from core.calculator import FloatArray
+from core.common.errors import ValidationError
+from core.config.banner_config import MAX_HARD_PITY, BannerConfig
+
+IntArray = npt.NDArray[np.int64]
+BoolArray = npt.NDArray[np.bool_]
+
+
+def _pity_column(values: npt.ArrayLike) -> npt.NDArray[Any]:
+    """Integer pity column as int64, other dtypes left for validate to reject."""
+    array = np.asarray(values)
+    if array.dtype.kind in "iu" or array.size == 0:
+        return array.astype(np.int64)
+    return array
+
+
+@dataclass(frozen=True)
+class BatchParameters:
+    """Struct-of-arrays view of the pity parameters of many banners."""
+
+    base_rate: FloatArray
+    soft_pity_start_after: IntArray
+    hard_pity: IntArray
+    rate_increase: FloatArray
+
+    @classmethod
+    def from_columns(
+        cls,
+        base_rate: npt.ArrayLike,
+        soft_pity_start_after: npt.ArrayLike,
+        hard_pity: npt.ArrayLike,
+        rate_increase: npt.ArrayLike,
+    ) -> "BatchParameters":
+        """Build batch parameters from column arrays.
+
+        Args:
+            base_rate: Base 5* rate per config
+            soft_pity_start_after: Last roll before soft pity per config
+            hard_pity: Hard pity roll per config
+            rate_increase: Soft pity rate increase per config
+
+        Returns:
+            Validated batch parameters
+
+        Raises:
+            ValidationError: If the columns are malformed or out of range
+        """
+        params = cls(
+            base_rate=np.asarray(base_rate, dtype=np.float64),
+            soft_pity_start_after=_pity_column(soft_pity_start_after),
+            hard_pity=_pity_column(hard_pity),
+            rate_increase=np.asarray(rate_increase, dtype=np.float64),
+        )
+        params.validate()
+        return params
+
+    @classmethod
+    def from_configs(cls, configs: Sequence[BannerConfig]) -> "BatchParameters":
+        """Build batch parameters from banner configurations.
+
+        Args:
+            configs: Banner configurations to stack
+
+        Returns:
+            Batch parameters with one row per config
+        """
+        return cls.from_columns(
+            base_rate=[c.base_rate for c in configs],
+            soft_pity_start_after=[c.soft_pity_start_after for c in configs],
+            hard_pity=[c.hard_pity for c in configs],
+            rate_increase=[c.rate_increase for c in configs],
+        )
+
+    def __len__(self) -> int:
+        return int(self.base_rate.shape[0])
+
+    def validate(self) -> None:
+        """Check column shapes and types and the ranges BannerConfig allows.
+
+        Raises:
+            ValidationError: If the columns are malformed or out of range
+        """
+        columns = (
+            self.base_rate,
+            self.soft_pity_start_after,
+            self.hard_pity,
+            self.rate_increase,
+        )
+        if any(column.ndim != 1 for column in columns):
+            raise ValidationError("Batch columns must be one-dimensional")
+        if len({column.shape[0] for column in columns}) != 1:
+            raise ValidationError("Batch columns must have the same length")
+        if any(
+            column.dtype.kind not in "iu"
+            for column in (self.soft_pity_start_after, self.hard_pity)
+        ):
+            raise ValidationError("Pity values must be integers")
+        if not np.all(
+            (1 <= self.soft_pity_start_after)
+            & (self.soft_pity_start_after <= self.hard_pity)
+            & (self.hard_pity <= MAX_HARD_PITY)
+        ):
+            raise ValidationError("Invalid pity values")
+        if not np.all((0.0 <= self.base_rate) & (self.base_rate <= 1.0)):
+            raise ValidationError("Base rate must be between 0 and 1")
+        if not np.all((0.0 <= self.rate_increase) & (self.rate_increase <= 1.0)):
+            raise ValidationError("Rate increase must be between 0 and 1")
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    """Padded probability curves for a batch of banners."""
+
+    per_roll: FloatArray
+    cumulative: FloatArray
+    first_5star: FloatArray
+    mask: BoolArray
+    hard_pity: IntArray
+
+    def curves(self, index: int) -> Tuple[FloatArray, FloatArray, FloatArray]:
+        """Return the unpadded curves of one config.
+
+        Args:
+            index: Row of the config in the batch
+
+        Returns:
+            tuple: (per_roll_prob, cumulative_prob, first_5star_prob) views
+        """
+        length = int(self.hard_pity[index])
+        return (
+            self.per_roll[index, :length],
+            self.cumulative[index, :length],
+            self.first_5star[index, :length],
+        )
+
+
+def calculate_batch(params: BatchParameters) -> BatchResult:
+    """Calculate the probability curves of every config in the batch.
+
+    Each row matches ``ProbabilityCalculator.calculate_probability_arrays``
+    for the same parameters up to its hard pity.
+
+    Args:
+        params: Batch parameters to evaluate
+
+    Returns:
+        Padded 2D curves with a validity mask
+    """
+    hard_pity = params.hard_pity
+    max_hard_pity = int(hard_pity.max()) if len(params) else 1
+
+    rolls = np.arange(1, max_hard_pity + 1, dtype=np.float64)[np.newaxis, :]
+    rolls_into_soft_pity = rolls - params.soft_pity_start_after[:, np.newaxis]
+    base_rate = params.base_rate[:, np.newaxis]
+
+    per_roll = np.where(
+        rolls_into_soft_pity <= 0,
+        base_rate,
+        np.minimum(
+            1.0, base_rate + params.rate_increase[:, np.newaxis] * rolls_into_soft_pity
+        ),
+    )
+    per_roll[rolls == hard_pity[:, np.newaxis]] = 1.0  # Hard pity
+    mask = rolls <= hard_pity[:, np.newaxis]
+    per_roll[~mask] = 0.0
+
+    # Survival drops to zero at hard pity, which zeroes the padded tail
+    no_5star = np.empty_like(per_roll)
+    no_5star[:, 0] = 1.0
+    np.cumprod(1.0 - per_roll[:, :-1], axis=1, out=no_5star[:, 1:])
+
+    first_5star = no_5star * per_roll
+    cumulative = np.cumsum(first_5star, axis=1)
+
+    return BatchResult(
+        per_roll=per_roll,
+        cumulative=cumulative,
+        first_5star=first_5star,
+        mask=mask,
+        hard_pity=hard_pity,
+    )
@@ -0,0 +1,135 @@
+"""In-process result caches for banner calculations.
+
+Results are keyed on the numeric parameters that drive the calculation, not
+on game or banner names, so banners that share the same numbers across
+games are computed once and shared.
+"""
+
+from collections import OrderedDict
+from typing import Callable, Final, Generic, List, Optional, Tuple, TypeVar
+
+from core.calculator import ProbabilityCalculator
+from core.config.banner_config import BannerConfig
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+DEFAULT_CACHE_SIZE: Final[int] = 1024
+
+CalculationKey = Tuple[float, int, int, float]
+ProbabilityCurves = Tuple[List[float], List[float], List[float]]
+
+
+def calculation_key(config: BannerConfig) -> CalculationKey:
+    """Return the fingerprint of the fields used by the probability curves.
+
+    Args:
+        config: Banner configuration
+
+    Returns:
+        Tuple of (base_rate, soft_pity_start_after, hard_pity, rate_increase)
+    """
+    return (
+        float(config.base_rate),
+        config.soft_pity_start_after,
+        config.hard_pity,
+        float(config.rate_increase),
+    )
+
+
+class LRUCache(Generic[K, V]):
+    """Size-bounded mapping with least-recently-used eviction."""
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE) -> None:
+        """
+        Initialize an empty cache.
+
+        Args:
+            maxsize: Maximum number of entries kept
+        """
+        if maxsize < 1:
+            raise ValueError("Cache size must be positive")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[K, V]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def get(self, key: K) -> Optional[V]:
+        """Return a cached value and mark it as recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None on a miss
+        """
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key: K, value: V) -> None:
+        """Store a value, evicting the least recently used entry if full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def get_or_compute(self, key: K, compute: Callable[[], V]) -> V:
+        """Return a cached value, computing and storing it on a miss.
+
+        Args:
+            key: Cache key
+            compute: Function producing the value
+
+        Returns:
+            Cached or freshly computed value
+        """
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        self.misses += 1
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Remove every entry and reset the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+class CalculationCache(LRUCache[CalculationKey, ProbabilityCurves]):
+    """Cache of probability curves shared by banners with equal parameters.
+
+    Cached curves are shared between callers and must not be mutated.
+    """
+
+    def curves(self, config: BannerConfig) -> ProbabilityCurves:
+        """Return the probability curves of a banner.
+
+        Args:
+            config: Banner configuration
+
+        Returns:
+            tuple: (per_roll_prob, cumulative_prob, first_5star_prob)
+        """
+        return self.get_or_compute(
+            calculation_key(config),
+            lambda: ProbabilityCalculator(config).calculate_probabilities(),
+        )
@@ -1,9 +1,45 @@
 """Probability calculator for gacha banners."""
 
-from typing import List, Tuple
+from typing import Final, List, Tuple
+
+import numpy as np
+import numpy.typing as npt
 
 from core.config.banner_config import BannerConfig
 
+FloatArray = npt.NDArray[np.float64]
+
+# Bump when a change alters calculated values, to invalidate stored outputs
+ENGINE_VERSION: Final[str] = "1"
+
+
+def hazard_vector(
+    base_rate: float, soft_pity_start: int, hard_pity: int, rate_increase: float
+) -> FloatArray:
+    """Build the per-roll 5* rate for rolls 1..hard_pity.
+
+    Args:
+        base_rate: Rate before soft pity kicks in
+        soft_pity_start: Last roll that still uses the base rate
+        hard_pity: Roll on which a 5* is guaranteed
+        rate_increase: Rate added per roll into soft pity
+
+    Returns:
+        Array of length hard_pity with the chance of a 5* on each roll
+    """
+    rolls = np.arange(1, hard_pity + 1, dtype=np.float64)
+    rolls_into_soft_pity = rolls - soft_pity_start
+    hazard = np.where(
+        rolls_into_soft_pity <= 0,
+        base_rate,
+        np.minimum(1.0, base_rate + rate_increase * rolls_into_soft_pity),
+    )
+    # Hard pity, even when soft pity starts no earlier. The original loop
+    # checked soft pity first and kept base_rate on the last roll when
+    # soft_pity_start == hard_pity; every engine relies on this guarantee.
+    hazard[-1] = 1.0
+    return hazard
+
 
 class ProbabilityCalculator:
     """Calculates banner probabilities."""
@@ -11,6 +47,32 @@ class ProbabilityCalculator:
     def __init__(self, config: "BannerConfig"):
         self.config = config
 
+    def calculate_probability_arrays(self) -> Tuple[FloatArray, FloatArray, FloatArray]:
+        """Calculate probabilities for all rolls as NumPy arrays.
+
+        The survival product and cumulative sum are accumulated in roll order,
+        so the values match the element-by-element definition exactly.
+
+        Returns:
+            tuple: (per_roll_prob, cumulative_prob, first_5star_prob) arrays
+        """
+        per_roll = hazard_vector(
+            self.config.base_rate,
+            self.config.soft_pity_start_after,
+            self.config.hard_pity,
+            self.config.rate_increase,
+        )
+
+        # Chance of still having no 5* before each roll
+        no_5star = np.empty_like(per_roll)
+        no_5star[0] = 1.0
+        np.cumprod(1.0 - per_roll[:-1], out=no_5star[1:])
+
+        first_5star = no_5star * per_roll
+        cumulative = np.cumsum(first_5star)
+
+        return per_roll, cumulative, first_5star
+
     def calculate_probabilities(self) -> Tuple[List[float], List[float], List[float]]:
         """Calculate and return probabilities for all rolls.
 
@@ -22,38 +84,5 @@ class ProbabilityCalculator:
         Returns:
             tuple: (per_roll_prob, cumulative_prob, first_5star_prob)
         """
-        base_rate = self.config.base_rate
-        soft_pity_start = self.config.soft_pity_start_after
-        hard_pity = self.config.hard_pity
-        rate_increase = self.config.rate_increase
-
-        # Calculate per roll probabilities
-        per_roll = []
-        for i in range(hard_pity):
-            roll_number = i + 1  # Convert 0-based index to 1-based roll number
-
-            if roll_number <= soft_pity_start:
-                prob = base_rate
-            elif roll_number == hard_pity:
-                prob = 1.0  # Hard pity
-            else:
-                # Apply the rate increase formula during soft pity
-                rolls_into_soft_pity = roll_number - soft_pity_start
-                prob = min(1.0, base_rate + (rate_increase * rolls_into_soft_pity))
-            per_roll.append(prob)
-
-        # Calculate first 5* probability (chance to get first 5* on exactly this roll)
-        first_5star = []
-        no_5star_prob = 1.0
-        for prob in per_roll:
-            first_5star.append(no_5star_prob * prob)
-            no_5star_prob *= 1.0 - prob
-
-        # Calculate cumulative probability (chance to get at least one 5* by this roll)
-        cumulative = []
-        running_prob = 0.0
-        for prob in first_5star:
-            running_prob += prob
-            cumulative.append(running_prob)
-
-        return per_roll, cumulative, first_5star
+        per_roll, cumulative, first_5star = self.calculate_probability_arrays()
+        return per_roll.tolist(), cumulative.tolist(), first_5star.tolist()
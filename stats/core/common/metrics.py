@@ -0,0 +1,141 @@
+"""Per-stage timing and counters for calculation runs.
+
+Stages are keyed by name, game and banner, where game and banner are None
+for stages that are not specific to one. A disabled collector records
+nothing and hands out a shared scratch record, so instrumented code costs
+close to nothing when metrics are off.
+"""
+
+import json
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+StageKey = Tuple[str, Optional[str], Optional[str]]
+
+
+@dataclass
+class StageMetrics:
+    """Accumulated measurements of one stage."""
+
+    stage: str
+    game: Optional[str] = None
+    banner: Optional[str] = None
+    seconds: float = 0.0
+    rows: int = 0
+    bytes_written: int = 0
+    calls: int = 0
+
+
+# Written to by disabled collectors and never read
+_DISCARDED = StageMetrics("discarded")
+
+
+class RunMetrics:
+    """Collects stage metrics for one run."""
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self._stages: Dict[StageKey, StageMetrics] = {}
+
+    def reset(self) -> None:
+        """Drop everything recorded so far."""
+        self._stages.clear()
+
+    def get(
+        self, stage: str, game: Optional[str] = None, banner: Optional[str] = None
+    ) -> Optional[StageMetrics]:
+        """Return the record of a stage, or None if it was never recorded."""
+        return self._stages.get((stage, game, banner))
+
+    def _record(
+        self, stage: str, game: Optional[str], banner: Optional[str]
+    ) -> StageMetrics:
+        key = (stage, game, banner)
+        record = self._stages.get(key)
+        if record is None:
+            record = self._stages[key] = StageMetrics(stage, game, banner)
+        return record
+
+    @contextmanager
+    def stage(
+        self, stage: str, game: Optional[str] = None, banner: Optional[str] = None
+    ) -> Iterator[StageMetrics]:
+        """Time a block and count it as one call of the stage.
+
+        The yielded record can be used to add rows and bytes. Time is
+        recorded even if the block raises.
+
+        Args:
+            stage: Stage name, such as "calculate" or "write"
+            game: Game the stage belongs to
+            banner: Banner the stage belongs to
+
+        Yields:
+            The stage's record
+        """
+        if not self.enabled:
+            yield _DISCARDED
+            return
+        record = self._record(stage, game, banner)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.seconds += time.perf_counter() - start
+            record.calls += 1
+
+    def add(
+        self,
+        stage: str,
+        game: Optional[str] = None,
+        banner: Optional[str] = None,
+        seconds: float = 0.0,
+        rows: int = 0,
+        bytes_written: int = 0,
+    ) -> None:
+        """Add measurements taken outside ``stage`` to a stage."""
+        if not self.enabled:
+            return
+        record = self._record(stage, game, banner)
+        record.seconds += seconds
+        record.rows += rows
+        record.bytes_written += bytes_written
+        record.calls += 1
+
+    def seconds(self, stages: Iterable[str], game: Optional[str] = None) -> float:
+        """Total time of the given stages, optionally for one game only."""
+        names = set(stages)
+        return sum(
+            record.seconds
+            for record in self._stages.values()
+            if record.stage in names and (game is None or record.game == game)
+        )
+
+    def records(self) -> List[StageMetrics]:
+        """All records, in the order they were first seen."""
+        return list(self._stages.values())
+
+    def totals(self) -> Dict[str, StageMetrics]:
+        """Records summed over games and banners, one per stage name."""
+        totals: Dict[str, StageMetrics] = {}
+        for record in self._stages.values():
+            total = totals.setdefault(record.stage, StageMetrics(record.stage))
+            total.seconds += record.seconds
+            total.rows += record.rows
+            total.bytes_written += record.bytes_written
+            total.calls += record.calls
+        return totals
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the metrics as JSON-serializable data."""
+        return {
+            "totals": [asdict(record) for record in self.totals().values()],
+            "stages": [asdict(record) for record in self.records()],
+        }
+
+    def dump(self, path: str) -> None:
+        """Write the metrics to a JSON file."""
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, indent=2)
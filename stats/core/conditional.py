@@ -0,0 +1,107 @@
+"""Precomputed conditional probabilities for every starting pity.
+
+Tables are indexed ``[..., pity, pulls]``: the chance of success within
+``pulls`` more pulls for a player currently at ``pity``. Once built, every
+query is a single array lookup.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from core.calculator import FloatArray
+from core.common.errors import ValidationError
+from core.config.banner_config import BannerConfig
+from core.markov import MarkovChainEngine
+
+
+class ConditionalTable:
+    """Cumulative probabilities for every (current pity, pulls) pair."""
+
+    def __init__(self, config: BannerConfig, max_pulls: Optional[int] = None) -> None:
+        """
+        Initialize and build the tables.
+
+        Args:
+            config: Banner configuration
+            max_pulls: Largest horizon stored (defaults to twice the hard pity)
+        """
+        self.config = config
+        self.max_pulls = 2 * config.hard_pity if max_pulls is None else max_pulls
+        if self.max_pulls < 0:
+            raise ValidationError(
+                f"Max pulls must be non-negative, got {self.max_pulls}"
+            )
+        self.engine = MarkovChainEngine(config)
+        self.any_five_star = self._build_any_five_star()
+        self.rate_up = self._build_rate_up()
+
+    def _build_any_five_star(self) -> FloatArray:
+        """Chance of any 5*, shape (hard_pity, max_pulls + 1)."""
+        hard_pity = self.config.hard_pity
+        roll_index = (
+            np.arange(hard_pity)[:, np.newaxis] + np.arange(self.max_pulls)[np.newaxis]
+        )
+        # Survival factor of each upcoming roll; past hard pity nothing survives
+        survive = np.zeros(roll_index.shape, dtype=np.float64)
+        in_range = roll_index < hard_pity
+        survive[in_range] = 1.0 - self.engine.hazard[roll_index[in_range]]
+
+        table = np.zeros((hard_pity, self.max_pulls + 1), dtype=np.float64)
+        table[:, 1:] = 1.0 - np.cumprod(survive, axis=1)
+        return table
+
+    def _build_rate_up(self) -> FloatArray:
+        """Chance of the rate-up 5*, shape (n_rate_up_states, hard_pity, max_pulls + 1).
+
+        Every transient state is evolved at once as one column of a matrix.
+        """
+        engine = self.engine
+        n_transient = engine.absorbing_state
+        distributions = np.zeros((engine.n_states, n_transient), dtype=np.float64)
+        distributions[np.arange(n_transient), np.arange(n_transient)] = 1.0
+
+        absorbed = np.zeros((self.max_pulls + 1, n_transient), dtype=np.float64)
+        for step in range(1, self.max_pulls + 1):
+            distributions = engine.transition.matvec(distributions)
+            absorbed[step] = distributions[engine.absorbing_state]
+
+        return absorbed.T.reshape(
+            engine.machine.n_states, self.config.hard_pity, self.max_pulls + 1
+        )
+
+    def _check_pulls(self, pulls: int) -> None:
+        """Reject horizons outside the table."""
+        if not (0 <= pulls <= self.max_pulls):
+            raise ValidationError(
+                f"Pulls must be between 0 and {self.max_pulls}, got {pulls}"
+            )
+
+    def any_five_star_probability(self, pity: int, pulls: int) -> float:
+        """Chance of any 5* within the next pulls.
+
+        Args:
+            pity: Pulls made since the last 5*
+            pulls: Number of further pulls
+
+        Returns:
+            Probability of at least one 5*
+        """
+        self.engine.state_index(pity)
+        self._check_pulls(pulls)
+        return float(self.any_five_star[pity, pulls])
+
+    def probability(self, pity: int, pulls: int, guaranteed: bool = False) -> float:
+        """Chance of the rate-up 5* within the next pulls.
+
+        Args:
+            pity: Pulls made since the last 5*
+            pulls: Number of further pulls
+            guaranteed: Whether the next 5* is guaranteed to be the rate-up unit
+
+        Returns:
+            Probability of obtaining the rate-up 5*
+        """
+        self._check_pulls(pulls)
+        state = self.engine.state_index(pity, guaranteed)
+        return float(self.rate_up.reshape(-1, self.max_pulls + 1)[state, pulls])
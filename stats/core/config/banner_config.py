@@ -1,7 +1,17 @@
-from dataclasses import dataclass
+import hashlib
+import json
+from dataclasses import asdict, dataclass
 from typing import Dict, Final, Optional
 from core.common.errors import ValidationError
+from core.config.rate_up_rules import (
+    ALWAYS_FEATURED,
+    EPITOMIZED_PATH,
+    RateUpRule,
+    legacy_rule,
+)
 
+# Largest hard pity a banner may have
+MAX_HARD_PITY: Final[int] = 200
 GAME_TYPES: Final[set[str]] = {"Star Rail", "Genshin Impact", "Zenless Zone Zero"}
 BANNER_TYPES_BY_GAME: Final[Dict[str, set[str]]] = {
     "Star Rail": {"Standard", "Limited", "Light Cone"},
@@ -21,6 +31,14 @@ class BannerConfig:
     rate_increase: float
     guaranteed_rate_up: bool
     rate_up_chance: Optional[float] = None
+    rate_up_rule: Optional[RateUpRule] = None
+
+    @property
+    def effective_rate_up_rule(self) -> RateUpRule:
+        """The rate-up rule, derived from the legacy fields when not set."""
+        if self.rate_up_rule is not None:
+            return self.rate_up_rule
+        return legacy_rule(self.rate_up_chance, self.guaranteed_rate_up)
 
     def __post_init__(self) -> None:
         # Type validation first
@@ -62,6 +80,12 @@ class BannerConfig:
             raise ValidationError(
                 f"Rate up chance must be a number if provided, got {type(self.rate_up_chance)}"
             )
+        if self.rate_up_rule is not None and not isinstance(
+            self.rate_up_rule, RateUpRule
+        ):
+            raise ValidationError(
+                f"Rate up rule must be a RateUpRule if provided, got {type(self.rate_up_rule)}"
+            )
 
         # Value validation after type checking
         if self.game_name not in GAME_TYPES:
@@ -73,7 +97,7 @@ class BannerConfig:
             raise ValidationError("Base rate must be between 0 and 1")
         if not (0.0 <= self.four_star_rate <= 1.0):
             raise ValidationError("Four star rate must be between 0 and 1")
-        if not (1 <= self.soft_pity_start_after <= self.hard_pity <= 200):
+        if not (1 <= self.soft_pity_start_after <= self.hard_pity <= MAX_HARD_PITY):
             raise ValidationError("Invalid pity values")
         if not (0.0 <= self.rate_increase <= 1.0):
             raise ValidationError("Rate increase must be between 0 and 1")
@@ -81,6 +105,12 @@ class BannerConfig:
             raise ValidationError("Rate up chance must be between 0 and 1")
 
 
+def config_fingerprint(config: BannerConfig) -> str:
+    """Return a stable SHA-256 hex digest of every field of a config."""
+    payload = json.dumps(asdict(config), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
 BANNER_CONFIGS = {
     "Star Rail": {
         "standard": BannerConfig(
@@ -150,6 +180,7 @@ BANNER_CONFIGS = {
             rate_increase=0.07,
             guaranteed_rate_up=True,
             rate_up_chance=0.75,
+            rate_up_rule=EPITOMIZED_PATH,
         ),
     },
     "Zenless Zone Zero": {
@@ -196,6 +227,7 @@ BANNER_CONFIGS = {
             rate_increase=0.07,
             guaranteed_rate_up=True,
             rate_up_chance=1.0,
+            rate_up_rule=ALWAYS_FEATURED,
         ),
     },
 }
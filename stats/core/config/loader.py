@@ -0,0 +1,379 @@
+"""Bulk loading of banner configurations from JSON and TOML files.
+
+A file holds a ``banners`` entry that is either a list of rows, one object
+per banner, or a mapping from field name to a column of values. Columns are
+validated as whole arrays with the same rules as ``BannerConfig``, so a
+sweep of many rows is checked without building a config per row, and every
+invalid row is reported at once. Configs are only built when asked for.
+"""
+
+import json
+import tomllib
+from dataclasses import MISSING, fields
+from pathlib import Path
+from typing import Any, Dict, Final, Hashable, Iterator, List, Mapping, Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from core.common.errors import ConfigurationError, ValidationError
+from core.config.banner_config import (
+    BANNER_TYPES_BY_GAME,
+    GAME_TYPES,
+    MAX_HARD_PITY,
+    BannerConfig,
+)
+from core.config.rate_up_rules import RateUpRule
+
+FIELDS: Final[Tuple[str, ...]] = tuple(field.name for field in fields(BannerConfig))
+# Invalid rows spelled out in a ConfigValidationError message
+MAX_REPORTED_ROWS: Final[int] = 20
+
+_NUMBER_KINDS: Final[str] = "biuf"
+_INTEGER_KINDS: Final[str] = "biu"
+_RATE_FIELDS: Final[Tuple[str, ...]] = ("base_rate", "four_star_rate", "rate_increase")
+
+
+class ConfigValidationError(ValidationError):
+    """Validation failure listing every invalid row of a config table."""
+
+    def __init__(self, errors: Mapping[int, List[str]]) -> None:
+        """
+        Initialize the error.
+
+        Args:
+            errors: Messages per invalid row index
+        """
+        self.errors = dict(sorted(errors.items()))
+        lines = [
+            f"row {row}: {'; '.join(messages)}"
+            for row, messages in list(self.errors.items())[:MAX_REPORTED_ROWS]
+        ]
+        if len(self.errors) > MAX_REPORTED_ROWS:
+            lines.append(f"... and {len(self.errors) - MAX_REPORTED_ROWS} more rows")
+        super().__init__(
+            f"{len(self.errors)} invalid banner config rows:\n" + "\n".join(lines)
+        )
+
+
+def _rows_to_columns(rows: List[Any]) -> Dict[str, List[Any]]:
+    """Transpose row objects into columns, rejecting unknown fields."""
+    unknown = {key for row in rows if isinstance(row, dict) for key in row}
+    unknown -= set(FIELDS)
+    if unknown:
+        raise ConfigurationError(f"Unknown banner config fields: {sorted(unknown)}")
+    for index, row in enumerate(rows):
+        if not isinstance(row, dict):
+            raise ConfigurationError(f"Row {index} is not an object")
+    return {
+        name: [row.get(name, MISSING) for row in rows]
+        for name in FIELDS
+        if any(name in row for row in rows)
+    }
+
+
+def _as_array(values: List[Any]) -> npt.NDArray[Any]:
+    """Convert a column to an array, falling back to objects when ragged."""
+    try:
+        array = np.asarray(values)
+    except ValueError:
+        return np.array(values + [None], dtype=object)[:-1]
+    return array if array.ndim == 1 else np.array(values + [None], dtype=object)[:-1]
+
+
+class ConfigTable:
+    """Validated banner config columns, turned into BannerConfig on demand."""
+
+    def __init__(self, columns: Mapping[str, List[Any]]) -> None:
+        """
+        Validate config columns.
+
+        Args:
+            columns: Values per BannerConfig field, all of the same length
+
+        Raises:
+            ConfigurationError: If fields are unknown or columns differ in length
+            ConfigValidationError: If any row is invalid
+        """
+        unknown = set(columns) - set(FIELDS)
+        if unknown:
+            raise ConfigurationError(f"Unknown banner config fields: {sorted(unknown)}")
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ConfigurationError("Banner config columns differ in length")
+        self._length = lengths.pop() if lengths else 0
+        self._errors: Dict[int, List[str]] = {}
+        self._columns: Dict[str, npt.NDArray[Any]] = {}
+        self._strings: Dict[str, List[Any]] = {}
+        self._rules: List[Optional[RateUpRule]] = []
+
+        self._validate(columns)
+        if self._errors:
+            raise ConfigValidationError(self._errors)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def _fail(self, mask: Any, message: str) -> None:
+        """Record a message for every row in a boolean mask."""
+        for row in np.flatnonzero(mask).tolist():
+            self._errors.setdefault(row, []).append(message)
+
+    def _column(
+        self,
+        columns: Mapping[str, List[Any]],
+        name: str,
+        kinds: str,
+        types: Tuple[type, ...],
+        label: str,
+    ) -> Tuple[npt.NDArray[Any], Any]:
+        """Convert one column, recording rows that are missing or mistyped.
+
+        A column whose array has one of the expected NumPy kinds is accepted
+        as a whole; otherwise the values are inspected one by one to find
+        the offending rows.
+
+        Returns:
+            tuple: (values, mask of rows holding a value of the right type)
+        """
+        values = columns.get(name, [MISSING] * self._length)
+        array = _as_array(values)
+        if array.dtype.kind in kinds:
+            return array, np.ones(self._length, dtype=bool)
+
+        missing = np.array([value is MISSING for value in values], dtype=bool)
+        valid = ~missing & np.array(
+            [isinstance(value, types) for value in values], dtype=bool
+        )
+        self._fail(missing, f"missing {name}")
+        self._fail(~missing & ~valid, f"{name} must be {label}")
+        cleaned = np.array(
+            [value if ok else np.nan for value, ok in zip(values, valid)],
+            dtype=np.float64,
+        )
+        return cleaned, valid
+
+    def _categories(
+        self, columns: Mapping[str, List[Any]], name: str
+    ) -> Tuple[npt.NDArray[np.intp], List[Any], npt.NDArray[np.bool_]]:
+        """Factorize a string column, recording rows that are missing or mistyped.
+
+        Sweeps repeat a handful of names, so types and names are checked once
+        per distinct value and mapped back to rows through the codes.
+
+        Returns:
+            tuple: (code per row, distinct values, mask of distinct strings)
+        """
+        values = columns.get(name, [MISSING] * self._length)
+        try:
+            distinct = list(dict.fromkeys(values))
+        except TypeError:
+            # Unhashable values are never strings
+            values = [
+                value if isinstance(value, Hashable) else None for value in values
+            ]
+            distinct = list(dict.fromkeys(values))
+        index = {value: code for code, value in enumerate(distinct)}
+        codes = np.fromiter(
+            map(index.__getitem__, values), dtype=np.intp, count=self._length
+        )
+        missing = np.array([value is MISSING for value in distinct], dtype=bool)
+        strings = np.array([isinstance(value, str) for value in distinct], dtype=bool)
+        self._fail(missing[codes], f"missing {name}")
+        self._fail(~missing[codes] & ~strings[codes], f"{name} must be a string")
+        return codes, distinct, strings
+
+    def _validate(self, columns: Mapping[str, List[Any]]) -> None:
+        """Check every rule BannerConfig applies, one column at a time."""
+        game_codes, games, game_ok = self._categories(columns, "game_name")
+        banner_codes, banners, banner_ok = self._categories(columns, "banner_type")
+        rates = {
+            name: self._column(columns, name, _NUMBER_KINDS, (int, float), "a number")
+            for name in _RATE_FIELDS
+        }
+        soft_pity, soft_ok = self._column(
+            columns, "soft_pity_start_after", _INTEGER_KINDS, (int,), "an integer"
+        )
+        hard_pity, hard_ok = self._column(
+            columns, "hard_pity", _INTEGER_KINDS, (int,), "an integer"
+        )
+        guaranteed, _ = self._column(
+            columns, "guaranteed_rate_up", "b", (bool,), "a boolean"
+        )
+        rate_up_chance, chance_set = self._optional_chance(
+            columns.get("rate_up_chance")
+        )
+        self._rules = self._optional_rules(columns.get("rate_up_rule"))
+
+        known_game = np.array([game in GAME_TYPES for game in games], dtype=bool)
+        self._fail(game_ok[game_codes] & ~known_game[game_codes], "invalid game name")
+        pair_codes = game_codes * len(banners) + banner_codes
+        invalid_pairs = [
+            pair
+            for pair in np.unique(pair_codes).tolist()
+            if known_game[pair // len(banners)]
+            and banner_ok[pair % len(banners)]
+            and banners[pair % len(banners)]
+            not in BANNER_TYPES_BY_GAME[games[pair // len(banners)]]
+        ]
+        self._fail(np.isin(pair_codes, invalid_pairs), "invalid banner type")
+        # Written so that NaN, which fails every comparison, is out of range
+        for name, (values, valid) in rates.items():
+            self._fail(
+                valid & ~((values >= 0.0) & (values <= 1.0)),
+                f"{name} must be between 0 and 1",
+            )
+        self._fail(
+            soft_ok
+            & hard_ok
+            & ((soft_pity < 1) | (soft_pity > hard_pity) | (hard_pity > MAX_HARD_PITY)),
+            "invalid pity values",
+        )
+        self._fail(
+            chance_set & ~((rate_up_chance >= 0.0) & (rate_up_chance <= 1.0)),
+            "rate_up_chance must be between 0 and 1",
+        )
+
+        self._strings = {"game_name": games, "banner_type": banners}
+        self._columns = {
+            "game_name": game_codes,
+            "banner_type": banner_codes,
+            **{name: values for name, (values, _) in rates.items()},
+            "soft_pity_start_after": soft_pity,
+            "hard_pity": hard_pity,
+            "guaranteed_rate_up": guaranteed,
+            "rate_up_chance": rate_up_chance,
+        }
+
+    def _optional_chance(
+        self, values: Optional[List[Any]]
+    ) -> Tuple[npt.NDArray[np.float64], npt.NDArray[np.bool_]]:
+        """Rate-up chances with NaN for rows that leave them unset.
+
+        Returns:
+            tuple: (chances, mask of rows that set a number, NaN included)
+        """
+        if values is None:
+            return np.full(self._length, np.nan), np.zeros(self._length, dtype=bool)
+        array = _as_array(values)
+        if array.dtype.kind in _NUMBER_KINDS:
+            return array.astype(np.float64), np.ones(self._length, dtype=bool)
+        unset = np.array([value is None or value is MISSING for value in values])
+        valid = unset | np.array(
+            [isinstance(value, (int, float)) for value in values], dtype=bool
+        )
+        self._fail(~valid, "rate_up_chance must be a number")
+        chances = np.array(
+            [
+                value if ok and not skip else np.nan
+                for value, ok, skip in zip(values, valid, unset)
+            ],
+            dtype=np.float64,
+        )
+        return chances, valid & ~unset
+
+    def _optional_rules(
+        self, values: Optional[List[Any]]
+    ) -> List[Optional[RateUpRule]]:
+        """Rate-up rules per row, each distinct rule built and checked once."""
+        if values is None:
+            return [None] * self._length
+        built: Dict[str, Any] = {}
+        rules: List[Optional[RateUpRule]] = []
+        for row, value in enumerate(values):
+            rule: Any = None
+            if isinstance(value, dict):
+                key = json.dumps(value, sort_keys=True, default=repr)
+                if key not in built:
+                    try:
+                        built[key] = RateUpRule(**value)
+                    except (TypeError, ValidationError) as e:
+                        built[key] = f"invalid rate_up_rule: {e}"
+                rule = built[key]
+            elif value is not None and value is not MISSING:
+                rule = "rate_up_rule must be a table"
+            if isinstance(rule, str):
+                self._errors.setdefault(row, []).append(rule)
+                rule = None
+            rules.append(rule)
+        return rules
+
+    def config(self, index: int) -> BannerConfig:
+        """Build the config of one row.
+
+        Args:
+            index: Row index
+
+        Returns:
+            Banner configuration
+        """
+        columns, strings = self._columns, self._strings
+        chance = float(columns["rate_up_chance"][index])
+        return BannerConfig(
+            game_name=strings["game_name"][columns["game_name"][index]],
+            banner_type=strings["banner_type"][columns["banner_type"][index]],
+            base_rate=float(columns["base_rate"][index]),
+            four_star_rate=float(columns["four_star_rate"][index]),
+            soft_pity_start_after=int(columns["soft_pity_start_after"][index]),
+            hard_pity=int(columns["hard_pity"][index]),
+            rate_increase=float(columns["rate_increase"][index]),
+            guaranteed_rate_up=bool(columns["guaranteed_rate_up"][index]),
+            rate_up_chance=None if np.isnan(chance) else chance,
+            rate_up_rule=self._rules[index],
+        )
+
+    def configs(self) -> Iterator[BannerConfig]:
+        """Build the config of every row, in order."""
+        for index in range(self._length):
+            yield self.config(index)
+
+
+def parse_configs(data: Any) -> ConfigTable:
+    """Validate the ``banners`` entry of a parsed config document.
+
+    Args:
+        data: Parsed JSON or TOML document
+
+    Returns:
+        Validated config table
+
+    Raises:
+        ConfigurationError: If the document has no valid ``banners`` entry
+        ConfigValidationError: If any row is invalid
+    """
+    banners = data.get("banners") if isinstance(data, dict) else None
+    if isinstance(banners, list):
+        return ConfigTable(_rows_to_columns(banners))
+    if isinstance(banners, dict):
+        if not all(isinstance(values, list) for values in banners.values()):
+            raise ConfigurationError("Banner config columns must be lists")
+        return ConfigTable(banners)
+    raise ConfigurationError("Config file needs a 'banners' list or table of columns")
+
+
+def load_configs(path: str) -> ConfigTable:
+    """Load and validate banner configs from a JSON or TOML file.
+
+    Args:
+        path: File path ending in .json or .toml
+
+    Returns:
+        Validated config table
+
+    Raises:
+        ConfigurationError: If the file type is unsupported or malformed
+        ConfigValidationError: If any row is invalid
+    """
+    suffix = Path(path).suffix.lower()
+    try:
+        if suffix == ".json":
+            with open(path, encoding="utf-8") as file:
+                data = json.load(file)
+        elif suffix == ".toml":
+            with open(path, "rb") as file:
+                data = tomllib.load(file)
+        else:
+            raise ConfigurationError(f"Unsupported config file type: {path}")
+    except (json.JSONDecodeError, tomllib.TOMLDecodeError) as e:
+        raise ConfigurationError(f"Malformed config file {path}: {e}") from e
+    return parse_configs(data)
@@ -0,0 +1,94 @@
+"""Declarative rate-up rules for 5* banners.
+
+A rule describes what decides whether a 5* is the unit the player wants:
+the chance that a 5* is featured, how many featured units share that
+chance, an optional guarantee after losing to an off-banner 5*, an optional
+chance of capturing a lost roll back, and optional fate points that force
+the wanted unit after enough misses. Rules are compiled into state machines
+by ``core.rate_up``.
+"""
+
+from dataclasses import dataclass
+from typing import Final, Optional
+
+from core.common.errors import ValidationError
+
+
+@dataclass(frozen=True)
+class RateUpRule:
+    """Rate-up behaviour of a banner.
+
+    Attributes:
+        featured_chance: Chance that a 5* is one of the featured units
+        featured_count: Featured units sharing that chance, one of which is wanted
+        guarantee_after: Off-banner 5* in a row after which the next 5* is
+            featured (0 for no guarantee)
+        capture_chance: Chance that an off-banner 5* is replaced by a
+            featured one, while no guarantee is active
+        fate_points: 5* other than the wanted unit after which the next 5*
+            is the wanted unit (0 for no fate points)
+    """
+
+    featured_chance: float = 1.0
+    featured_count: int = 1
+    guarantee_after: int = 0
+    capture_chance: float = 0.0
+    fate_points: int = 0
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.featured_chance, (int, float)):
+            raise ValidationError(
+                f"Featured chance must be a number, got {type(self.featured_chance)}"
+            )
+        if not isinstance(self.capture_chance, (int, float)):
+            raise ValidationError(
+                f"Capture chance must be a number, got {type(self.capture_chance)}"
+            )
+        for name in ("featured_count", "guarantee_after", "fate_points"):
+            if not isinstance(getattr(self, name), int):
+                raise ValidationError(
+                    f"{name.replace('_', ' ').capitalize()} must be an integer, "
+                    f"got {type(getattr(self, name))}"
+                )
+
+        if not (0.0 <= self.featured_chance <= 1.0):
+            raise ValidationError("Featured chance must be between 0 and 1")
+        if not (0.0 <= self.capture_chance <= 1.0):
+            raise ValidationError("Capture chance must be between 0 and 1")
+        if self.featured_count < 1:
+            raise ValidationError("Featured count must be at least 1")
+        if self.guarantee_after < 0 or self.fate_points < 0:
+            raise ValidationError("Guarantee and fate point counts must be >= 0")
+
+
+def legacy_rule(
+    rate_up_chance: Optional[float], guaranteed_rate_up: bool
+) -> RateUpRule:
+    """Express the ``rate_up_chance``/``guaranteed_rate_up`` fields as a rule.
+
+    A missing ``rate_up_chance`` means every 5* is the wanted unit, and
+    ``guaranteed_rate_up`` makes the 5* after an off-banner one featured.
+
+    Args:
+        rate_up_chance: Chance that a 5* is the rate-up unit
+        guaranteed_rate_up: Whether losing guarantees the next 5*
+
+    Returns:
+        Equivalent rule
+    """
+    chance = 1.0 if rate_up_chance is None else float(rate_up_chance)
+    return RateUpRule(
+        featured_chance=chance, guarantee_after=1 if guaranteed_rate_up else 0
+    )
+
+
+# 50/50 with a guarantee after a loss, as on limited character banners
+FIFTY_FIFTY: Final[RateUpRule] = RateUpRule(featured_chance=0.5, guarantee_after=1)
+# 75/25 with a guarantee after a loss, as on most weapon banners
+SEVENTY_FIVE: Final[RateUpRule] = RateUpRule(featured_chance=0.75, guarantee_after=1)
+# Genshin weapon banner: two featured weapons and one Epitomized Path fate point
+EPITOMIZED_PATH: Final[RateUpRule] = RateUpRule(
+    featured_chance=0.75, featured_count=2, guarantee_after=1, fate_points=1
+)
+# Every 5* is the featured unit, as on ZZZ Bangboo banners
+ALWAYS_FEATURED: Final[RateUpRule] = RateUpRule(featured_chance=1.0)
@@ -0,0 +1,190 @@
+"""Distribution of pulls needed for K copies of the rate-up 5*.
+
+PMFs are indexed by pull count, so ``pmf[n]`` is the chance of needing
+exactly n pulls. The single-copy PMF is derived from the first 5* curve and
+the banner's rate-up state machine in the frequency domain; K copies are
+combined by FFT convolution with power-by-squaring, dropping tail mass
+below a caller-set epsilon after every convolution.
+"""
+
+from dataclasses import dataclass
+from typing import Final
+
+import numpy as np
+
+from core.calculator import FloatArray, ProbabilityCalculator
+from core.common.errors import CalculationError, ValidationError
+from core.config.banner_config import BannerConfig
+from core.rate_up import RateUpMachine, rate_up_machine
+
+DEFAULT_EPSILON: Final[float] = 1e-12
+MAX_RATE_UP_ATTEMPTS: Final[int] = 10_000
+
+
+@dataclass(frozen=True)
+class CopiesDistribution:
+    """PMF and CDF of the pulls needed for a number of copies."""
+
+    copies: int
+    pmf: FloatArray
+    cdf: FloatArray
+
+    def probability_within(self, pulls: int) -> float:
+        """Chance of reaching the copies within a number of pulls.
+
+        Args:
+            pulls: Pull budget
+
+        Returns:
+            Probability of success within the budget
+        """
+        if pulls < 0:
+            return 0.0
+        return float(self.cdf[min(pulls, len(self.cdf) - 1)])
+
+
+def fft_convolve(a: FloatArray, b: FloatArray) -> FloatArray:
+    """Convolve two non-negative sequences with a real FFT.
+
+    Args:
+        a: First sequence
+        b: Second sequence
+
+    Returns:
+        Linear convolution, clipped at zero to remove round-off noise
+    """
+    length = len(a) + len(b) - 1
+    size = 1 << (length - 1).bit_length()
+    result = np.fft.irfft(np.fft.rfft(a, size) * np.fft.rfft(b, size), size)[:length]
+    return np.clip(result, 0.0, None)
+
+
+def truncate_tail(pmf: FloatArray, epsilon: float) -> FloatArray:
+    """Drop the longest tail whose total mass is at most epsilon.
+
+    Args:
+        pmf: Probability mass function indexed by pull count
+        epsilon: Mass that may be discarded
+
+    Returns:
+        Truncated PMF
+    """
+    tail_mass = np.cumsum(pmf[::-1])[::-1]
+    keep = int(np.count_nonzero(tail_mass > epsilon))
+    return pmf[: max(keep, 1)]
+
+
+def first_5star_pmf(hazard: FloatArray, pity: int = 0) -> FloatArray:
+    """PMF of the pulls until the next 5* from a given pity.
+
+    Args:
+        hazard: Per-roll 5* rate for rolls 1..hard_pity
+        pity: Pulls already made since the last 5*
+
+    Returns:
+        PMF indexed by pull count
+    """
+    remaining = hazard[pity:]
+    no_5star = np.empty_like(remaining)
+    no_5star[0] = 1.0
+    np.cumprod(1.0 - remaining[:-1], out=no_5star[1:])
+    return np.concatenate([[0.0], no_5star * remaining])
+
+
+def _rate_up_attempt_bound(machine: RateUpMachine, epsilon: float) -> int:
+    """Number of 5* after which the chance of no rate-up is below epsilon."""
+    still_losing = np.ones(machine.n_states)
+    for attempts in range(1, MAX_RATE_UP_ATTEMPTS + 1):
+        still_losing = machine.loss @ still_losing
+        if still_losing.max() <= epsilon:
+            return attempts
+    raise CalculationError("Rate-up unit is unreachable with this rate-up rule")
+
+
+def single_copy_pmf(
+    config: BannerConfig,
+    pity: int = 0,
+    guaranteed: bool = False,
+    epsilon: float = DEFAULT_EPSILON,
+) -> FloatArray:
+    """PMF of the pulls needed for one copy of the rate-up 5*.
+
+    Per frequency, the PMFs G of every rate-up state satisfy
+    ``G = F * (w + L G)`` for loss transitions L, which is solved as a small
+    linear system, so loops without a guarantee need no explicit series.
+
+    Args:
+        config: Banner configuration
+        pity: Starting pity
+        guaranteed: Whether the next 5* is guaranteed to be the rate-up unit
+        epsilon: Tail mass that may be discarded
+
+    Returns:
+        PMF indexed by pull count
+    """
+    machine = rate_up_machine(config)
+    hard_pity = config.hard_pity
+    if not (0 <= pity < hard_pity):
+        raise ValidationError(f"Pity must be between 0 and {hard_pity - 1}, got {pity}")
+    start_state = machine.guaranteed_state if guaranteed else 0
+    if guaranteed and start_state == 0:
+        raise ValidationError("Banner has no rate-up guarantee")
+
+    hazard, _, _ = ProbabilityCalculator(config).calculate_probability_arrays()
+    attempts = _rate_up_attempt_bound(machine, epsilon)
+    length = (attempts + 1) * hard_pity + 1
+    size = 1 << (length - 1).bit_length()
+
+    fresh = np.fft.rfft(first_5star_pmf(hazard), size)
+
+    # (I - F L) G = F w, one system per frequency
+    system = np.eye(machine.n_states) - fresh[:, np.newaxis, np.newaxis] * machine.loss
+    rhs = fresh[:, np.newaxis] * machine.win_chance
+    per_state = np.linalg.solve(system, rhs[..., np.newaxis])[..., 0]
+
+    # The first 5* comes from the starting pity, later ones from zero pity
+    after_first = (
+        machine.win_chance[start_state] + per_state @ machine.loss[start_state]
+    )
+    start = np.fft.rfft(first_5star_pmf(hazard, pity), size) * after_first
+
+    pmf = np.clip(np.fft.irfft(start, size)[:length], 0.0, None)
+    return truncate_tail(pmf, epsilon)
+
+
+def copies_distribution(
+    config: BannerConfig,
+    copies: int,
+    pity: int = 0,
+    guaranteed: bool = False,
+    epsilon: float = DEFAULT_EPSILON,
+) -> CopiesDistribution:
+    """Distribution of the pulls needed for several rate-up copies.
+
+    Args:
+        config: Banner configuration
+        copies: Number of rate-up copies wanted
+        pity: Starting pity
+        guaranteed: Whether the next 5* is guaranteed to be the rate-up unit
+        epsilon: Tail mass that may be discarded after each convolution
+
+    Returns:
+        PMF and CDF of the pulls needed
+    """
+    if copies < 0:
+        raise ValidationError(f"Copies must be non-negative, got {copies}")
+
+    result = np.array([1.0])
+    if copies > 0:
+        result = single_copy_pmf(config, pity, guaranteed, epsilon)
+        # Every copy after the first starts from zero pity with no guarantee
+        base = single_copy_pmf(config, epsilon=epsilon)
+        remaining = copies - 1
+        while remaining:
+            if remaining & 1:
+                result = truncate_tail(fft_convolve(result, base), epsilon)
+            remaining >>= 1
+            if remaining:
+                base = truncate_tail(fft_convolve(base, base), epsilon)
+
+    return CopiesDistribution(copies=copies, pmf=result, cdf=np.cumsum(result))
@@ -0,0 +1,210 @@
+"""Joint 5* and 4* pity chain.
+
+The chain state is (5* pity, 4* pity): pulls since the last 5* and pulls
+since the last 4* or better. Every ``FOUR_STAR_PITY``-th pull without a 4*
+or better is guaranteed to give one, and a 5* counts towards that
+guarantee. 4* drops happen at ``four_star_rate`` otherwise, capped by what
+the 5* chance leaves. The transition operator is split into the part that
+yields a 4* and the part that does not, so 4* counts can be tracked by
+shifting a count axis on the 4* part.
+"""
+
+from typing import Final, Tuple
+
+import numpy as np
+
+from core.calculator import FloatArray, ProbabilityCalculator
+from core.common.errors import ValidationError
+from core.config.banner_config import BannerConfig
+from core.sparse import SparseOperator
+
+FOUR_STAR_PITY: Final[int] = 10
+DEFAULT_FEATURED_CHANCE: Final[float] = 0.5
+DEFAULT_FEATURED_COUNT: Final[int] = 3
+
+
+class FourStarEngine:
+    """Evolves the joint 5* and 4* pity state of a banner pull by pull."""
+
+    def __init__(self, config: BannerConfig, four_star_pity: int = FOUR_STAR_PITY):
+        """
+        Initialize the engine and build the transition operators.
+
+        Args:
+            config: Banner configuration
+            four_star_pity: Pull on which a 4* or better is guaranteed
+        """
+        if four_star_pity < 1:
+            raise ValidationError(
+                f"Four star pity must be positive, got {four_star_pity}"
+            )
+        self.config = config
+        self.hazard, _, _ = ProbabilityCalculator(config).calculate_probability_arrays()
+        self.hard_pity = config.hard_pity
+        self.four_star_pity = four_star_pity
+        self.n_states = self.hard_pity * four_star_pity
+        self.four_star, self.other = self._build_transitions()
+        self.transition = SparseOperator(
+            np.concatenate([self.four_star.rows, self.other.rows]),
+            np.concatenate([self.four_star.cols, self.other.cols]),
+            np.concatenate([self.four_star.data, self.other.data]),
+            (self.n_states, self.n_states),
+        )
+
+    def _build_transitions(self) -> Tuple[SparseOperator, SparseOperator]:
+        """Assemble the 4* and the non-4* parts of the transition operator."""
+        hard_pity, four_star_pity = self.hard_pity, self.four_star_pity
+        pity_5 = np.repeat(np.arange(hard_pity), four_star_pity)
+        pity_4 = np.tile(np.arange(four_star_pity), hard_pity)
+        source = pity_5 * four_star_pity + pity_4
+
+        chance_5 = self.hazard[pity_5]
+        chance_4 = np.where(
+            pity_4 + 1 >= four_star_pity,
+            1.0 - chance_5,
+            np.minimum(self.config.four_star_rate, 1.0 - chance_5),
+        )
+        chance_3 = np.clip(1.0 - chance_5 - chance_4, 0.0, None)
+
+        # 5*: both counters reset
+        five_rows = np.zeros_like(source)
+
+        # 4*: 5* pity advances, 4* pity resets. Hard pity leaves no 4* chance.
+        advance = pity_5 + 1 < hard_pity
+        four_rows = (pity_5[advance] + 1) * four_star_pity
+        four_cols = source[advance]
+        four_data = chance_4[advance]
+
+        # 3*: both counters advance. The 4* guarantee leaves no 3* chance.
+        both = advance & (pity_4 + 1 < four_star_pity)
+        three_rows = (pity_5[both] + 1) * four_star_pity + pity_4[both] + 1
+
+        shape = (self.n_states, self.n_states)
+        four_star = SparseOperator(four_rows, four_cols, four_data, shape)
+        other = SparseOperator(
+            np.concatenate([five_rows, three_rows]),
+            np.concatenate([source, source[both]]),
+            np.concatenate([chance_5, chance_3[both]]),
+            shape,
+        )
+        return four_star, other
+
+    def state_index(self, pity: int = 0, four_star_pity: int = 0) -> int:
+        """Return the chain index of a player state.
+
+        Args:
+            pity: Pulls made since the last 5*
+            four_star_pity: Pulls made since the last 4* or better
+
+        Returns:
+            Index into the state vector
+
+        Raises:
+            ValidationError: If the state does not exist on this banner
+        """
+        if not (0 <= pity < self.hard_pity):
+            raise ValidationError(
+                f"Pity must be between 0 and {self.hard_pity - 1}, got {pity}"
+            )
+        if not (0 <= four_star_pity < self.four_star_pity):
+            raise ValidationError(
+                f"Four star pity must be between 0 and {self.four_star_pity - 1}, "
+                f"got {four_star_pity}"
+            )
+        return pity * self.four_star_pity + four_star_pity
+
+    def evolve(self, distribution: FloatArray, pulls: int) -> FloatArray:
+        """Advance a state distribution, or columns of them, by some pulls.
+
+        Args:
+            distribution: Array of shape (n_states,) or (n_states, k)
+            pulls: Number of pulls to advance
+
+        Returns:
+            Distribution after the pulls
+        """
+        for _ in range(pulls):
+            distribution = self.transition.matvec(distribution)
+        return distribution
+
+    def four_star_count_distribution(
+        self, pulls: int, pity: int = 0, four_star_pity: int = 0
+    ) -> FloatArray:
+        """Distribution of the number of 4* obtained in some pulls.
+
+        The state distribution carries a count axis; each pull applies the
+        non-4* part in place and the 4* part shifted by one count. Counts
+        above the pulls made so far are always zero and are skipped.
+
+        Args:
+            pulls: Number of pulls
+            pity: Starting 5* pity
+            four_star_pity: Starting 4* pity
+
+        Returns:
+            Array whose entry k is the chance of exactly k 4*
+        """
+        if pulls < 0:
+            raise ValidationError(f"Pulls must be non-negative, got {pulls}")
+        joint = np.zeros((self.n_states, pulls + 1), dtype=np.float64)
+        joint[self.state_index(pity, four_star_pity), 0] = 1.0
+        for step in range(pulls):
+            reachable = joint[:, : step + 1]
+            with_four_star = self.four_star.matvec(reachable)
+            joint[:, : step + 1] = self.other.matvec(reachable)
+            joint[:, 1 : step + 2] += with_four_star
+        counts: FloatArray = joint.sum(axis=0)
+        return counts
+
+    def featured_probability(
+        self,
+        pulls: int,
+        pity: int = 0,
+        four_star_pity: int = 0,
+        featured_chance: float = DEFAULT_FEATURED_CHANCE,
+        featured_count: int = DEFAULT_FEATURED_COUNT,
+        guaranteed: bool = False,
+        guarantee_on_loss: bool = True,
+    ) -> float:
+        """Chance of one specific featured 4* within some pulls.
+
+        Each 4* is featured with ``featured_chance`` (always, when
+        guaranteed), and a featured 4* is the wanted one with chance
+        ``1 / featured_count``. Featured outcomes do not depend on pity, so
+        the result is the 4* count distribution weighted by the chance of
+        the wanted 4* within that many 4*.
+
+        Args:
+            pulls: Number of pulls
+            pity: Starting 5* pity
+            four_star_pity: Starting 4* pity
+            featured_chance: Chance that a 4* is one of the featured ones
+            featured_count: Number of featured 4*
+            guaranteed: Whether the next 4* is guaranteed to be featured
+            guarantee_on_loss: Whether a non-featured 4* guarantees the next
+
+        Returns:
+            Probability of obtaining the specific featured 4*
+        """
+        if not (0.0 <= featured_chance <= 1.0):
+            raise ValidationError("Featured chance must be between 0 and 1")
+        if featured_count < 1:
+            raise ValidationError(
+                f"Featured count must be positive, got {featured_count}"
+            )
+        counts = self.four_star_count_distribution(pulls, pity, four_star_pity)
+
+        # Per-4* chain over (no guarantee, guarantee); success is absorbed
+        wanted = 1.0 / featured_count
+        loss_state = 1 if guarantee_on_loss else 0
+        chance = np.array([featured_chance, 1.0])
+        state = np.array([0.0, 1.0] if guaranteed else [1.0, 0.0])
+        within = np.zeros(len(counts), dtype=np.float64)
+        for count in range(1, len(counts)):
+            within[count] = within[count - 1] + state @ chance * wanted
+            featured_miss = state * chance * (1.0 - wanted)
+            off_banner = state * (1.0 - chance)
+            state = np.zeros(2)
+            state[0] = featured_miss.sum()
+            state[loss_state] += off_banner.sum()
+        return float(counts @ within)
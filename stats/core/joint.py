@@ -0,0 +1,141 @@
+"""Joint pull distributions for combinations of banners.
+
+The pulls needed for several independent goals, such as a limited
+character and its signature weapon, are the sum of the pulls of each, so
+the combined PMF is the convolution of the single-banner PMFs. Those are
+cached, keyed on the parameters that determine them, and combined with a
+single FFT product.
+"""
+
+from dataclasses import dataclass
+from typing import Final, Sequence, Tuple
+
+import numpy as np
+
+from core.cache import CalculationKey, LRUCache, calculation_key
+from core.calculator import FloatArray
+from core.common.errors import ValidationError
+from core.config.banner_config import BannerConfig
+from core.config.rate_up_rules import RateUpRule
+from core.copies import DEFAULT_EPSILON, copies_distribution, truncate_tail
+
+DEFAULT_PMF_CACHE_SIZE: Final[int] = 256
+
+# Calculation key, rate-up rule, copies, pity, guaranteed
+PMFKey = Tuple[CalculationKey, RateUpRule, int, int, bool]
+
+
+@dataclass(frozen=True)
+class BannerGoal:
+    """Copies wanted from one banner and the state it starts from."""
+
+    config: BannerConfig
+    copies: int = 1
+    pity: int = 0
+    guaranteed: bool = False
+
+
+@dataclass(frozen=True)
+class JointDistribution:
+    """PMF and CDF of the total pulls needed for a combination of goals."""
+
+    goals: Tuple[BannerGoal, ...]
+    pmf: FloatArray
+    cdf: FloatArray
+
+    def probability_within(self, pulls: int) -> float:
+        """Chance of meeting every goal within a number of pulls.
+
+        Args:
+            pulls: Pull budget
+
+        Returns:
+            Probability of success within the budget
+        """
+        if pulls < 0:
+            return 0.0
+        return float(self.cdf[min(pulls, len(self.cdf) - 1)])
+
+
+def pmf_key(goal: BannerGoal) -> PMFKey:
+    """Return the fingerprint of everything a goal's PMF depends on."""
+    return (
+        calculation_key(goal.config),
+        goal.config.effective_rate_up_rule,
+        goal.copies,
+        goal.pity,
+        goal.guaranteed,
+    )
+
+
+class JointDistributionEngine:
+    """Combines cached single-banner PMFs into joint distributions."""
+
+    def __init__(
+        self,
+        epsilon: float = DEFAULT_EPSILON,
+        cache_size: int = DEFAULT_PMF_CACHE_SIZE,
+    ) -> None:
+        """
+        Initialize the engine.
+
+        Args:
+            epsilon: Tail mass that may be discarded from each PMF
+            cache_size: Number of single-banner PMFs kept
+        """
+        self.epsilon = epsilon
+        self.cache: LRUCache[PMFKey, FloatArray] = LRUCache(cache_size)
+
+    def banner_pmf(self, goal: BannerGoal) -> FloatArray:
+        """Pulls needed for one goal, computed once per parameter set.
+
+        Cached arrays are shared between callers and must not be mutated.
+
+        Args:
+            goal: Banner goal
+
+        Returns:
+            PMF indexed by pull count
+        """
+        return self.cache.get_or_compute(
+            pmf_key(goal),
+            lambda: (
+                copies_distribution(
+                    goal.config,
+                    goal.copies,
+                    pity=goal.pity,
+                    guaranteed=goal.guaranteed,
+                    epsilon=self.epsilon,
+                ).pmf
+            ),
+        )
+
+    def distribution(self, goals: Sequence[BannerGoal]) -> JointDistribution:
+        """Distribution of the total pulls needed for every goal.
+
+        All PMFs are transformed once at the full result length and
+        multiplied, so any number of banners costs a single inverse FFT.
+
+        Args:
+            goals: Independent goals, on different banners or not
+
+        Returns:
+            Joint PMF and CDF indexed by pull count
+        """
+        for goal in goals:
+            if goal.copies < 0:
+                raise ValidationError(f"Copies must be non-negative, got {goal.copies}")
+
+        pmfs = [self.banner_pmf(goal) for goal in goals]
+        length = sum(len(pmf) - 1 for pmf in pmfs) + 1
+        if len(pmfs) < 2:
+            result = pmfs[0].copy() if pmfs else np.ones(1, dtype=np.float64)
+        else:
+            size = 1 << (length - 1).bit_length()
+            spectrum = np.fft.rfft(pmfs[0], size)
+            for pmf in pmfs[1:]:
+                spectrum *= np.fft.rfft(pmf, size)
+            combined = np.clip(np.fft.irfft(spectrum, size)[:length], 0.0, None)
+            result = truncate_tail(combined, self.epsilon)
+
+        return JointDistribution(goals=tuple(goals), pmf=result, cdf=np.cumsum(result))
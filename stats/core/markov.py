@@ -0,0 +1,179 @@
+"""Pity and guarantee Markov chain for rate-up 5* probabilities.
+
+The chain state is (rate-up state, pity counter), where the pity counter is
+the number of pulls since the last 5* and the rate-up state tracks the
+guarantee. One extra absorbing state collects the probability of having
+obtained the rate-up 5*. Distributions are column vectors and the
+transition operator maps the distribution before a pull to the one after.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+from core.calculator import FloatArray, ProbabilityCalculator
+from core.common.errors import ValidationError
+from core.config.banner_config import BannerConfig
+from core.rate_up import RateUpMachine, rate_up_machine
+from core.sparse import SparseOperator
+
+
+class MarkovChainEngine:
+    """Evolves the pity and guarantee state of a banner pull by pull."""
+
+    def __init__(self, config: BannerConfig) -> None:
+        """
+        Initialize the engine and build the transition operator.
+
+        Args:
+            config: Banner configuration
+        """
+        self.config = config
+        self.hazard, _, _ = ProbabilityCalculator(config).calculate_probability_arrays()
+        self.machine: RateUpMachine = rate_up_machine(config)
+        self.hard_pity = config.hard_pity
+        self.n_states = self.machine.n_states * self.hard_pity + 1
+        self.absorbing_state = self.n_states - 1
+        self.transition = self._build_transition()
+
+    def _build_transition(self) -> SparseOperator:
+        """Assemble the sparse transition operator."""
+        hard_pity = self.hard_pity
+        rate_states = np.repeat(np.arange(self.machine.n_states), hard_pity)
+        pity = np.tile(np.arange(hard_pity), self.machine.n_states)
+        source = rate_states * hard_pity + pity
+        hazard = self.hazard[pity]
+        win_chance = self.machine.win_chance[rate_states]
+
+        # No 5*: pity advances. Hard pity has zero weight here and is dropped.
+        advance = pity + 1 < hard_pity
+        no_hit_rows = source[advance] + 1
+        no_hit_cols = source[advance]
+        no_hit_data = 1.0 - hazard[advance]
+
+        # Rate-up 5*: absorbed
+        win_rows = np.full(source.shape, self.absorbing_state)
+        win_data = hazard * win_chance
+
+        # Other 5*: pity resets and the rate-up state moves on
+        loss_source, loss_target = np.nonzero(self.machine.loss)
+        loss_chance = self.machine.loss[loss_source, loss_target]
+        loss_pity = np.tile(np.arange(hard_pity), len(loss_source))
+        loss_rows = np.repeat(loss_target * hard_pity, hard_pity)
+        loss_cols = np.repeat(loss_source * hard_pity, hard_pity) + loss_pity
+        loss_data = self.hazard[loss_pity] * np.repeat(loss_chance, hard_pity)
+
+        rows = np.concatenate(
+            [no_hit_rows, win_rows, loss_rows, [self.absorbing_state]]
+        )
+        cols = np.concatenate([no_hit_cols, source, loss_cols, [self.absorbing_state]])
+        data = np.concatenate([no_hit_data, win_data, loss_data, [1.0]])
+        return SparseOperator(rows, cols, data, (self.n_states, self.n_states))
+
+    def state_index(self, pity: int = 0, guaranteed: bool = False) -> int:
+        """Return the chain index of a player state.
+
+        Args:
+            pity: Pulls made since the last 5*
+            guaranteed: Whether the next 5* is guaranteed to be the rate-up unit
+
+        Returns:
+            Index into the state vector
+
+        Raises:
+            ValidationError: If the state does not exist on this banner
+        """
+        if not (0 <= pity < self.hard_pity):
+            raise ValidationError(
+                f"Pity must be between 0 and {self.hard_pity - 1}, got {pity}"
+            )
+        rate_state = 0
+        if guaranteed:
+            rate_state = self.machine.guaranteed_state
+            if rate_state == 0:
+                raise ValidationError("Banner has no rate-up guarantee")
+        return rate_state * self.hard_pity + pity
+
+    def initial_distribution(
+        self, pity: int = 0, guaranteed: bool = False
+    ) -> FloatArray:
+        """Return the distribution concentrated on one player state.
+
+        Args:
+            pity: Pulls made since the last 5*
+            guaranteed: Whether the next 5* is guaranteed to be the rate-up unit
+
+        Returns:
+            State distribution vector
+        """
+        distribution = np.zeros(self.n_states, dtype=np.float64)
+        distribution[self.state_index(pity, guaranteed)] = 1.0
+        return distribution
+
+    def evolve(self, distribution: FloatArray, pulls: int) -> FloatArray:
+        """Advance a distribution, or columns of distributions, by some pulls.
+
+        Args:
+            distribution: Array of shape (n_states,) or (n_states, k)
+            pulls: Number of pulls to advance
+
+        Returns:
+            Distribution after the pulls
+        """
+        for _ in range(pulls):
+            distribution = self.transition.matvec(distribution)
+        return distribution
+
+    def rate_up_cumulative(
+        self, pulls: int, pity: int = 0, guaranteed: bool = False
+    ) -> FloatArray:
+        """Chance of having the rate-up 5* after each of the next pulls.
+
+        Args:
+            pulls: Number of pulls to evaluate
+            pity: Starting pity
+            guaranteed: Whether the starting state is guaranteed
+
+        Returns:
+            Array whose entry n-1 is the chance of success within n pulls
+        """
+        distribution = self.initial_distribution(pity, guaranteed)
+        cumulative = np.empty(pulls, dtype=np.float64)
+        for step in range(pulls):
+            distribution = self.transition.matvec(distribution)
+            cumulative[step] = distribution[self.absorbing_state]
+        return cumulative
+
+    def rate_up_probability(
+        self, pulls: int, pity: int = 0, guaranteed: bool = False
+    ) -> float:
+        """Chance of having the rate-up 5* within a number of pulls.
+
+        Uses a matrix power by repeated squaring, so the cost grows with
+        log(pulls) rather than pulls.
+
+        Args:
+            pulls: Number of pulls
+            pity: Starting pity
+            guaranteed: Whether the starting state is guaranteed
+
+        Returns:
+            Probability of success within the pulls
+        """
+        start = self.state_index(pity, guaranteed)
+        power = self.transition.matrix_power(pulls)
+        return float(power[self.absorbing_state, start])
+
+    def split_distribution(self, distribution: FloatArray) -> Tuple[FloatArray, float]:
+        """Split a distribution into its transient grid and absorbed mass.
+
+        Args:
+            distribution: State distribution vector
+
+        Returns:
+            tuple: (array of shape (n_rate_up_states, hard_pity), absorbed mass)
+        """
+        grid = distribution[: self.absorbing_state].reshape(
+            self.machine.n_states, self.hard_pity
+        )
+        return grid, float(distribution[self.absorbing_state])
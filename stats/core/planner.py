@@ -0,0 +1,314 @@
+"""Pull budget planner for a wishlist of rate-up goals across banners.
+
+Goals are pursued one after another, each until its copies are obtained.
+Banners keep their own pity and guarantee: the first goal on a banner
+starts from that banner's current state and later goals on the same banner
+start fresh, since a goal always ends on a rate-up win, which resets both.
+Because every phase therefore starts from a known state, the DP over
+(budget, pity, guarantee) reduces to one distribution over pulls spent,
+advanced by one convolution per goal and cut at the pulls available by the
+end of that phase.
+"""
+
+import itertools
+from dataclasses import dataclass
+from typing import (
+    AbstractSet,
+    Dict,
+    Final,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import numpy as np
+
+from core.calculator import FloatArray
+from core.common.errors import ValidationError
+from core.config.banner_config import BannerConfig
+from core.copies import DEFAULT_EPSILON, fft_convolve
+from core.joint import BannerGoal, JointDistributionEngine
+
+# Premium currency per pull, the same in every supported game
+PULL_COST: Final[int] = 160
+# Orders searched up to this many goals, kept in the given order beyond
+MAX_ORDERED_GOALS: Final[int] = 5
+
+BannerKey = Tuple[str, str]
+
+
+def banner_key(config: BannerConfig) -> BannerKey:
+    """Return the key of the pity counter a banner uses."""
+    return (config.game_name, config.banner_type)
+
+
+@dataclass(frozen=True)
+class Goal:
+    """Copies of a banner's rate-up 5* to obtain."""
+
+    config: BannerConfig
+    copies: int = 1
+
+
+@dataclass(frozen=True)
+class BannerState:
+    """Pity and guarantee a banner currently stands at."""
+
+    pity: int = 0
+    guaranteed: bool = False
+
+
+@dataclass(frozen=True)
+class Plan:
+    """Best goal order and its chance of meeting every goal."""
+
+    order: Tuple[Goal, ...]
+    probability: float
+
+
+def pulls_from_currency(currency: int, pull_cost: int = PULL_COST) -> int:
+    """Whole pulls affordable with some premium currency.
+
+    Args:
+        currency: Premium currency held
+        pull_cost: Currency per pull
+
+    Returns:
+        Number of pulls
+    """
+    return max(currency, 0) // pull_cost
+
+
+def income_pulls(daily_income: int, days: int, pull_cost: int = PULL_COST) -> int:
+    """Whole pulls earned from a daily currency income over some days.
+
+    Args:
+        daily_income: Premium currency earned per day
+        days: Number of days
+        pull_cost: Currency per pull
+
+    Returns:
+        Number of pulls
+    """
+    return pulls_from_currency(daily_income * days, pull_cost)
+
+
+def available_pulls(budget: int, phases: int, income_per_phase: int = 0) -> List[int]:
+    """Pulls available by the end of each phase.
+
+    Args:
+        budget: Pulls available now
+        phases: Number of phases
+        income_per_phase: Pulls earned before each phase after the first
+
+    Returns:
+        Cumulative pulls available per phase
+    """
+    return [budget + income_per_phase * phase for phase in range(phases)]
+
+
+class BudgetPlanner:
+    """Chance of meeting a wishlist of goals with a limited pull budget."""
+
+    def __init__(
+        self,
+        goals: Sequence[Goal],
+        states: Optional[Mapping[BannerKey, BannerState]] = None,
+        epsilon: float = DEFAULT_EPSILON,
+        engine: Optional[JointDistributionEngine] = None,
+    ) -> None:
+        """
+        Initialize the planner.
+
+        Args:
+            goals: Goals to meet, in their default order
+            states: Current state per banner (defaults to zero pity, no guarantee)
+            epsilon: Tail mass that may be discarded from the copies PMFs
+            engine: Source of cached single-banner PMFs (defaults to a new one)
+
+        Raises:
+            ValidationError: If a goal asks for fewer than one copy
+        """
+        for goal in goals:
+            if goal.copies < 1:
+                raise ValidationError(f"Copies must be at least 1, got {goal.copies}")
+        self.goals = tuple(goals)
+        self.states = dict(states or {})
+        self.engine = engine or JointDistributionEngine(epsilon)
+
+    def _pmf(self, goal: Goal, state: BannerState) -> FloatArray:
+        """Pulls needed for a goal from a banner state, computed once."""
+        return self.engine.banner_pmf(
+            BannerGoal(goal.config, goal.copies, state.pity, state.guaranteed)
+        )
+
+    def _phase_pmf(self, goal: Goal, used: AbstractSet[BannerKey]) -> FloatArray:
+        """PMF of a goal after goals on the banners in used have been met."""
+        key = banner_key(goal.config)
+        state = BannerState() if key in used else self.states.get(key, BannerState())
+        return self._pmf(goal, state)
+
+    def _phase_pmfs(self, order: Sequence[Goal]) -> Iterable[FloatArray]:
+        """PMFs of the goals in order, each from the state its banner is in."""
+        used: set[BannerKey] = set()
+        for goal in order:
+            yield self._phase_pmf(goal, used)
+            used.add(banner_key(goal.config))
+
+    def probability(
+        self,
+        budget: int,
+        income_per_phase: int = 0,
+        order: Optional[Sequence[Goal]] = None,
+    ) -> float:
+        """Chance of meeting every goal when pursued in a given order.
+
+        Args:
+            budget: Pulls available now
+            income_per_phase: Pulls earned before each phase after the first
+            order: Goal order (defaults to the order given at construction)
+
+        Returns:
+            Probability of meeting all goals
+        """
+        order = self.goals if order is None else tuple(order)
+        if budget < 0:
+            return 0.0
+        limits = available_pulls(budget, len(order), income_per_phase)
+
+        # spent[n]: chance of having met the goals so far using exactly n pulls
+        spent = np.ones(1, dtype=np.float64)
+        for pmf, limit in zip(self._phase_pmfs(order), limits):
+            spent = fft_convolve(spent, pmf[: limit + 1])[: limit + 1]
+        return float(min(spent.sum(), 1.0))
+
+    def probability_curve(
+        self, max_budget: int, order: Optional[Sequence[Goal]] = None
+    ) -> FloatArray:
+        """Chance of meeting every goal for each budget up to max_budget.
+
+        Without income, success only depends on the total pulls spent, so
+        one pass answers every budget at once.
+
+        Args:
+            max_budget: Largest budget evaluated
+            order: Goal order (defaults to the order given at construction)
+
+        Returns:
+            Array whose entry b is the probability with a budget of b pulls
+        """
+        order = self.goals if order is None else tuple(order)
+        spent = np.ones(1, dtype=np.float64)
+        for pmf in self._phase_pmfs(order):
+            spent = fft_convolve(spent, pmf[: max_budget + 1])[: max_budget + 1]
+        curve = np.zeros(max_budget + 1, dtype=np.float64)
+        curve[: len(spent)] = np.cumsum(spent)
+        curve[len(spent) :] = curve[len(spent) - 1]
+        return np.minimum(curve, 1.0)
+
+    def _tail_cdfs(self, limit: int) -> Dict[FrozenSet[int], FloatArray]:
+        """CDF of the pulls the goals left over after any prefix need in total.
+
+        Keyed by the indices of the remaining goals. The banners of the other
+        goals have been used, and the total does not depend on the order the
+        remaining goals are met in, so one convolution per subset suffices.
+        """
+        cdfs: Dict[FrozenSet[int], FloatArray] = {}
+        pmfs: Dict[FrozenSet[int], FloatArray] = {
+            frozenset(): np.ones(1, dtype=np.float64)
+        }
+        indices = range(len(self.goals))
+        for size in range(1, len(self.goals) + 1):
+            for subset in itertools.combinations(indices, size):
+                remaining = frozenset(subset)
+                first, rest = subset[0], frozenset(subset[1:])
+                used = {
+                    banner_key(self.goals[i].config)
+                    for i in indices
+                    if i not in remaining
+                }
+                pmf = self._phase_pmf(self.goals[first], used)
+                pmfs[remaining] = fft_convolve(pmfs[rest], pmf[: limit + 1])[
+                    : limit + 1
+                ]
+        for remaining, pmf in pmfs.items():
+            cdf = np.zeros(limit + 1, dtype=np.float64)
+            cdf[: len(pmf)] = np.cumsum(pmf)
+            cdf[len(pmf) :] = cdf[len(pmf) - 1]
+            cdfs[remaining] = cdf
+        return cdfs
+
+    def plan(self, budget: int, income_per_phase: int = 0) -> Plan:
+        """Find the goal order with the best chance of meeting every goal.
+
+        Without income every order gives the same chance: the convolutions
+        commute, and a goal's copies after the first start fresh whichever
+        goal on its banner comes first. With income, later goals have more
+        pulls to draw on, so orders of up to MAX_ORDERED_GOALS goals are
+        searched depth first, sharing the convolutions of common prefixes.
+        A prefix is dropped once even meeting the remaining goals within the
+        final budget, ignoring the earlier phase limits, cannot beat the best
+        complete order.
+
+        Args:
+            budget: Pulls available now
+            income_per_phase: Pulls earned before each phase after the first
+
+        Returns:
+            Best order and its probability
+        """
+        best = Plan(
+            order=self.goals,
+            probability=self.probability(budget, income_per_phase),
+        )
+        if income_per_phase == 0 or budget < 0 or len(self.goals) > MAX_ORDERED_GOALS:
+            return best
+        limits = available_pulls(budget, len(self.goals), income_per_phase)
+        tails = self._tail_cdfs(limits[-1])
+        # Mass the PMF truncation may shift between orders
+        slack = self.engine.epsilon * len(self.goals)
+
+        def bound(spent: FloatArray, remaining: FrozenSet[int]) -> float:
+            """Upper bound on the chance of any order completing a prefix."""
+            tail = tails[remaining][limits[-1] - np.arange(len(spent))]
+            return float(spent @ tail)
+
+        def search(
+            prefix: Tuple[int, ...],
+            remaining: FrozenSet[int],
+            spent: FloatArray,
+        ) -> None:
+            nonlocal best
+            if not remaining:
+                probability = float(min(spent.sum(), 1.0))
+                if probability > best.probability:
+                    order = tuple(self.goals[i] for i in prefix)
+                    best = Plan(order=order, probability=probability)
+                return
+            limit = limits[len(prefix)]
+            used = {banner_key(self.goals[i].config) for i in prefix}
+            children = []
+            seen = set()
+            for i in sorted(remaining):
+                goal = self.goals[i]
+                # Equal goals lead to the same orders
+                if goal in seen:
+                    continue
+                seen.add(goal)
+                pmf = self._phase_pmf(goal, used)
+                advanced = fft_convolve(spent, pmf[: limit + 1])[: limit + 1]
+                rest = remaining - {i}
+                children.append((bound(advanced, rest), i, rest, advanced))
+            # Promising prefixes first, so that a good order prunes the rest
+            children.sort(key=lambda child: -child[0])
+            for upper, i, rest, advanced in children:
+                if upper + slack <= best.probability:
+                    break
+                search(prefix + (i,), rest, advanced)
+
+        search((), frozenset(range(len(self.goals))), np.ones(1, dtype=np.float64))
+        return best
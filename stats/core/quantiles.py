@@ -0,0 +1,80 @@
+"""Quantile queries on cumulative probability curves.
+
+A quantile is the smallest roll number whose cumulative probability reaches
+the target. Targets that a curve never reaches map to ``UNREACHABLE``.
+"""
+
+from typing import Final, Sequence, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from core.calculator import FloatArray
+
+IntArray = npt.NDArray[np.int64]
+
+UNREACHABLE: Final[int] = -1
+DEFAULT_PERCENTILES: Final[Tuple[float, ...]] = (10, 25, 50, 75, 90, 95, 99)
+
+
+def pulls_for_probability(
+    cumulative: npt.ArrayLike, targets: npt.ArrayLike
+) -> IntArray:
+    """Pulls needed to reach each target probability.
+
+    Accepts a single curve of shape (rolls,) or a batch of shape
+    (n_curves, rolls). A batch is searched in one ``searchsorted`` call on
+    complex keys ``row + 1j * probability``: NumPy orders complex numbers
+    lexicographically, so the flattened keys stay sorted without any loss of
+    precision in the probabilities.
+
+    Args:
+        cumulative: Non-decreasing cumulative curve(s), entry n-1 for roll n
+        targets: Target probabilities, any shape
+
+    Returns:
+        Roll numbers of shape curves.shape[:-1] + targets.shape
+    """
+    curves = np.asarray(cumulative, dtype=np.float64)
+    target_array = np.asarray(targets, dtype=np.float64)
+    single = curves.ndim == 1
+    curves = np.atleast_2d(curves)
+    n_curves, rolls = curves.shape
+
+    rows = np.arange(n_curves, dtype=np.float64)[:, np.newaxis]
+    keys = (rows + 1j * curves).ravel()
+    queries = rows + 1j * target_array.reshape(1, -1)
+    positions = np.searchsorted(keys, queries, side="left")
+
+    roll_index = positions - (np.arange(n_curves) * rolls)[:, np.newaxis]
+    result = np.where(roll_index < rolls, roll_index + 1, UNREACHABLE)
+    result = result.reshape((n_curves,) + target_array.shape).astype(np.int64)
+    return result[0] if single else result
+
+
+def median_pulls(cumulative: npt.ArrayLike) -> IntArray:
+    """Pulls needed for a 50% chance.
+
+    Args:
+        cumulative: Cumulative curve(s)
+
+    Returns:
+        Median roll number per curve
+    """
+    return pulls_for_probability(cumulative, 0.5)
+
+
+def percentile_table(
+    cumulative: npt.ArrayLike, percentiles: Sequence[float] = DEFAULT_PERCENTILES
+) -> IntArray:
+    """Pulls needed for each percentile.
+
+    Args:
+        cumulative: Cumulative curve(s)
+        percentiles: Percentiles in [0, 100]
+
+    Returns:
+        Roll numbers with a trailing axis over the percentiles
+    """
+    targets: FloatArray = np.asarray(percentiles, dtype=np.float64) / 100.0
+    return pulls_for_probability(cumulative, targets)
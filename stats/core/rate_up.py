@@ -0,0 +1,128 @@
+"""Rate-up state machine compiled from a banner's rate-up rule.
+
+Each state holds the chance that a 5* is the wanted unit and the chances of
+moving to every state when it is not. Getting the wanted unit always
+returns the machine to state 0. Rules are compiled once and the machines
+are cached, so every calculation reuses the same read-only arrays.
+"""
+
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+
+from core.calculator import FloatArray
+from core.config.banner_config import BannerConfig
+from core.config.rate_up_rules import RateUpRule
+
+
+class RateUpMachine(NamedTuple):
+    """Per-state chance of the wanted unit and transitions when missing it.
+
+    ``loss[s, t]`` is the chance that a 5* from state s is not the wanted
+    unit and moves the machine to state t, so ``win_chance[s]`` plus row s
+    of ``loss`` sums to one.
+    """
+
+    win_chance: FloatArray
+    loss: FloatArray
+    guaranteed_state: int
+
+    @property
+    def n_states(self) -> int:
+        """Number of rate-up states."""
+        return int(self.win_chance.shape[0])
+
+
+def _state_index(rule: RateUpRule, streak: int, fate: int) -> int:
+    """Index of (off-banner streak, fate points) in a compiled machine."""
+    return fate * (rule.guarantee_after + 1) + streak
+
+
+@lru_cache(maxsize=None)
+def compile_rule(rule: RateUpRule) -> RateUpMachine:
+    """Compile a rate-up rule into a state machine.
+
+    States are (off-banner 5* in a row, fate points), up to the guarantee
+    and the fate point cap. The result is cached per rule and read-only.
+
+    Args:
+        rule: Rate-up rule
+
+    Returns:
+        Rate-up state machine
+    """
+    streaks = rule.guarantee_after + 1
+    n_states = streaks * (rule.fate_points + 1)
+    win_chance = np.zeros(n_states, dtype=np.float64)
+    loss = np.zeros((n_states, n_states), dtype=np.float64)
+
+    for fate in range(rule.fate_points + 1):
+        for streak in range(streaks):
+            state = _state_index(rule, streak, fate)
+            if rule.fate_points and fate == rule.fate_points:
+                win_chance[state] = 1.0
+                continue
+
+            if rule.guarantee_after and streak == rule.guarantee_after:
+                featured = 1.0
+            else:
+                lost = 1.0 - rule.featured_chance
+                featured = rule.featured_chance + lost * rule.capture_chance
+            wanted = featured / rule.featured_count
+            win_chance[state] = wanted
+
+            next_fate = min(fate + 1, rule.fate_points)
+            next_streak = min(streak + 1, rule.guarantee_after)
+            # Another featured unit ends the off-banner streak
+            loss[state, _state_index(rule, 0, next_fate)] += featured - wanted
+            loss[state, _state_index(rule, next_streak, next_fate)] += 1.0 - featured
+
+    win_chance.flags.writeable = False
+    loss.flags.writeable = False
+    # Only views are published, since NumPy will not make them writeable again
+    return RateUpMachine(
+        win_chance=win_chance.view(),
+        loss=loss.view(),
+        guaranteed_state=_guaranteed_state(rule),
+    )
+
+
+def _guaranteed_state(rule: RateUpRule) -> int:
+    """State reached by an off-banner 5* from state 0, or 0 if none is tracked."""
+    streak = min(1, rule.guarantee_after)
+    fate = min(1, rule.fate_points)
+    return _state_index(rule, streak, fate)
+
+
+def rate_up_machine(config: BannerConfig) -> RateUpMachine:
+    """Return the cached rate-up state machine of a banner.
+
+    Uses ``config.rate_up_rule``, or the rule equivalent to the legacy
+    ``rate_up_chance`` and ``guaranteed_rate_up`` fields when it is unset.
+
+    Args:
+        config: Banner configuration
+
+    Returns:
+        Rate-up state machine
+    """
+    return compile_rule(config.effective_rate_up_rule)
+
+
+def loss_thresholds(machine: RateUpMachine) -> FloatArray:
+    """Cumulative outcome chances per state, for sampling transitions.
+
+    A uniform draw u below ``win_chance[s]`` wins; otherwise the next state
+    is the number of thresholds in row s that are at most u.
+
+    Args:
+        machine: Rate-up state machine
+
+    Returns:
+        Array of shape (n_states, n_states)
+    """
+    thresholds: FloatArray = machine.win_chance[:, np.newaxis] + np.cumsum(
+        machine.loss, axis=1
+    )
+    return thresholds
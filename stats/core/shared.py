@@ -0,0 +1,109 @@
+"""Thread-safe probability calculator shared between worker threads.
+
+Curves are cached under the same key as ``CalculationCache``. When several
+threads ask for a key that is not cached yet, the first one computes it and
+the others wait for its result instead of repeating the work. The cached
+arrays are read-only and callers only get views of them; NumPy refuses to
+make such a view writeable again, so no caller can corrupt a result others
+hold.
+"""
+
+import threading
+from typing import Dict, Final, Optional, Tuple
+
+from core.cache import CalculationKey, LRUCache, calculation_key
+from core.calculator import FloatArray, ProbabilityCalculator
+from core.config.banner_config import BannerConfig
+
+DEFAULT_SHARED_CACHE_SIZE: Final[int] = 256
+
+ArrayCurves = Tuple[FloatArray, FloatArray, FloatArray]
+
+
+def _publish(arrays: ArrayCurves) -> ArrayCurves:
+    """Freeze freshly computed arrays and return views that stay read-only."""
+    for array in arrays:
+        array.flags.writeable = False
+    per_roll, cumulative, first_5star = arrays
+    return per_roll.view(), cumulative.view(), first_5star.view()
+
+
+class _Flight:
+    """Computation in progress that other threads can wait on."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Optional[ArrayCurves] = None
+        self.error: Optional[BaseException] = None
+
+
+class SharedCalculator:
+    """Caches probability curves and coalesces concurrent identical requests."""
+
+    def __init__(self, cache_size: int = DEFAULT_SHARED_CACHE_SIZE) -> None:
+        """
+        Initialize the calculator.
+
+        Args:
+            cache_size: Number of curve sets kept
+        """
+        self._lock = threading.Lock()
+        self._cache: LRUCache[CalculationKey, ArrayCurves] = LRUCache(cache_size)
+        self._in_flight: Dict[CalculationKey, _Flight] = {}
+        self.computations = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._cache)
+
+    def curves(self, config: BannerConfig) -> ArrayCurves:
+        """Return the probability curves of a banner.
+
+        Only one thread computes a given key at a time; concurrent callers
+        for the same key block until it finishes and share its result, or
+        its exception.
+
+        Args:
+            config: Banner configuration
+
+        Returns:
+            tuple: Read-only (per_roll_prob, cumulative_prob, first_5star_prob)
+        """
+        key = calculation_key(config)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = self._in_flight[key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            assert flight.result is not None
+            return flight.result
+
+        try:
+            arrays = _publish(
+                ProbabilityCalculator(config).calculate_probability_arrays()
+            )
+            flight.result = arrays
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                if flight.result is not None:
+                    self._cache.put(key, flight.result)
+                    self.computations += 1
+                del self._in_flight[key]
+            flight.done.set()
+        return arrays
+
+    def clear(self) -> None:
+        """Remove every cached curve; computations in progress are unaffected."""
+        with self._lock:
+            self._cache.clear()
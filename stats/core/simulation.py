@@ -0,0 +1,171 @@
+"""Vectorized Monte Carlo simulation of banner pulls.
+
+Samples are split into fixed-size chunks. Every chunk draws from its own
+NumPy ``Generator`` seeded by ``SeedSequence.spawn``, so a chunk's draws
+depend only on the root seed and the chunk index. Chunk results are integer
+histograms that are summed, which makes the outcome bit-identical for any
+number of workers.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Final, List, Optional, Tuple, cast
+
+import numpy as np
+import numpy.typing as npt
+
+from core.calculator import FloatArray, ProbabilityCalculator
+from core.common.errors import ValidationError
+from core.config.banner_config import BannerConfig
+from core.rate_up import loss_thresholds, rate_up_machine
+
+IntArray = npt.NDArray[np.int64]
+
+DEFAULT_CHUNK_SIZE: Final[int] = 20_000
+
+
+@dataclass(frozen=True)
+class SimulationResult:
+    """Histograms of simulated pull counts, indexed by pull count."""
+
+    samples: int
+    seed: int
+    first_5star_counts: IntArray
+    rate_up_counts: IntArray
+
+    def first_5star_pmf(self) -> FloatArray:
+        """Empirical PMF of the pulls until the first 5*."""
+        return self.first_5star_counts / self.samples
+
+    def rate_up_pmf(self) -> FloatArray:
+        """Empirical PMF of the pulls until the first rate-up 5*."""
+        return self.rate_up_counts / self.samples
+
+
+def _merge_counts(total: IntArray, counts: IntArray) -> IntArray:
+    """Add two histograms of possibly different lengths."""
+    if len(counts) > len(total):
+        total, counts = counts, total
+    total = total.copy()
+    total[: len(counts)] += counts
+    return total
+
+
+def _simulate_chunk(
+    hazard: FloatArray,
+    win_chance: FloatArray,
+    thresholds: FloatArray,
+    samples: int,
+    seed: np.random.SeedSequence,
+) -> Tuple[IntArray, IntArray]:
+    """Simulate one chunk of pull sequences.
+
+    Args:
+        hazard: Per-roll 5* rate for rolls 1..hard_pity
+        win_chance: Rate-up chance of each rate-up state
+        thresholds: Cumulative outcome chances of each rate-up state
+        samples: Number of sequences in the chunk
+        seed: Seed sequence of this chunk
+
+    Returns:
+        tuple: (first 5* histogram, rate-up 5* histogram)
+    """
+    rng = np.random.default_rng(seed)
+    total_pulls = np.zeros(samples, dtype=np.int64)
+    state = np.zeros(samples, dtype=np.int64)
+    active = np.arange(samples)
+    first_5star: Optional[IntArray] = None
+
+    # Each round pulls every unfinished sequence up to its next 5*
+    while active.size:
+        hits = rng.random((active.size, hazard.size)) < hazard
+        pulls = hits.argmax(axis=1) + 1
+        if first_5star is None:
+            first_5star = pulls
+        total_pulls[active] += pulls
+
+        draws = rng.random(active.size)
+        won = draws < win_chance[state[active]]
+        lost = active[~won]
+        next_state = (draws[~won, np.newaxis] >= thresholds[state[lost]]).sum(axis=1)
+        state[lost] = np.minimum(next_state, len(win_chance) - 1)
+        active = lost
+
+    assert first_5star is not None  # samples >= 1 runs at least one round
+    return np.bincount(first_5star), np.bincount(total_pulls)
+
+
+class MonteCarloSimulator:
+    """Simulates many pull sequences of a banner at once."""
+
+    def __init__(
+        self,
+        config: BannerConfig,
+        samples: int,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        seed: Optional[int] = None,
+        workers: Optional[int] = 1,
+    ) -> None:
+        """
+        Initialize the simulator.
+
+        Args:
+            config: Banner configuration
+            samples: Number of pull sequences to simulate
+            chunk_size: Sequences simulated per chunk, bounding memory use
+            seed: Root seed (defaults to fresh entropy, reported in the result)
+            workers: Worker processes (None uses every core, 1 runs in-process)
+        """
+        if samples < 1:
+            raise ValidationError(f"Samples must be positive, got {samples}")
+        if chunk_size < 1:
+            raise ValidationError(f"Chunk size must be positive, got {chunk_size}")
+        self.config = config
+        self.samples = samples
+        self.chunk_size = chunk_size
+        self.seed = seed
+        self.workers = workers or os.cpu_count() or 1
+
+    def _chunk_sizes(self) -> List[int]:
+        """Split the samples into fixed-size chunks."""
+        full, rest = divmod(self.samples, self.chunk_size)
+        return [self.chunk_size] * full + ([rest] if rest else [])
+
+    def run(self) -> SimulationResult:
+        """Run the simulation.
+
+        Returns:
+            Histograms of simulated pulls to the first 5* and rate-up 5*
+        """
+        hazard, _, _ = ProbabilityCalculator(self.config).calculate_probability_arrays()
+        machine = rate_up_machine(self.config)
+        root = np.random.SeedSequence(self.seed)
+        sizes = self._chunk_sizes()
+        seeds = root.spawn(len(sizes))
+        args = (
+            [hazard] * len(sizes),
+            [machine.win_chance] * len(sizes),
+            [loss_thresholds(machine)] * len(sizes),
+            sizes,
+            seeds,
+        )
+
+        if self.workers > 1 and len(sizes) > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                chunks = list(executor.map(_simulate_chunk, *args))
+        else:
+            chunks = list(map(_simulate_chunk, *args))
+
+        first_counts = np.zeros(0, dtype=np.int64)
+        rate_up_counts = np.zeros(0, dtype=np.int64)
+        for first, rate_up in chunks:
+            first_counts = _merge_counts(first_counts, first)
+            rate_up_counts = _merge_counts(rate_up_counts, rate_up)
+
+        return SimulationResult(
+            samples=self.samples,
+            seed=cast(int, root.entropy),
+            first_5star_counts=first_counts,
+            rate_up_counts=rate_up_counts,
+        )
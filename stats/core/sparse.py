@@ -0,0 +1,104 @@
+"""Minimal sparse linear operator built on NumPy.
+
+Transition matrices of the pity chains have only a few non-zero entries per
+column, so they are stored as sorted coordinate triplets and applied with a
+gather followed by a segmented sum.
+"""
+
+from typing import Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from core.calculator import FloatArray
+
+IntArray = npt.NDArray[np.int64]
+
+
+class SparseOperator:
+    """Sparse matrix in coordinate form with fast products."""
+
+    def __init__(
+        self,
+        rows: npt.ArrayLike,
+        cols: npt.ArrayLike,
+        data: npt.ArrayLike,
+        shape: Tuple[int, int],
+    ) -> None:
+        """
+        Initialize the operator from coordinate triplets.
+
+        Duplicate coordinates are summed and explicit zeros are dropped.
+
+        Args:
+            rows: Row index of each entry
+            cols: Column index of each entry
+            data: Value of each entry
+            shape: Matrix shape as (n_rows, n_cols)
+        """
+        rows_arr = np.asarray(rows, dtype=np.int64).ravel()
+        cols_arr = np.asarray(cols, dtype=np.int64).ravel()
+        data_arr = np.asarray(data, dtype=np.float64).ravel()
+        keep = data_arr != 0.0
+        rows_arr, cols_arr, data_arr = rows_arr[keep], cols_arr[keep], data_arr[keep]
+
+        order = np.lexsort((cols_arr, rows_arr))
+        self.rows: IntArray = rows_arr[order]
+        self.cols: IntArray = cols_arr[order]
+        self.data: FloatArray = data_arr[order]
+        self.shape = shape
+
+        # Start offset of each non-empty row, for segmented sums
+        self._row_ids, self._row_starts = np.unique(self.rows, return_index=True)
+
+    @property
+    def nnz(self) -> int:
+        """Number of stored entries."""
+        return int(self.data.shape[0])
+
+    def matvec(self, x: FloatArray) -> FloatArray:
+        """Multiply the operator by a vector or by each column of a matrix.
+
+        Args:
+            x: Array of shape (n_cols,) or (n_cols, k)
+
+        Returns:
+            Array of shape (n_rows,) or (n_rows, k)
+        """
+        out = np.zeros((self.shape[0],) + x.shape[1:], dtype=np.float64)
+        if self.nnz == 0:
+            return out
+        weights = self.data.reshape((-1,) + (1,) * (x.ndim - 1))
+        products = weights * x[self.cols]
+        out[self._row_ids] = np.add.reduceat(products, self._row_starts, axis=0)
+        return out
+
+    def to_dense(self) -> FloatArray:
+        """Return the operator as a dense matrix."""
+        dense = np.zeros(self.shape, dtype=np.float64)
+        np.add.at(dense, (self.rows, self.cols), self.data)
+        return dense
+
+    def matrix_power(self, exponent: int) -> FloatArray:
+        """Raise the operator to a power by repeated squaring.
+
+        Args:
+            exponent: Non-negative power
+
+        Returns:
+            Dense matrix equal to the operator applied ``exponent`` times
+        """
+        if exponent < 0:
+            raise ValueError("Exponent must be non-negative")
+        if self.shape[0] != self.shape[1]:
+            raise ValueError("Matrix power requires a square operator")
+
+        result = np.eye(self.shape[0], dtype=np.float64)
+        base = self.to_dense()
+        while exponent:
+            if exponent & 1:
+                result = base @ result
+            exponent >>= 1
+            if exponent:
+                base = base @ base
+        return result
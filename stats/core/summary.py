@@ -0,0 +1,167 @@
+"""Summary statistics of the pulls needed per banner.
+
+Expected pulls and standard deviation come straight from the moments of the
+first 5* PMF. For the rate-up unit, the pulls are a sum of N independent
+first 5* waits, where N is the number of 5* needed to win the rate-up; its
+moments follow from those of the wait and of N, which the rate-up state
+machine gives in closed form.
+"""
+
+from dataclasses import dataclass
+from typing import Sequence, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from core.calculator import FloatArray
+from core.common.errors import CalculationError
+from core.config.banner_config import BannerConfig
+from core.copies import DEFAULT_EPSILON, single_copy_pmf
+from core.quantiles import DEFAULT_PERCENTILES, IntArray, percentile_table
+from core.rate_up import rate_up_machine
+
+
+@dataclass(frozen=True)
+class SummaryStatistics:
+    """Mean, standard deviation and percentiles of the pulls per banner."""
+
+    mean: FloatArray
+    std: FloatArray
+    percentiles: Tuple[float, ...]
+    percentile_pulls: IntArray
+
+
+def pad_curves(curves: Sequence[npt.ArrayLike]) -> FloatArray:
+    """Stack curves of different lengths, padding each with zeros.
+
+    Args:
+        curves: One curve per banner
+
+    Returns:
+        Array of shape (len(curves), longest curve)
+    """
+    arrays = [np.asarray(curve, dtype=np.float64) for curve in curves]
+    length = max((len(array) for array in arrays), default=0)
+    padded = np.zeros((len(arrays), length), dtype=np.float64)
+    for row, array in zip(padded, arrays):
+        row[: len(array)] = array
+    return padded
+
+
+def pmf_moments(first_5star: npt.ArrayLike) -> Tuple[FloatArray, FloatArray]:
+    """Mean and variance of the roll number of a PMF.
+
+    Args:
+        first_5star: PMF(s) of shape (rolls,) or (n, rolls), entry n-1 for roll n
+
+    Returns:
+        tuple: (mean, variance) over the last axis
+    """
+    pmf = np.asarray(first_5star, dtype=np.float64)
+    rolls = np.arange(1, pmf.shape[-1] + 1, dtype=np.float64)
+    mean = pmf @ rolls
+    variance = np.maximum(pmf @ (rolls * rolls) - mean * mean, 0.0)
+    return mean, variance
+
+
+def summarize_pmf(
+    first_5star: npt.ArrayLike, percentiles: Sequence[float] = DEFAULT_PERCENTILES
+) -> SummaryStatistics:
+    """Summarize the pulls until the first 5* of one or many banners.
+
+    Args:
+        first_5star: First 5* PMF(s), zero-padded when stacked
+        percentiles: Percentiles in [0, 100]
+
+    Returns:
+        Summary with one entry per PMF
+    """
+    pmf = np.atleast_2d(np.asarray(first_5star, dtype=np.float64))
+    mean, variance = pmf_moments(pmf)
+    return SummaryStatistics(
+        mean=mean,
+        std=np.sqrt(variance),
+        percentiles=tuple(percentiles),
+        percentile_pulls=percentile_table(np.cumsum(pmf, axis=1), percentiles),
+    )
+
+
+def rate_up_attempt_moments(
+    configs: Sequence[BannerConfig],
+) -> Tuple[FloatArray, FloatArray]:
+    """Mean and variance of the number of 5* needed for the rate-up unit.
+
+    With L the loss transitions of the rate-up machine, the first two
+    moments m and q of N from every state solve ``(I - L) m = 1`` and
+    ``(I - L) q = 1 + 2 L m``. Machines are padded to a common size with
+    states that always win and solved in one batched call.
+
+    Args:
+        configs: Banner configurations
+
+    Returns:
+        tuple: (mean, variance) per config, starting without a guarantee
+
+    Raises:
+        CalculationError: If a rate-up unit can never be obtained
+    """
+    machines = [rate_up_machine(config) for config in configs]
+    size = max((machine.n_states for machine in machines), default=1)
+    loss = np.zeros((len(machines), size, size), dtype=np.float64)
+    for matrix, machine in zip(loss, machines):
+        matrix[: machine.n_states, : machine.n_states] = machine.loss
+
+    system = np.eye(size) - loss
+    ones = np.ones((len(machines), size, 1), dtype=np.float64)
+    try:
+        mean = np.linalg.solve(system, ones)
+        second = np.linalg.solve(system, ones + 2.0 * (loss @ mean))
+    except np.linalg.LinAlgError as e:
+        raise CalculationError(
+            "Rate-up unit is unreachable with this rate-up rule"
+        ) from e
+    mean_n, second_n = mean[:, 0, 0], second[:, 0, 0]
+    return mean_n, np.maximum(second_n - mean_n * mean_n, 0.0)
+
+
+def summarize_rate_up(
+    configs: Sequence[BannerConfig],
+    first_5star: npt.ArrayLike,
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+    epsilon: float = DEFAULT_EPSILON,
+) -> SummaryStatistics:
+    """Summarize the pulls until the rate-up 5* of many banners.
+
+    Mean and standard deviation are closed-form over the whole batch:
+    ``E[T] = E[N] E[X]`` and ``Var[T] = E[N] Var[X] + Var[N] E[X]^2`` for
+    first 5* wait X. Percentiles need the full distribution and are read
+    from each banner's single-copy PMF.
+
+    Args:
+        configs: Banner configurations, one per PMF
+        first_5star: First 5* PMF(s) of the configs, zero-padded when stacked
+        percentiles: Percentiles in [0, 100]
+        epsilon: Tail mass that may be discarded from the single-copy PMFs
+
+    Returns:
+        Summary with one entry per config
+    """
+    pmf = np.atleast_2d(np.asarray(first_5star, dtype=np.float64))
+    wait_mean, wait_variance = pmf_moments(pmf)
+    attempts_mean, attempts_variance = rate_up_attempt_moments(configs)
+
+    mean = attempts_mean * wait_mean
+    variance = attempts_mean * wait_variance + attempts_variance * wait_mean**2
+
+    # Single-copy PMFs are indexed by pull count, curves by roll
+    cumulative = pad_curves(
+        [np.cumsum(single_copy_pmf(config, epsilon=epsilon))[1:] for config in configs]
+    )
+    # Hold each curve's final value over its zero padding
+    filled = np.maximum.accumulate(cumulative, axis=1)
+    return SummaryStatistics(
+        mean=mean,
+        std=np.sqrt(variance),
+        percentiles=tuple(percentiles),
+        percentile_pulls=percentile_table(filled, percentiles),
+    )
@@ -0,0 +1,39 @@
+"""Atomic file replacement for output writers."""
+
+import os
+import uuid
+from contextlib import contextmanager
+from typing import IO, Any, Iterator, Optional
+
+
+@contextmanager
+def atomic_write(
+    path: str,
+    mode: str = "w",
+    encoding: Optional[str] = None,
+    newline: Optional[str] = None,
+) -> Iterator[IO[Any]]:
+    """Open a temporary file that replaces ``path`` when the block succeeds.
+
+    The temporary file lives next to the target so the final rename stays on
+    one filesystem. If the block raises, the temporary file is removed and
+    any existing file at ``path`` is left untouched.
+
+    Args:
+        path: Final file path
+        mode: Write mode, "w" or "wb"
+        encoding: Text encoding for text mode
+        newline: Newline handling for text mode
+
+    Yields:
+        Open file object for the temporary file
+    """
+    temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(temp_path, mode, encoding=encoding, newline=newline) as file:
+            yield file
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
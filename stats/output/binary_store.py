@@ -0,0 +1,154 @@
+"""Binary output of probability curves with a memory-mapped loader.
+
+Each game is written as two files sharing a stem:
+
+* ``<stem>.npy``: float64 array of shape (3, total_rolls) holding the
+  per-roll, cumulative and first 5* curves of every banner back to back,
+  so each banner's curve is one contiguous slice of a row.
+* ``<stem>.json``: index with the game, the column order and, per banner,
+  its offset, length and config fingerprint.
+
+The loader memory-maps the array, so reading one banner touches only that
+banner's pages and returns views without copying.
+"""
+
+import json
+import os
+from typing import Any, Dict, Final, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from core.calculator import FloatArray
+from core.common.errors import DataError
+from core.config.banner_config import BannerConfig, config_fingerprint
+from output.atomic import atomic_write
+
+BINARY_COLUMNS: Final[Tuple[str, ...]] = ("per_roll", "cumulative", "first_5star")
+INDEX_VERSION: Final[int] = 1
+
+BannerCurves = Tuple[str, BannerConfig, Sequence[Sequence[float]]]
+
+
+class BinaryOutputHandler:
+    """Writes per-game curves as a typed array plus a JSON index."""
+
+    def write(self, stem: str, game: str, banners: Iterable[BannerCurves]) -> None:
+        """Write one game's curves.
+
+        Args:
+            stem: Output path without extension
+            game: Game name stored in the index
+            banners: (banner key, config, (per_roll, cumulative, first_5star))
+        """
+        entries: List[Dict[str, Any]] = []
+        blocks: List[FloatArray] = []
+        offset = 0
+        for banner, config, curves in banners:
+            block = np.asarray(curves, dtype=np.float64)
+            if block.ndim != 2 or block.shape[0] != len(BINARY_COLUMNS):
+                raise ValueError(
+                    f"Expected {len(BINARY_COLUMNS)} curves of equal length for {banner}"
+                )
+            length = int(block.shape[1])
+            entries.append(
+                {
+                    "banner": banner,
+                    "banner_type": config.banner_type,
+                    "offset": offset,
+                    "length": length,
+                    "fingerprint": config_fingerprint(config),
+                }
+            )
+            blocks.append(block)
+            offset += length
+
+        data = (
+            np.concatenate(blocks, axis=1)
+            if blocks
+            else np.zeros((len(BINARY_COLUMNS), 0), dtype=np.float64)
+        )
+        index = {
+            "version": INDEX_VERSION,
+            "game": game,
+            "columns": list(BINARY_COLUMNS),
+            "dtype": "float64",
+            "banners": entries,
+        }
+
+        directory = os.path.dirname(stem)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with atomic_write(f"{stem}.npy", "wb") as file:
+            np.save(file, data)
+        with atomic_write(f"{stem}.json", "w", encoding="utf-8") as file:
+            json.dump(index, file, indent=2)
+
+
+class BinaryResultStore:
+    """Lazy, memory-mapped reader for files written by BinaryOutputHandler."""
+
+    def __init__(self, stem: str) -> None:
+        """
+        Open a store without reading its curve data.
+
+        Args:
+            stem: Path of the files without extension
+
+        Raises:
+            DataError: If the index and the array disagree
+        """
+        with open(f"{stem}.json", encoding="utf-8") as file:
+            self.index: Dict[str, Any] = json.load(file)
+        self.data = np.load(f"{stem}.npy", mmap_mode="r")
+        self._entries: Dict[str, Dict[str, Any]] = {
+            entry["banner"]: entry for entry in self.index["banners"]
+        }
+
+        total = sum(entry["length"] for entry in self.index["banners"])
+        if self.data.shape != (len(self.index["columns"]), total):
+            raise DataError(f"Array shape {self.data.shape} does not match index")
+
+    @property
+    def game(self) -> str:
+        """Game name of the store."""
+        return str(self.index["game"])
+
+    def banners(self) -> List[str]:
+        """Banner keys in file order."""
+        return list(self._entries)
+
+    def fingerprint(self, banner: str) -> str:
+        """Config fingerprint recorded for a banner."""
+        return str(self._entry(banner)["fingerprint"])
+
+    def _entry(self, banner: str) -> Dict[str, Any]:
+        """Return the index entry of a banner."""
+        try:
+            return self._entries[banner]
+        except KeyError:
+            raise DataError(f"Unknown banner: {banner}") from None
+
+    def curve(self, banner: str, column: str = "cumulative") -> FloatArray:
+        """Return one curve of a banner as a read-only view.
+
+        Args:
+            banner: Banner key
+            column: One of BINARY_COLUMNS
+
+        Returns:
+            Memory-mapped view of the curve
+        """
+        if column not in self.index["columns"]:
+            raise DataError(f"Unknown column: {column}")
+        entry = self._entry(banner)
+        row = self.index["columns"].index(column)
+        start = entry["offset"]
+        view: FloatArray = self.data[row, start : start + entry["length"]]
+        return view
+
+    def curves(self, banner: str) -> Tuple[FloatArray, FloatArray, FloatArray]:
+        """Return (per_roll, cumulative, first_5star) views of a banner."""
+        per_roll, cumulative, first_5star = (
+            self.curve(banner, column) for column in BINARY_COLUMNS
+        )
+        return per_roll, cumulative, first_5star
@@ -1,8 +1,10 @@
-"""CSV output handler with chunked writing and validation support."""
+"""CSV output handler with streaming writes and inline validation."""
 
 import csv
 import os
-from typing import List
+from typing import Any, Iterable, Iterator, List, Sequence
+
+from output.atomic import atomic_write
 
 
 class CSVValidationError(Exception):
@@ -17,21 +19,37 @@ class CSVOutputHandler:
     def __init__(self, encoding: str = "utf-8") -> None:
         self.encoding = encoding
 
+    @staticmethod
+    def _validated(
+        rows: Iterable[Sequence[Any]], width: int
+    ) -> Iterator[Sequence[Any]]:
+        """Yield rows, checking each one's length as it goes by."""
+        for row in rows:
+            if len(row) != width:
+                raise ValueError("Row length must match header length")
+            yield row
+
     def write(
         self,
         filename: str,
         header: List[str],
-        rows: List[List[str]],
+        rows: Iterable[Sequence[Any]],
     ) -> None:
-        """Write data to CSV file with basic validation."""
+        """Stream rows to a CSV file, validating each row as it is written.
+
+        Rows may be any iterable, including a generator, and are consumed
+        once. Output goes to a temporary file that replaces ``filename``
+        only after every row was written, so a failed write leaves any
+        previous file untouched.
+        """
         if not header:
             raise ValueError("Header cannot be empty")
-        if any(len(row) != len(header) for row in rows):
-            raise ValueError("Row length must match header length")
 
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
 
-        with open(filename, mode="w", newline="", encoding=self.encoding) as file:
+        with atomic_write(filename, "w", encoding=self.encoding, newline="") as file:
             writer = csv.writer(file)
             writer.writerow(header)
-            writer.writerows(rows)
+            writer.writerows(self._validated(rows, len(header)))
@@ -0,0 +1,223 @@
+"""Precomputed rate-up lookup artifact with a memory-mapped reader.
+
+One file holds, for every banner, the chance of the rate-up 5* within each
+horizon up to a maximum, from every starting pity and guarantee state:
+
+* 8-byte magic and the little-endian uint64 length of a JSON header
+* the JSON header: version, engine version, horizon and, per banner, its
+  game, key, first row, hard pity, guarantee flag and config fingerprint
+* padding to a 64-byte boundary, then a float64 array of shape
+  (rows, horizon + 1) with one row per (banner, guarantee, pity)
+
+The reader memory-maps the array, so opening the file only parses the
+header and a query is a single index into the mapped pages.
+"""
+
+import json
+import os
+import struct
+from typing import Any, Dict, Final, List, Mapping, Tuple
+
+import numpy as np
+
+from core.calculator import ENGINE_VERSION, FloatArray
+from core.common.errors import DataError, ValidationError
+from core.conditional import ConditionalTable
+from core.config.banner_config import BannerConfig, config_fingerprint
+from output.atomic import atomic_write
+
+LOOKUP_MAGIC: Final[bytes] = b"BNRLOOK\x00"
+LOOKUP_VERSION: Final[int] = 1
+DEFAULT_LOOKUP_HORIZON: Final[int] = 300
+_ALIGNMENT: Final[int] = 64
+_LENGTH = struct.Struct("<Q")
+
+
+def _banner_rows(config: BannerConfig, horizon: int) -> Tuple[FloatArray, bool]:
+    """Rate-up chance rows of a banner, without then with the guarantee."""
+    table = ConditionalTable(config, max_pulls=horizon)
+    rows = table.rate_up.reshape(-1, horizon + 1)
+    has_guarantee = table.engine.machine.guaranteed_state != 0
+    states = [False, True] if has_guarantee else [False]
+    index = [
+        table.engine.state_index(pity, guaranteed)
+        for guaranteed in states
+        for pity in range(config.hard_pity)
+    ]
+    return rows[index], has_guarantee
+
+
+def write_lookup(
+    path: str,
+    banner_configs: Mapping[str, Mapping[str, BannerConfig]],
+    horizon: int = DEFAULT_LOOKUP_HORIZON,
+) -> None:
+    """Build and write the lookup artifact of a set of banners.
+
+    Args:
+        path: Output file path
+        banner_configs: Banner configurations per game
+        horizon: Largest number of pulls answered
+
+    Raises:
+        ValidationError: If the horizon is negative
+    """
+    if horizon < 0:
+        raise ValidationError(f"Horizon must be non-negative, got {horizon}")
+    entries: List[Dict[str, Any]] = []
+    blocks: List[FloatArray] = []
+    offset = 0
+    for game, banners in banner_configs.items():
+        for banner, config in banners.items():
+            block, has_guarantee = _banner_rows(config, horizon)
+            entries.append(
+                {
+                    "game": game,
+                    "banner": banner,
+                    "offset": offset,
+                    "hard_pity": config.hard_pity,
+                    "guarantee": has_guarantee,
+                    "fingerprint": config_fingerprint(config),
+                }
+            )
+            blocks.append(block)
+            offset += len(block)
+
+    data = (
+        np.concatenate(blocks)
+        if blocks
+        else np.zeros((0, horizon + 1), dtype=np.float64)
+    )
+    header = json.dumps(
+        {
+            "version": LOOKUP_VERSION,
+            "engine_version": ENGINE_VERSION,
+            "horizon": horizon,
+            "rows": offset,
+            "dtype": "<f8",
+            "banners": entries,
+        },
+        separators=(",", ":"),
+    ).encode("utf-8")
+    prefix = len(LOOKUP_MAGIC) + _LENGTH.size + len(header)
+    padding = -prefix % _ALIGNMENT
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with atomic_write(path, "wb") as file:
+        file.write(LOOKUP_MAGIC)
+        file.write(_LENGTH.pack(len(header)))
+        file.write(header)
+        file.write(b"\x00" * padding)
+        file.write(data.astype("<f8").tobytes())
+
+
+class LookupTable:
+    """Memory-mapped reader for files written by write_lookup."""
+
+    def __init__(self, path: str) -> None:
+        """
+        Open an artifact, reading only its header.
+
+        Args:
+            path: Artifact path
+
+        Raises:
+            DataError: If the file is not a lookup artifact of this version
+        """
+        with open(path, "rb") as file:
+            if file.read(len(LOOKUP_MAGIC)) != LOOKUP_MAGIC:
+                raise DataError(f"Not a lookup artifact: {path}")
+            (length,) = _LENGTH.unpack(file.read(_LENGTH.size))
+            self.header: Dict[str, Any] = json.loads(file.read(length))
+        if self.header["version"] != LOOKUP_VERSION:
+            raise DataError(f"Unsupported lookup version {self.header['version']}")
+
+        self.horizon: int = self.header["horizon"]
+        prefix = len(LOOKUP_MAGIC) + _LENGTH.size + length
+        shape = (self.header["rows"], self.horizon + 1)
+        # An empty array cannot be memory-mapped
+        self.data: FloatArray = (
+            np.memmap(
+                path,
+                dtype=self.header["dtype"],
+                mode="r",
+                offset=prefix + (-prefix % _ALIGNMENT),
+                shape=shape,
+            )
+            if shape[0]
+            else np.zeros(shape, dtype=np.float64)
+        )
+        self._entries: Dict[Tuple[str, str], Dict[str, Any]] = {
+            (entry["game"], entry["banner"]): entry for entry in self.header["banners"]
+        }
+
+    @property
+    def engine_version(self) -> str:
+        """Engine version the artifact was built with."""
+        return str(self.header["engine_version"])
+
+    def banners(self) -> List[Tuple[str, str]]:
+        """(game, banner key) pairs in file order."""
+        return list(self._entries)
+
+    def fingerprint(self, game: str, banner: str) -> str:
+        """Config fingerprint recorded for a banner."""
+        return str(self._entry(game, banner)["fingerprint"])
+
+    def _entry(self, game: str, banner: str) -> Dict[str, Any]:
+        """Return the header entry of a banner."""
+        try:
+            return self._entries[(game, banner)]
+        except KeyError:
+            raise DataError(f"Unknown banner: {game}/{banner}") from None
+
+    def curve(
+        self, game: str, banner: str, pity: int = 0, guaranteed: bool = False
+    ) -> FloatArray:
+        """Rate-up chance within 0..horizon pulls from one state.
+
+        Args:
+            game: Game name
+            banner: Banner key
+            pity: Pulls made since the last 5*
+            guaranteed: Whether the next 5* is guaranteed to be featured
+
+        Returns:
+            Memory-mapped view indexed by pull count
+
+        Raises:
+            ValidationError: If the state does not exist on the banner
+        """
+        entry = self._entry(game, banner)
+        if not (0 <= pity < entry["hard_pity"]):
+            raise ValidationError(
+                f"Pity must be between 0 and {entry['hard_pity'] - 1}, got {pity}"
+            )
+        if guaranteed and not entry["guarantee"]:
+            raise ValidationError("Banner has no rate-up guarantee")
+        row = entry["offset"] + guaranteed * entry["hard_pity"] + pity
+        view: FloatArray = self.data[row]
+        return view
+
+    def probability(
+        self, game: str, banner: str, pity: int, pulls: int, guaranteed: bool = False
+    ) -> float:
+        """Chance of the rate-up 5* within the next pulls.
+
+        Args:
+            game: Game name
+            banner: Banner key
+            pity: Pulls made since the last 5*
+            pulls: Number of further pulls, at most the horizon
+            guaranteed: Whether the next 5* is guaranteed to be featured
+
+        Returns:
+            Probability of obtaining the rate-up 5*
+        """
+        if not (0 <= pulls <= self.horizon):
+            raise ValidationError(
+                f"Pulls must be between 0 and {self.horizon}, got {pulls}"
+            )
+        return float(self.curve(game, banner, pity, guaranteed)[pulls])
@@ -0,0 +1,113 @@
+"""Content-addressed manifest for incremental output regeneration.
+
+The manifest maps each output file to a digest of everything that decides
+its contents: the game's banner keys and config fingerprints, the engine
+version and the output format options. Every file a game writes is
+recorded under the game's digest; the game does not need to be written
+again while all of them are unchanged and still exist. Runs that are not
+incremental still update an existing manifest for the files they write,
+and a failed write drops its entries. A damaged manifest only means every
+output is considered stale.
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, Final, Mapping, Optional
+
+from core.common.logging import get_logger
+from core.config.banner_config import BannerConfig, config_fingerprint
+from output.atomic import atomic_write
+
+MANIFEST_FILENAME: Final[str] = "manifest.json"
+MANIFEST_VERSION: Final[int] = 1
+
+logger = get_logger(__name__)
+
+
+def input_digest(
+    game: str,
+    banners: Mapping[str, BannerConfig],
+    engine_version: str,
+    output_options: Mapping[str, Any],
+) -> str:
+    """Hash the inputs that determine one game's output file.
+
+    Args:
+        game: Game name
+        banners: Banner configs of the game, in output order
+        engine_version: Version of the calculation engine
+        output_options: Format settings such as the format and precision
+
+    Returns:
+        SHA-256 hex digest
+    """
+    payload = {
+        "game": game,
+        "banners": [[key, config_fingerprint(c)] for key, c in banners.items()],
+        "engine_version": engine_version,
+        "output": dict(output_options),
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class Manifest:
+    """Output file digests stored as JSON in the output directory."""
+
+    def __init__(self, directory: str) -> None:
+        """
+        Load the manifest of a directory.
+
+        A missing, unreadable or corrupt manifest starts empty, so that
+        every output is regenerated.
+
+        Args:
+            directory: Output directory
+        """
+        self.path = os.path.join(directory, MANIFEST_FILENAME)
+        self.entries: Dict[str, str] = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, encoding="utf-8") as file:
+                    data = json.load(file)
+                self.entries = dict(data["entries"])
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.warning(f"Ignoring invalid manifest {self.path}: {e}")
+                self.entries = {}
+
+    def get(self, filename: str) -> Optional[str]:
+        """Return the recorded digest of an output file."""
+        return self.entries.get(filename)
+
+    def is_current(self, filename: str, digest: str) -> bool:
+        """Check whether a file exists and was built from the same inputs.
+
+        Args:
+            filename: Output file name relative to the manifest directory
+            digest: Digest of the current inputs
+
+        Returns:
+            True if the file can be reused
+        """
+        directory = os.path.dirname(self.path)
+        return self.entries.get(filename) == digest and os.path.exists(
+            os.path.join(directory, filename)
+        )
+
+    def record(self, filename: str, digest: str) -> None:
+        """Record the digest of a freshly written file."""
+        self.entries[filename] = digest
+
+    def forget(self, filename: str) -> None:
+        """Drop the digest of a file whose contents are no longer known."""
+        self.entries.pop(filename, None)
+
+    def save(self) -> None:
+        """Write the manifest atomically."""
+        data = {
+            "version": MANIFEST_VERSION,
+            "entries": dict(sorted(self.entries.items())),
+        }
+        with atomic_write(self.path, "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=2)
@@ -4,16 +4,30 @@ This module provides functionality to format banner calculation results into a
 standardized format suitable for CSV output.
 """
 
-from typing import List, Final
+from typing import Iterator, List, Final, Sequence
 from decimal import Decimal, ROUND_HALF_UP
 
+import numpy as np
+import numpy.typing as npt
+
 from core.config.banner_config import BannerConfig
 from core.common.logging import get_logger
+from core.summary import SummaryStatistics
 
 logger = get_logger(__name__)
 
 # Constants for formatting
 DECIMAL_PLACES: Final[int] = 6
+# Scaled values from here on no longer hold exact integers in a float64
+_EXACT_INTEGER_LIMIT: Final[float] = 2.0**52
+# Precisions from here on go through format_number for every value, since
+# 10**decimal_places would no longer fit the int64 units
+MAX_VECTOR_DECIMAL_PLACES: Final[int] = 15
+# Largest supported precision; it leaves format_number's Decimal context
+# (28 digits) room for the integer part of summary values such as pulls
+MAX_DECIMAL_PLACES: Final[int] = 20
+# Relative distance from a rounding tie treated as too close to call in binary
+_TIE_TOLERANCE: Final[float] = 1e-9
 COLUMN_HEADERS: Final[List[str]] = [
     "Game",
     "Banner Type",
@@ -34,34 +48,141 @@ def format_number(value: float, decimal_places: int = DECIMAL_PLACES) -> str:
     Returns:
         Formatted number string
     """
-    # Use Decimal for precise rounding
-    return str(
+    # Use Decimal for precise rounding, always in fixed-point notation
+    return format(
         Decimal(str(value)).quantize(
             Decimal("0." + "0" * decimal_places), rounding=ROUND_HALF_UP
-        )
+        ),
+        "f",
     )
 
 
+def format_column(
+    values: npt.ArrayLike, decimal_places: int = DECIMAL_PLACES
+) -> List[str]:
+    """Format a whole column of numbers at once.
+
+    Produces exactly the output of ``format_number`` for every value.
+    Rounding half-up is done on the scaled array; values whose scaled
+    fraction sits too close to .5 for binary arithmetic to decide, or which
+    are too large or not finite, go through ``format_number`` instead, as
+    does every value above MAX_VECTOR_DECIMAL_PLACES.
+
+    Args:
+        values: Numbers to format
+        decimal_places: Number of decimal places to round to
+
+    Returns:
+        Formatted number strings, in input order
+    """
+    array = np.asarray(values, dtype=np.float64).ravel()
+    if decimal_places > MAX_VECTOR_DECIMAL_PLACES:
+        return [format_number(value, decimal_places) for value in array.tolist()]
+    # Overflowing or non-finite values are caught by the fallback mask
+    with np.errstate(over="ignore", invalid="ignore"):
+        scaled = np.abs(array) * 10.0**decimal_places
+        whole = np.floor(scaled)
+        fraction = scaled - whole
+    fallback = (
+        ~np.isfinite(scaled)
+        | (scaled >= _EXACT_INTEGER_LIMIT)
+        | (np.abs(fraction - 0.5) <= _TIE_TOLERANCE * np.maximum(scaled, 1.0))
+    )
+    # Fallback values are replaced below; zero them so the cast stays exact
+    units = np.where(fallback, 0.0, whole + (fraction >= 0.5)).astype(np.int64)
+    signs = np.where(np.signbit(array), "-", "").tolist()
+
+    if decimal_places > 0:
+        integer_part, fractional_part = np.divmod(units, 10**decimal_places)
+        formatted = [
+            f"{sign}{integer}.{fractional:0{decimal_places}d}"
+            for sign, integer, fractional in zip(
+                signs, integer_part.tolist(), fractional_part.tolist()
+            )
+        ]
+    else:
+        formatted = [f"{sign}{unit}" for sign, unit in zip(signs, units.tolist())]
+
+    for index in np.flatnonzero(fallback).tolist():
+        formatted[index] = format_number(float(array[index]), decimal_places)
+    return formatted
+
+
+def iter_results(
+    config: BannerConfig,
+    per_roll: Sequence[float],
+    cumulative: Sequence[float],
+    first_5star: Sequence[float],
+    decimal_places: int = DECIMAL_PLACES,
+) -> Iterator[List[str]]:
+    """Lazily format probability lists into CSV rows, one row at a time.
+
+    Each banner's columns are formatted in bulk before its rows are yielded.
+    """
+    columns = [
+        format_column(column, decimal_places)
+        for column in (per_roll, cumulative, first_5star)
+    ]
+    for i, (prob, cum, first) in enumerate(zip(*columns), 1):
+        yield [config.game_name, config.banner_type, str(i), prob, cum, first]
+
+
 def format_results(
     config: BannerConfig,
     per_roll: list[float],
     cumulative: list[float],
     first_5star: list[float],
+    decimal_places: int = DECIMAL_PLACES,
 ) -> List[List[str]]:
     """Format probability lists into CSV rows."""
+    return list(iter_results(config, per_roll, cumulative, first_5star, decimal_places))
+
+
+def get_summary_headers(percentiles: Sequence[float]) -> List[str]:
+    """Get the column headers of the per-banner summary output.
+
+    Args:
+        percentiles: Percentiles reported in the summary
+
+    Returns:
+        List of column header strings
+    """
+    labels = [f"{p:g}" for p in percentiles]
     return [
-        [
+        "Game",
+        "Banner Type",
+        "Expected Pulls",
+        "Standard Deviation",
+        *[f"P{label} Pulls" for label in labels],
+        "Expected Rate-Up Pulls",
+        "Rate-Up Standard Deviation",
+        *[f"Rate-Up P{label} Pulls" for label in labels],
+    ]
+
+
+def iter_summary_rows(
+    configs: Sequence[BannerConfig],
+    any_5star: SummaryStatistics,
+    rate_up: SummaryStatistics,
+    decimal_places: int = DECIMAL_PLACES,
+) -> Iterator[List[str]]:
+    """Format per-banner summaries into CSV rows, one row per config."""
+    columns = [
+        format_column(values, decimal_places)
+        for values in (any_5star.mean, any_5star.std, rate_up.mean, rate_up.std)
+    ]
+    for i, config in enumerate(configs):
+        mean, std, rate_up_mean, rate_up_std = (column[i] for column in columns)
+        yield [
             config.game_name,
             config.banner_type,
-            str(i),
-            format_number(prob),
-            format_number(cum),
-            format_number(first),
+            mean,
+            std,
+            *[str(pulls) for pulls in any_5star.percentile_pulls[i].tolist()],
+            rate_up_mean,
+            rate_up_std,
+            *[str(pulls) for pulls in rate_up.percentile_pulls[i].tolist()],
         ]
-        for i, (prob, cum, first) in enumerate(
-            zip(per_roll, cumulative, first_5star), 1
-        )
-    ]
 
 
 def get_headers() -> List[str]:
@@ -1,13 +1,40 @@
-"""Banner statistics calculation runner with light OOP wrapper."""
+"""Banner statistics calculation runner with light OOP wrapper.
 
+NumPy-backed modules and the optional output sinks are imported where they
+are first needed, so the command line starts without loading them and a
+run only loads the sinks it writes to.
+"""
+
+import argparse
+import os
+import time
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import TYPE_CHECKING, Optional, Dict, Any, Iterator, List, Sequence, Tuple
 
-from core.calculator import ProbabilityCalculator
 from output.csv_handler import CSVOutputHandler
-from output.row_formatter import format_results, get_headers
-from core.config.banner_config import BANNER_CONFIGS
+from output.manifest import MANIFEST_FILENAME, Manifest, input_digest
+from core.config.banner_config import BANNER_CONFIGS, BannerConfig
+from core.common.errors import ConfigurationError
 from core.common.logging import get_logger
+from core.common.metrics import RunMetrics
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor, Future
+
+    from core.cache import CalculationCache, CalculationKey, ProbabilityCurves
+    from output.binary_store import BinaryOutputHandler
+
+    CurveFutures = Dict[CalculationKey, Future[ProbabilityCurves]]
+
+EXECUTOR_TYPES = ("process", "thread")
+OUTPUT_FORMATS = ("csv", "npy")
+
+
+def _calculate_curves(config: BannerConfig) -> "ProbabilityCurves":
+    """Calculate the curves of one banner in a worker."""
+    from core.calculator import ProbabilityCalculator
+
+    return ProbabilityCalculator(config).calculate_probabilities()
 
 
 class BannerStatisticsRunner:
@@ -18,6 +45,17 @@ class BannerStatisticsRunner:
         banner_configs: Optional[Dict[str, Dict[str, Any]]] = None,
         output_handler: Optional[CSVOutputHandler] = None,
         logger: Optional[Any] = None,
+        cache: Optional["CalculationCache"] = None,
+        workers: Optional[int] = 1,
+        executor_type: str = "process",
+        decimal_places: Optional[int] = None,
+        output_format: str = "csv",
+        binary_handler: Optional["BinaryOutputHandler"] = None,
+        output_dir: str = "csv_output",
+        incremental: bool = False,
+        metrics: bool = False,
+        metrics_path: Optional[str] = None,
+        summary: bool = False,
     ):
         """
         Initialize the runner with optional dependency injection.
@@ -26,56 +64,337 @@ class BannerStatisticsRunner:
             banner_configs: Dictionary of banner configurations (defaults to BANNER_CONFIGS)
             output_handler: CSV output handler (defaults to CSVOutputHandler())
             logger: Logger instance (defaults to get_logger(__name__))
+            cache: Calculation cache (defaults to a new CalculationCache())
+            workers: Concurrent calculations (None uses every core, 1 runs serially)
+            executor_type: Pool used when workers > 1, "process" or "thread"
+            decimal_places: Decimal places of the formatted probabilities
+                (defaults to row_formatter.DECIMAL_PLACES)
+            output_format: "csv" for text tables or "npy" for binary curves
+            binary_handler: Binary output handler (defaults to
+                BinaryOutputHandler() for npy output)
+            output_dir: Directory the game files are written to
+            incremental: Skip games whose inputs match the output manifest
+            metrics: Record per-stage timings and counters in self.metrics
+            metrics_path: Also dump the metrics to this JSON file (implies metrics)
+            summary: Also write a per-banner summary CSV for every game
         """
+        if executor_type not in EXECUTOR_TYPES:
+            raise ConfigurationError(f"Invalid executor type: {executor_type}")
+        if output_format not in OUTPUT_FORMATS:
+            raise ConfigurationError(f"Invalid output format: {output_format}")
         self.banner_configs = banner_configs or BANNER_CONFIGS
         self.output_handler = output_handler or CSVOutputHandler()
         self.logger = logger or get_logger(__name__)
+        if cache is None:
+            from core.cache import CalculationCache
+
+            cache = CalculationCache()
+        self.cache = cache
+        self.workers = workers or os.cpu_count() or 1
+        self.executor_type = executor_type
+        if decimal_places is None:
+            from output.row_formatter import DECIMAL_PLACES
+
+            decimal_places = DECIMAL_PLACES
+        self.decimal_places = decimal_places
+        self.output_format = output_format
+        if binary_handler is None and output_format == "npy":
+            from output.binary_store import BinaryOutputHandler
+
+            binary_handler = BinaryOutputHandler()
+        self.binary_handler = binary_handler
+        self.output_dir = output_dir
+        self.incremental = incremental
+        self.metrics = RunMetrics(enabled=metrics or metrics_path is not None)
+        self.metrics_path = metrics_path
+        self.summary = summary
+        self._failed_banners = 0
+        self._game_rows = 0
+        self._summary_inputs: List[Tuple[BannerConfig, List[float]]] = []
 
     def _create_output_directory(self) -> None:
         """Ensure output directory exists."""
-        Path("csv_output").mkdir(parents=True, exist_ok=True)
+        Path(self.output_dir).mkdir(parents=True, exist_ok=True)
+
+    def _output_filename(self, game_type: str) -> str:
+        """Return the output file name of a game."""
+        stem = f"{game_type.lower().replace(' ', '_')}_all_banners"
+        return f"{stem}.{self.output_format}"
+
+    def _output_filenames(self, game_type: str) -> List[str]:
+        """Return the names of every file a run writes for a game."""
+        filename = self._output_filename(game_type)
+        stem = os.path.splitext(filename)[0]
+        filenames = [filename]
+        if self.output_format == "npy":
+            filenames.append(f"{stem}.json")
+        if self.summary:
+            filenames.append(f"{stem}_summary.csv")
+        return filenames
+
+    def _input_digest(self, game_type: str, banners: Dict[str, Any]) -> str:
+        """Digest of everything that determines a game's output file."""
+        from core.calculator import ENGINE_VERSION
+
+        return input_digest(
+            game_type,
+            banners,
+            ENGINE_VERSION,
+            {
+                "format": self.output_format,
+                "decimal_places": self.decimal_places,
+                "summary": self.summary,
+            },
+        )
+
+    def _submit_all(
+        self, executor: "Executor", games: Dict[str, Dict[str, Any]]
+    ) -> "CurveFutures":
+        """Start one calculation per distinct, uncached parameter set."""
+        from core.cache import calculation_key
+
+        futures: "CurveFutures" = {}
+        for banners in games.values():
+            for config in banners.values():
+                key = calculation_key(config)
+                if key not in self.cache and key not in futures:
+                    futures[key] = executor.submit(_calculate_curves, config)
+        return futures
+
+    def _curves(
+        self, config: BannerConfig, futures: Optional["CurveFutures"]
+    ) -> "ProbabilityCurves":
+        """Return the curves of a banner, waiting on its worker if needed."""
+        from core.cache import calculation_key
+
+        if futures is None:
+            return self.cache.curves(config)
+        key = calculation_key(config)
+        future = futures.get(key)
+        # Keys cached at submit time may have been evicted since
+        return self.cache.get_or_compute(
+            key,
+            lambda: (
+                future.result() if future is not None else _calculate_curves(config)
+            ),
+        )
+
+    def run(self) -> bool:
+        """Calculate and save banner statistics.
 
-    def run(self) -> None:
-        """Calculate and save banner statistics."""
+        Returns:
+            True if every game was written with all its banners, or skipped
+            as already current
+        """
         self.logger.info("Starting banner statistics calculation.")
+        self.metrics.reset()
+        with self.metrics.stage("run"):
+            success = self._run()
+        if self.metrics_path is not None:
+            self.metrics.dump(self.metrics_path)
+            self.logger.info(f"Metrics written to {self.metrics_path}")
+        self.logger.info("Banner statistics calculation completed.")
+        return success
+
+    def _run(self) -> bool:
+        """Calculate and write every game whose output is out of date."""
         self._create_output_directory()
 
-        for game_type, banners in self.banner_configs.items():
-            output_path = (
-                Path("csv_output")
-                / f"{game_type.lower().replace(' ', '_')}_all_banners.csv"
+        with self.metrics.stage("config_load") as record:
+            games = dict(self.banner_configs)
+            # Full runs keep an existing manifest in step with what they write
+            manifest = (
+                Manifest(self.output_dir)
+                if self.incremental
+                or os.path.exists(os.path.join(self.output_dir, MANIFEST_FILENAME))
+                else None
             )
-            all_results = []
+            digests = {
+                game_type: self._input_digest(game_type, banners)
+                for game_type, banners in games.items()
+            }
+            if manifest is not None and self.incremental:
+                for game_type in list(games):
+                    if all(
+                        manifest.is_current(filename, digests[game_type])
+                        for filename in self._output_filenames(game_type)
+                    ):
+                        self.logger.info(f"Skipping {game_type}: inputs unchanged")
+                        del games[game_type]
+            record.rows = sum(len(banners) for banners in games.values())
 
-            self.logger.info(f"Processing game type: {game_type}")
+        executor: Optional["Executor"] = None
+        futures = None
+        if self.workers > 1 and games:
+            from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
-            for banner_type, config in banners.items():
-                self.logger.info(f"Calculating probabilities for banner: {banner_type}")
+            pool = (
+                ProcessPoolExecutor
+                if self.executor_type == "process"
+                else ThreadPoolExecutor
+            )
+            executor = pool(max_workers=self.workers)
+            futures = self._submit_all(executor, games)
+            self.logger.info(
+                f"Calculating {len(futures)} parameter sets with "
+                f"{self.workers} {self.executor_type} workers"
+            )
 
-                try:
-                    calculator = ProbabilityCalculator(config)
-                    probabilities = calculator.calculate_probabilities()
-                    formatted_data = format_results(config, *probabilities)
-                    all_results.extend(formatted_data)
+        success = True
+        try:
+            for game_type, banners in games.items():
+                written = self._run_game(game_type, banners, futures)
+                success = success and written
+                if manifest is not None:
+                    for filename in self._output_filenames(game_type):
+                        if written:
+                            manifest.record(filename, digests[game_type])
+                        else:
+                            manifest.forget(filename)
+                    manifest.save()
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
 
-                    self.logger.info(f"Finished calculations for banner: {banner_type}")
+        self.logger.info(
+            f"Calculation cache: {self.cache.hits} hits, {self.cache.misses} misses"
+        )
+        return success
 
-                except Exception as e:
-                    self.logger.error(
-                        f"Error calculating probabilities for {banner_type}: {e}",
-                        exc_info=True,
-                    )
+    def _iter_game_curves(
+        self,
+        game_type: str,
+        banners: Dict[str, Any],
+        futures: Optional["CurveFutures"],
+    ) -> Iterator[Tuple[str, BannerConfig, "ProbabilityCurves"]]:
+        """Lazily calculate one game's banners, skipping failed ones."""
+        for banner_type, config in banners.items():
+            self.logger.info(f"Calculating probabilities for banner: {banner_type}")
 
             try:
-                self.output_handler.write(str(output_path), get_headers(), all_results)
-                self.logger.info(f"Results written to {output_path}")
-
+                with self.metrics.stage("calculate", game_type, banner_type) as record:
+                    probabilities = self._curves(config, futures)
+                    record.rows += len(probabilities[0])
             except Exception as e:
                 self.logger.error(
-                    f"Failed to write CSV for {game_type}: {e}", exc_info=True
+                    f"Error calculating probabilities for {banner_type}: {e}",
+                    exc_info=True,
                 )
+                self._failed_banners += 1
+                continue
 
-        self.logger.info("Banner statistics calculation completed.")
+            self._game_rows += len(probabilities[0])
+            if self.summary:
+                self._summary_inputs.append((config, probabilities[2]))
+            yield banner_type, config, probabilities
+            self.logger.info(f"Finished calculations for banner: {banner_type}")
+
+    def _iter_game_rows(
+        self,
+        game_type: str,
+        banners: Dict[str, Any],
+        futures: Optional["CurveFutures"],
+    ) -> Iterator[List[str]]:
+        """Lazily calculate and format the rows of one game's banners.
+
+        Each banner is formatted in full before its rows are handed on, so
+        the format stage is timed apart from the writer.
+        """
+        from output.row_formatter import iter_results
+
+        curves = self._iter_game_curves(game_type, banners, futures)
+        for banner_type, config, probabilities in curves:
+            with self.metrics.stage("format", game_type, banner_type) as record:
+                rows = list(iter_results(config, *probabilities, self.decimal_places))
+                record.rows += len(rows)
+            yield from rows
+
+    def _run_game(
+        self,
+        game_type: str,
+        banners: Dict[str, Any],
+        futures: Optional["CurveFutures"],
+    ) -> bool:
+        """Stream one game's results from the calculator into its output file.
+
+        Returns:
+            True if the file was written with every banner included
+        """
+        output_path = Path(self.output_dir) / self._output_filename(game_type)
+        output_stem = output_path.with_suffix("")
+        self._failed_banners = 0
+        self._game_rows = 0
+        self._summary_inputs = []
+
+        self.logger.info(f"Processing game type: {game_type}")
+
+        try:
+            start = time.perf_counter()
+            if self.binary_handler is not None and self.output_format == "npy":
+                self.binary_handler.write(
+                    str(output_stem),
+                    game_type,
+                    self._iter_game_curves(game_type, banners, futures),
+                )
+                written = [output_path, output_stem.with_suffix(".json")]
+            else:
+                from output.row_formatter import get_headers
+
+                self.output_handler.write(
+                    str(output_path),
+                    get_headers(),
+                    self._iter_game_rows(game_type, banners, futures),
+                )
+                written = [output_path]
+            self._record_write(game_type, time.perf_counter() - start, written)
+            self.logger.info(f"Results written to {output_path}")
+            if self.summary:
+                self._write_summary(game_type, output_stem)
+
+        except Exception as e:
+            self.logger.error(
+                f"Failed to write {self.output_format.upper()} for {game_type}: {e}",
+                exc_info=True,
+            )
+            return False
+
+        return self._failed_banners == 0
+
+    def _write_summary(self, game_type: str, output_stem: Path) -> None:
+        """Write the per-banner summary of the banners calculated for a game."""
+        from core.quantiles import DEFAULT_PERCENTILES
+        from core.summary import pad_curves, summarize_pmf, summarize_rate_up
+        from output.row_formatter import get_summary_headers, iter_summary_rows
+
+        summary_path = output_stem.with_name(f"{output_stem.name}_summary.csv")
+        configs = [config for config, _ in self._summary_inputs]
+        with self.metrics.stage("summary", game_type) as record:
+            first_5star = pad_curves([pmf for _, pmf in self._summary_inputs])
+            rows = iter_summary_rows(
+                configs,
+                summarize_pmf(first_5star, DEFAULT_PERCENTILES),
+                summarize_rate_up(configs, first_5star, DEFAULT_PERCENTILES),
+                self.decimal_places,
+            )
+            self.output_handler.write(
+                str(summary_path), get_summary_headers(DEFAULT_PERCENTILES), rows
+            )
+            record.rows += len(configs)
+        self.logger.info(f"Summary written to {summary_path}")
+
+    def _record_write(
+        self, game_type: str, elapsed: float, written: List[Path]
+    ) -> None:
+        """Record a game's write stage, excluding the stages it drove lazily."""
+        if not self.metrics.enabled:
+            return
+        self.metrics.add(
+            "write",
+            game_type,
+            seconds=elapsed - self.metrics.seconds(("calculate", "format"), game_type),
+            rows=self._game_rows,
+            bytes_written=sum(path.stat().st_size for path in written if path.exists()),
+        )
 
 
 def run_banner_stats() -> None:
@@ -87,5 +406,176 @@ def run_banner_stats() -> None:
     runner.run()
 
 
+def build_lookup_artifact(
+    path: str = os.path.join("csv_output", "banner_lookup.bin"),
+    horizon: Optional[int] = None,
+    banner_configs: Optional[Dict[str, Dict[str, BannerConfig]]] = None,
+) -> None:
+    """
+    Write the rate-up lookup artifact of every banner.
+
+    Args:
+        path: Output file path
+        horizon: Largest number of pulls answered (defaults to
+            DEFAULT_LOOKUP_HORIZON)
+        banner_configs: Banner configurations (defaults to BANNER_CONFIGS)
+    """
+    from output.lookup import DEFAULT_LOOKUP_HORIZON, write_lookup
+
+    logger = get_logger(__name__)
+    start = time.perf_counter()
+    if horizon is None:
+        horizon = DEFAULT_LOOKUP_HORIZON
+    write_lookup(path, banner_configs or BANNER_CONFIGS, horizon)
+    logger.info(
+        f"Lookup artifact written to {path} in {time.perf_counter() - start:.2f}s"
+    )
+
+
+def select_configs(
+    banner_configs: Dict[str, Dict[str, BannerConfig]],
+    games: Optional[Sequence[str]] = None,
+    banners: Optional[Sequence[str]] = None,
+) -> Dict[str, Dict[str, BannerConfig]]:
+    """
+    Restrict banner configurations to some games and banner keys.
+
+    Games match by name or file name stem, ignoring case, so "Star Rail" and
+    "star_rail" select the same game.
+
+    Args:
+        banner_configs: Banner configurations per game
+        games: Games to keep (all when empty)
+        banners: Banner keys to keep in every selected game (all when empty)
+
+    Returns:
+        Selected configurations, games without a selected banner omitted
+
+    Raises:
+        ConfigurationError: If a game or banner matches nothing
+    """
+    names = {name.lower().replace(" ", "_"): name for name in banner_configs}
+    selected_games = list(banner_configs)
+    if games:
+        selected_games = []
+        for game in games:
+            name = names.get(game.lower().replace(" ", "_"))
+            if name is None:
+                raise ConfigurationError(f"Unknown game: {game}")
+            selected_games.append(name)
+
+    selected: Dict[str, Dict[str, BannerConfig]] = {}
+    for name in dict.fromkeys(selected_games):
+        kept = {
+            key: config
+            for key, config in banner_configs[name].items()
+            if not banners or key in banners
+        }
+        if kept:
+            selected[name] = kept
+    for banner in banners or ():
+        if not any(banner in kept for kept in selected.values()):
+            raise ConfigurationError(f"Unknown banner: {banner}")
+    return selected
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the command line parser of the runner."""
+    parser = argparse.ArgumentParser(
+        description="Calculate banner statistics for selected games and banners."
+    )
+    parser.add_argument(
+        "-g", "--game", action="append", help="Game to include (repeatable)"
+    )
+    parser.add_argument(
+        "-b", "--banner", action="append", help="Banner key to include (repeatable)"
+    )
+    parser.add_argument("-o", "--output-dir", default="csv_output")
+    parser.add_argument("-f", "--format", choices=OUTPUT_FORMATS, default="csv")
+    parser.add_argument("-w", "--workers", type=int, default=1)
+    parser.add_argument("--executor", choices=EXECUTOR_TYPES, default="process")
+    parser.add_argument("--decimal-places", type=int)
+    parser.add_argument("--incremental", action="store_true")
+    parser.add_argument("--summary", action="store_true")
+    parser.add_argument("--metrics", metavar="PATH", help="Write run metrics JSON")
+    parser.add_argument(
+        "--lookup",
+        action="store_true",
+        help="Write the rate-up lookup artifact instead of the game files",
+    )
+    parser.add_argument(
+        "--horizon",
+        type=int,
+        help="Largest number of pulls in the lookup artifact (needs --lookup)",
+    )
+    parser.add_argument(
+        "--list", action="store_true", help="List games and banners, then exit"
+    )
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Command line entry point.
+
+    Only the modules the chosen options need are imported, and the start-up
+    time up to the first calculation is logged.
+
+    Args:
+        argv: Arguments (defaults to sys.argv[1:])
+
+    Returns:
+        Process exit code, 1 if any game could not be written
+    """
+    start = time.perf_counter()
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.horizon is not None and not args.lookup:
+        parser.error("--horizon only applies with --lookup")
+    if args.horizon is not None and args.horizon < 0:
+        parser.error(f"--horizon must be non-negative, got {args.horizon}")
+    if args.workers < 1:
+        parser.error(f"--workers must be at least 1, got {args.workers}")
+    if args.decimal_places is not None:
+        from output.row_formatter import MAX_DECIMAL_PLACES
+
+        if not 0 <= args.decimal_places <= MAX_DECIMAL_PLACES:
+            parser.error(
+                f"--decimal-places must be between 0 and {MAX_DECIMAL_PLACES}, "
+                f"got {args.decimal_places}"
+            )
+    try:
+        configs = select_configs(BANNER_CONFIGS, args.game, args.banner)
+    except ConfigurationError as e:
+        parser.error(str(e))
+
+    if args.list:
+        for game, banners in configs.items():
+            print(f"{game}: {', '.join(banners)}")
+        return 0
+
+    logger = get_logger(__name__)
+    if args.lookup:
+        path = os.path.join(args.output_dir, "banner_lookup.bin")
+        logger.info(f"Startup took {(time.perf_counter() - start) * 1000:.1f} ms")
+        build_lookup_artifact(path, args.horizon, configs)
+        return 0
+
+    runner = BannerStatisticsRunner(
+        banner_configs=configs,
+        logger=logger,
+        workers=args.workers,
+        executor_type=args.executor,
+        decimal_places=args.decimal_places,
+        output_format=args.format,
+        output_dir=args.output_dir,
+        incremental=args.incremental,
+        metrics_path=args.metrics,
+        summary=args.summary,
+    )
+    logger.info(f"Startup took {(time.perf_counter() - start) * 1000:.1f} ms")
+    return 0 if runner.run() else 1
+
+
 if __name__ == "__main__":
-    run_banner_stats()
+    raise SystemExit(main())
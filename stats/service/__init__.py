@@ -0,0 +1 @@
+"""HTTP query service for the stats engine."""
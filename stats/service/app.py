@@ -0,0 +1,273 @@
+"""Query handlers of the HTTP service.
+
+Requests are answered from the same ``BannerConfig`` definitions and
+calculators as the batch runner. Every response body is JSON and is cached
+with its ETag under the normalized request target, so repeated queries are
+served without touching the calculators.
+
+``cached`` only consults the response cache and is cheap enough to call on
+an event loop; ``handle`` may compute and is meant for a worker thread.
+Both are thread-safe.
+"""
+
+import hashlib
+import json
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Final, List, Mapping, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+import numpy as np
+
+from core.cache import CalculationCache, LRUCache
+from core.common.errors import BannerError
+from core.conditional import ConditionalTable
+from core.config.banner_config import BANNER_CONFIGS, BannerConfig
+from core.joint import BannerGoal, JointDistributionEngine
+from core.quantiles import DEFAULT_PERCENTILES, pulls_for_probability
+
+DEFAULT_RESPONSE_CACHE_SIZE: Final[int] = 4096
+DEFAULT_TABLE_CACHE_SIZE: Final[int] = 64
+# Largest pull horizon a query may ask for, bounding conditional table size
+MAX_QUERY_PULLS: Final[int] = 1000
+
+Params = Dict[str, List[str]]
+
+
+class HTTPError(Exception):
+    """Error answered with an HTTP status code."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """Encoded JSON body and its entity tag."""
+
+    body: bytes
+    etag: str
+
+
+def game_slug(game: str) -> str:
+    """URL form of a game name, as used in output file names."""
+    return game.lower().replace(" ", "_")
+
+
+def _single(params: Params, name: str) -> Optional[str]:
+    """Return the last value of a query parameter."""
+    values = params.get(name)
+    return values[-1] if values else None
+
+
+def _int(params: Params, name: str, default: Optional[int] = None) -> int:
+    """Parse an integer query parameter."""
+    value = _single(params, name)
+    if value is None:
+        if default is None:
+            raise HTTPError(400, f"Missing parameter: {name}")
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise HTTPError(400, f"Parameter {name} must be an integer") from None
+
+
+def _bool(params: Params, name: str) -> bool:
+    """Parse a boolean query parameter, false when absent."""
+    value = (_single(params, name) or "false").lower()
+    if value not in ("true", "false", "1", "0"):
+        raise HTTPError(400, f"Parameter {name} must be true or false")
+    return value in ("true", "1")
+
+
+def _percentiles(params: Params) -> List[float]:
+    """Parse repeated ``p`` parameters, defaulting to DEFAULT_PERCENTILES."""
+    values = params.get("p")
+    if not values:
+        return list(DEFAULT_PERCENTILES)
+    try:
+        percentiles = [float(value) for value in values]
+    except ValueError:
+        raise HTTPError(400, "Parameter p must be a number") from None
+    if not all(0.0 <= p <= 100.0 for p in percentiles):
+        raise HTTPError(400, "Parameter p must be between 0 and 100")
+    return percentiles
+
+
+def _cache_key(path: str, params: Params) -> str:
+    """Response cache key of a query, independent of parameter order."""
+    return f"{path}?{urlencode(sorted(params.items()), doseq=True)}"
+
+
+class StatsApp:
+    """Routes queries to the calculators and caches encoded responses."""
+
+    def __init__(
+        self,
+        banner_configs: Optional[Mapping[str, Mapping[str, BannerConfig]]] = None,
+        cache_size: int = DEFAULT_RESPONSE_CACHE_SIZE,
+    ) -> None:
+        """
+        Initialize the app.
+
+        Args:
+            banner_configs: Banner configurations (defaults to BANNER_CONFIGS)
+            cache_size: Number of encoded responses kept
+        """
+        configs = banner_configs or BANNER_CONFIGS
+        self.banners: Dict[Tuple[str, str], BannerConfig] = {
+            (game_slug(game), key): config
+            for game, banners in configs.items()
+            for key, config in banners.items()
+        }
+        self.responses: LRUCache[str, CachedResponse] = LRUCache(cache_size)
+        self._responses_lock = threading.Lock()
+        # Guards the calculator caches, which are not thread-safe
+        self._compute_lock = threading.Lock()
+        self.curves = CalculationCache()
+        self.tables: LRUCache[BannerConfig, ConditionalTable] = LRUCache(
+            DEFAULT_TABLE_CACHE_SIZE
+        )
+        self.joint = JointDistributionEngine()
+        self.routes: Dict[str, Callable[[Params], Any]] = {
+            "/health": lambda params: {"status": "ok"},
+            "/banners": self.list_banners,
+            "/curve": self.curve,
+            "/probability": self.probability,
+            "/quantiles": self.quantiles,
+        }
+
+    def cached(self, target: str) -> Optional[CachedResponse]:
+        """Return the cached response of a request target without computing.
+
+        Args:
+            target: Request path with its query string
+
+        Returns:
+            Encoded response, or None if the query was not answered yet
+        """
+        url = urlsplit(target)
+        with self._responses_lock:
+            return self.responses.get(_cache_key(url.path, parse_qs(url.query)))
+
+    def handle(self, target: str) -> CachedResponse:
+        """Answer a GET request target such as ``/curve?game=star_rail``.
+
+        Args:
+            target: Request path with its query string
+
+        Returns:
+            Encoded response, from the cache when the same query was seen
+
+        Raises:
+            HTTPError: If the route or its parameters are invalid
+        """
+        url = urlsplit(target)
+        params = parse_qs(url.query)
+        key = _cache_key(url.path, params)
+        with self._responses_lock:
+            cached = self.responses.get(key)
+        if cached is not None:
+            return cached
+
+        route = self.routes.get(url.path)
+        if route is None:
+            raise HTTPError(404, f"Unknown path: {url.path}")
+        try:
+            with self._compute_lock:
+                payload = route(params)
+        except BannerError as e:
+            raise HTTPError(400, str(e)) from e
+
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        response = CachedResponse(
+            body=body, etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        )
+        with self._responses_lock:
+            self.responses.put(key, response)
+        return response
+
+    def _banner(self, params: Params) -> BannerConfig:
+        """Look up the banner named by the game and banner parameters."""
+        game, banner = _single(params, "game"), _single(params, "banner")
+        if game is None or banner is None:
+            raise HTTPError(400, "Parameters game and banner are required")
+        config = self.banners.get((game_slug(game), banner))
+        if config is None:
+            raise HTTPError(404, f"Unknown banner: {game}/{banner}")
+        return config
+
+    def _table(self, config: BannerConfig, pulls: int) -> ConditionalTable:
+        """Conditional table of a banner covering at least some pulls.
+
+        A table too short for a query is rebuilt with its horizon doubled,
+        so a sweep over growing pulls only rebuilds a logarithmic number of
+        times.
+        """
+        if not (0 <= pulls <= MAX_QUERY_PULLS):
+            raise HTTPError(400, f"Pulls must be between 0 and {MAX_QUERY_PULLS}")
+        table = self.tables.get(config)
+        if table is None or table.max_pulls < pulls:
+            horizon = 2 * config.hard_pity if table is None else table.max_pulls
+            while horizon < pulls:
+                horizon *= 2
+            table = ConditionalTable(config, max_pulls=min(horizon, MAX_QUERY_PULLS))
+            self.tables.put(config, table)
+        return table
+
+    def list_banners(self, params: Params) -> Dict[str, List[str]]:
+        """Banner keys per game."""
+        games: Dict[str, List[str]] = {}
+        for game, banner in self.banners:
+            games.setdefault(game, []).append(banner)
+        return games
+
+    def curve(self, params: Params) -> Dict[str, Any]:
+        """Per-roll, cumulative and first 5* curves of a banner."""
+        config = self._banner(params)
+        per_roll, cumulative, first_5star = self.curves.curves(config)
+        return {
+            "per_roll": per_roll,
+            "cumulative": cumulative,
+            "first_5star": first_5star,
+        }
+
+    def probability(self, params: Params) -> Dict[str, Any]:
+        """Chance of any 5* and of the rate-up 5* from a pity within some pulls."""
+        config = self._banner(params)
+        pity = _int(params, "pity", 0)
+        pulls = _int(params, "pulls")
+        guaranteed = _bool(params, "guaranteed")
+        table = self._table(config, pulls)
+        return {
+            "pity": pity,
+            "pulls": pulls,
+            "guaranteed": guaranteed,
+            "any_5star": table.any_five_star_probability(pity, pulls),
+            "rate_up": table.probability(pity, pulls, guaranteed),
+        }
+
+    def quantiles(self, params: Params) -> Dict[str, Any]:
+        """Pulls needed for each percentile, for any 5* and the rate-up 5*."""
+        config = self._banner(params)
+        percentiles = _percentiles(params)
+        pity = _int(params, "pity", 0)
+        guaranteed = _bool(params, "guaranteed")
+        targets = np.asarray(percentiles) / 100.0
+
+        table = self._table(config, config.hard_pity)
+        table.engine.state_index(pity)
+        any_5star = table.any_five_star[pity, 1:]
+        rate_up_pmf = self.joint.banner_pmf(
+            BannerGoal(config, pity=pity, guaranteed=guaranteed)
+        )
+        return {
+            "percentiles": percentiles,
+            "any_5star": pulls_for_probability(any_5star, targets).tolist(),
+            "rate_up": pulls_for_probability(
+                np.cumsum(rate_up_pmf)[1:], targets
+            ).tolist(),
+        }
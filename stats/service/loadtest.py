@@ -0,0 +1,91 @@
+"""Local load generator for the stats query service.
+
+Opens a number of keep-alive connections and sends a fixed set of queries
+on each as fast as responses arrive, then reports the request rate.
+
+Run with ``python -m service.loadtest --port 8080 --requests 20000``.
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Final, List, Sequence
+
+DEFAULT_CONNECTIONS: Final[int] = 32
+DEFAULT_REQUESTS: Final[int] = 10000
+DEFAULT_TARGETS: Final[Sequence[str]] = (
+    "/probability?game=genshin_impact&banner=limited&pity=40&pulls=60",
+    "/quantiles?game=genshin_impact&banner=weapon",
+    "/curve?game=star_rail&banner=limited",
+)
+
+
+async def _connection(
+    host: str, port: int, targets: Sequence[str], requests: int
+) -> int:
+    """Send requests on one connection, returning how many got a 200."""
+    reader, writer = await asyncio.open_connection(host, port)
+    ok = 0
+    try:
+        for i in range(requests):
+            target = targets[i % len(targets)]
+            writer.write(
+                f"GET {target} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode("latin-1")
+            )
+            head = await reader.readuntil(b"\r\n\r\n")
+            status_line, *header_lines = head.decode("latin-1").split("\r\n")
+            length = 0
+            for line in header_lines:
+                name, _, value = line.partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+            ok += status_line.split(" ")[1] == "200"
+    finally:
+        writer.close()
+    return ok
+
+
+async def run_load(
+    host: str,
+    port: int,
+    requests: int = DEFAULT_REQUESTS,
+    connections: int = DEFAULT_CONNECTIONS,
+    targets: Sequence[str] = DEFAULT_TARGETS,
+) -> float:
+    """Send requests over concurrent connections.
+
+    Args:
+        host: Service host
+        port: Service port
+        requests: Total requests sent
+        connections: Concurrent keep-alive connections
+        targets: Request targets, cycled through
+
+    Returns:
+        Successful requests per second
+    """
+    per_connection = [
+        requests // connections + (i < requests % connections)
+        for i in range(connections)
+    ]
+    start = time.perf_counter()
+    results: List[int] = await asyncio.gather(
+        *(_connection(host, port, targets, n) for n in per_connection if n)
+    )
+    return sum(results) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the query service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS)
+    parser.add_argument("--connections", type=int, default=DEFAULT_CONNECTIONS)
+    args = parser.parse_args()
+    rate = asyncio.run(run_load(args.host, args.port, args.requests, args.connections))
+    print(f"{rate:.0f} requests/s")
+
+
+if __name__ == "__main__":
+    main()
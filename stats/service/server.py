@@ -0,0 +1,215 @@
+"""Asyncio HTTP/1.1 server for the stats query service.
+
+Connections are kept alive unless the client asks otherwise, so a client
+issuing many queries pays the connection setup once. Responses carry the
+ETag of their cached body and a matching ``If-None-Match`` is answered
+with 304 and no body. Cached responses are answered on the event loop;
+queries that need computing run in a worker thread so they do not stall
+other connections. Request bodies are read and discarded, since no route
+takes one.
+
+Run with ``python -m service.server --port 8080``.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+from http import HTTPStatus
+from typing import Dict, Final, Optional, Tuple
+
+from service.app import HTTPError, StatsApp
+
+DEFAULT_HOST: Final[str] = "127.0.0.1"
+DEFAULT_PORT: Final[int] = 8080
+# Seconds an idle keep-alive connection is held open
+IDLE_TIMEOUT: Final[float] = 15.0
+MAX_HEADER_BYTES: Final[int] = 16384
+MAX_BODY_BYTES: Final[int] = 65536
+
+logger = logging.getLogger(__name__)
+
+
+def _response(
+    status: int,
+    body: bytes = b"",
+    etag: Optional[str] = None,
+    keep_alive: bool = True,
+) -> bytes:
+    """Encode a complete HTTP/1.1 response."""
+    lines = [
+        f"HTTP/1.1 {status} {HTTPStatus(status).phrase}",
+        f"Content-Length: {len(body)}",
+        f"Connection: {'keep-alive' if keep_alive else 'close'}",
+    ]
+    if body:
+        lines.append("Content-Type: application/json")
+    if etag is not None:
+        lines.append(f"ETag: {etag}")
+        lines.append("Cache-Control: max-age=3600")
+    head = "\r\n".join(lines) + "\r\n\r\n"
+    return head.encode("latin-1") + body
+
+
+def _error(status: int, message: str, keep_alive: bool) -> bytes:
+    """Encode an error response with a JSON message."""
+    body = json.dumps({"error": message}).encode("utf-8")
+    return _response(status, body, keep_alive=keep_alive)
+
+
+async def _read_request(
+    reader: asyncio.StreamReader,
+) -> Optional[Tuple[str, str, str, Dict[str, str]]]:
+    """Read a request, returning None when the client closed the connection.
+
+    The body, if any, is consumed and dropped so that it is not mistaken
+    for the next request on a kept-alive connection.
+
+    Returns:
+        tuple: (method, target, version, headers with lower-case names)
+
+    Raises:
+        HTTPError: If the request cannot be framed; the connection must close
+    """
+    try:
+        head = await asyncio.wait_for(
+            reader.readuntil(b"\r\n\r\n"), timeout=IDLE_TIMEOUT
+        )
+    except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+        return None
+    except asyncio.LimitOverrunError:
+        raise HTTPError(431, "Request header too large") from None
+
+    request_line, *header_lines = head.decode("latin-1").split("\r\n")
+    parts = request_line.split(" ")
+    if len(parts) != 3:
+        raise HTTPError(400, "Malformed request line")
+    headers = {}
+    for line in header_lines:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+    if "transfer-encoding" in headers:
+        raise HTTPError(501, "Transfer-Encoding is not supported")
+    length = headers.get("content-length", "0")
+    if not length.isdigit():
+        raise HTTPError(400, "Invalid Content-Length")
+    if int(length) > MAX_BODY_BYTES:
+        raise HTTPError(413, "Request body too large")
+    if int(length):
+        try:
+            await asyncio.wait_for(
+                reader.readexactly(int(length)), timeout=IDLE_TIMEOUT
+            )
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+            return None
+
+    method, target, version = parts
+    return method, target, version, headers
+
+
+class StatsServer:
+    """Serves a StatsApp over HTTP/1.1 with keep-alive connections."""
+
+    def __init__(self, app: Optional[StatsApp] = None) -> None:
+        """
+        Initialize the server.
+
+        Args:
+            app: Query handlers (defaults to one over the shipped configs)
+        """
+        self.app = app or StatsApp()
+
+    async def respond(
+        self, method: str, target: str, headers: Dict[str, str], keep_alive: bool
+    ) -> bytes:
+        """Encode the response to one request."""
+        if method not in ("GET", "HEAD"):
+            return _error(405, f"Method not allowed: {method}", keep_alive)
+        try:
+            response = self.app.cached(target)
+            if response is None:
+                loop = asyncio.get_running_loop()
+                response = await loop.run_in_executor(None, self.app.handle, target)
+        except HTTPError as e:
+            return _error(e.status, e.message, keep_alive)
+        except Exception:
+            logger.exception("Error answering %s", target)
+            return _error(500, "Internal server error", keep_alive)
+
+        if headers.get("if-none-match") == response.etag:
+            return _response(304, etag=response.etag, keep_alive=keep_alive)
+        if method == "HEAD":
+            head = _response(200, response.body, response.etag, keep_alive)
+            return head[: len(head) - len(response.body)]
+        return _response(200, response.body, response.etag, keep_alive)
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answer requests on one connection until it is closed."""
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except HTTPError as e:
+                    writer.write(_error(e.status, e.message, keep_alive=False))
+                    break
+                if request is None:
+                    break
+                method, target, version, headers = request
+                connection = headers.get("connection", "").lower()
+                keep_alive = (
+                    connection != "close"
+                    if version == "HTTP/1.1"
+                    else connection == "keep-alive"
+                )
+                writer.write(await self.respond(method, target, headers, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(
+        self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT
+    ) -> asyncio.Server:
+        """Start listening; port 0 picks a free port.
+
+        Args:
+            host: Interface to bind
+            port: Port to bind
+
+        Returns:
+            Listening server
+        """
+        return await asyncio.start_server(
+            self.handle_connection, host, port, limit=MAX_HEADER_BYTES
+        )
+
+
+async def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+    """Run the service until cancelled."""
+    server = await StatsServer().start(host, port)
+    for sock in server.sockets:
+        logger.info("Serving on %s", sock.getsockname())
+    async with server:
+        await server.serve_forever()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Banner statistics query service")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
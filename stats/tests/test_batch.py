@@ -0,0 +1,69 @@
+# Tests for core/batch.py
+import numpy as np
+import pytest
+
+from core.batch import BatchParameters, calculate_batch
+from core.calculator import ProbabilityCalculator
+from core.common.errors import ValidationError
+from core.config.banner_config import BANNER_CONFIGS
+
+
+@pytest.fixture
+def shipped_configs():
+    """Return every shipped banner config."""
+    return [
+        config for banners in BANNER_CONFIGS.values() for config in banners.values()
+    ]
+
+
+def test_batch_matches_single_calculator(shipped_configs):
+    """Test that every batch row equals the single-config calculation."""
+    result = calculate_batch(BatchParameters.from_configs(shipped_configs))
+
+    assert result.per_roll.shape == (len(shipped_configs), 90)
+    for index, config in enumerate(shipped_configs):
+        expected = ProbabilityCalculator(config).calculate_probability_arrays()
+        for actual, reference in zip(result.curves(index), expected):
+            np.testing.assert_array_equal(actual, reference)
+
+
+def test_batch_padding(shipped_configs):
+    """Test that padded rolls carry no probability mass."""
+    result = calculate_batch(BatchParameters.from_configs(shipped_configs))
+
+    assert result.mask.sum(axis=1).tolist() == [c.hard_pity for c in shipped_configs]
+    assert np.all(result.per_roll[~result.mask] == 0.0)
+    assert np.all(result.first_5star[~result.mask] == 0.0)
+    assert result.cumulative[:, -1] == pytest.approx(1.0)
+
+
+def test_batch_from_columns_sweep():
+    """Test a parameter sweep given as struct-of-arrays columns."""
+    soft_pity = np.arange(60, 80)
+    params = BatchParameters.from_columns(
+        base_rate=np.full(soft_pity.shape, 0.006),
+        soft_pity_start_after=soft_pity,
+        hard_pity=np.full(soft_pity.shape, 90),
+        rate_increase=np.full(soft_pity.shape, 0.07),
+    )
+    result = calculate_batch(params)
+
+    assert len(params) == 20
+    # Later soft pity means lower odds by roll 75
+    assert np.all(np.diff(result.cumulative[:, 74]) <= 0)
+
+
+def test_batch_validation():
+    """Test that malformed columns are rejected."""
+    with pytest.raises(ValidationError, match="same length"):
+        BatchParameters.from_columns([0.006, 0.006], [73], [90], [0.07])
+    with pytest.raises(ValidationError, match="Invalid pity values"):
+        BatchParameters.from_columns([0.006], [91], [90], [0.07])
+    with pytest.raises(ValidationError, match="Invalid pity values"):
+        BatchParameters.from_columns([0.006], [73], [5000], [0.07])
+    with pytest.raises(ValidationError, match="integers"):
+        BatchParameters.from_columns([0.006], [73.9], [90.5], [0.07])
+    with pytest.raises(ValidationError, match="integers"):
+        BatchParameters.from_columns([0.006], [73], [90.0], [0.07])
+    with pytest.raises(ValidationError, match="Base rate"):
+        BatchParameters.from_columns([1.5], [73], [90], [0.07])
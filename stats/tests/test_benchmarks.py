@@ -0,0 +1,74 @@
+# Tests for benchmarks/run_benchmarks.py
+import pytest
+
+from core.cache import calculation_key
+from benchmarks.run_benchmarks import (
+    REFERENCE_METRIC,
+    compare_to_baseline,
+    load_baseline,
+    run_benchmarks,
+    save_baseline,
+    sweep_configs,
+)
+
+
+def test_sweep_configs_are_distinct():
+    """Test that sweep configs never share a calculation cache entry."""
+    configs = sweep_configs(500)
+    assert len({calculation_key(config) for config in configs}) == 500
+
+
+def test_compare_to_baseline():
+    """Test that only large, known regressions are reported."""
+    results = {
+        "slow[1k]": {"median_s": 0.5},
+        "noisy[shipped]": {"median_s": 0.003},
+        "new[1k]": {"median_s": 9.0},
+    }
+    baseline = {"slow[1k]": 0.2, "noisy[shipped]": 0.001}
+
+    regressions = compare_to_baseline(results, baseline, tolerance=1.5)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("slow[1k]")
+
+
+def test_compare_scales_by_reference():
+    """Test that a uniformly slower machine is not a regression."""
+    baseline = {REFERENCE_METRIC: 0.02, "calc[1k]": 0.2}
+    slower = {REFERENCE_METRIC: {"median_s": 0.04}, "calc[1k]": {"median_s": 0.38}}
+    assert compare_to_baseline(slower, baseline) == []
+
+    regressed = {REFERENCE_METRIC: {"median_s": 0.02}, "calc[1k]": {"median_s": 0.38}}
+    assert len(compare_to_baseline(regressed, baseline)) == 1
+
+
+def test_save_baseline_rescales_missing_metrics(tmp_path):
+    """Test that a partial update keeps old metrics on the new reference."""
+    path = tmp_path / "baseline.json"
+    save_baseline(
+        path,
+        {REFERENCE_METRIC: {"median_s": 0.02}, "calc[10k]": {"median_s": 2.0}},
+    )
+    save_baseline(
+        path,
+        {REFERENCE_METRIC: {"median_s": 0.01}, "calc[1k]": {"median_s": 0.1}},
+    )
+    assert load_baseline(path) == pytest.approx(
+        {REFERENCE_METRIC: 0.01, "calc[1k]": 0.1, "calc[10k]": 1.0}
+    )
+
+
+def test_run_benchmarks_reports_metrics():
+    """Test the JSON-ready result layout of a small run."""
+    results = run_benchmarks(quick=True, only=["calculate_probabilities"])
+
+    assert set(results) == {
+        REFERENCE_METRIC,
+        "calculate_probabilities[shipped]",
+        "calculate_probabilities[1k]",
+    }
+    assert results["calculate_probabilities[1k]"]["configs"] == 1000
+    timing = results["calculate_probabilities[1k]"]
+    assert timing["repeats"] >= 3
+    assert 0 < timing["best_s"] <= timing["median_s"]
@@ -0,0 +1,63 @@
+# Tests for output/binary_store.py
+import json
+
+import numpy as np
+import pytest
+
+from core.calculator import ProbabilityCalculator
+from core.common.errors import DataError
+from core.config.banner_config import BANNER_CONFIGS, config_fingerprint
+from output.binary_store import BinaryOutputHandler, BinaryResultStore
+
+
+@pytest.fixture
+def star_rail_store(tmp_path):
+    """Write the Star Rail banners and return the file stem."""
+    stem = str(tmp_path / "star_rail_all_banners")
+    banners = [
+        (name, config, ProbabilityCalculator(config).calculate_probabilities())
+        for name, config in BANNER_CONFIGS["Star Rail"].items()
+    ]
+    BinaryOutputHandler().write(stem, "Star Rail", banners)
+    return stem
+
+
+def test_index_layout(star_rail_store):
+    """Test offsets, lengths and fingerprints in the JSON index."""
+    with open(f"{star_rail_store}.json", encoding="utf-8") as file:
+        index = json.load(file)
+
+    assert index["game"] == "Star Rail"
+    assert [e["banner"] for e in index["banners"]] == [
+        "standard",
+        "limited",
+        "light_cone",
+    ]
+    assert [e["offset"] for e in index["banners"]] == [0, 90, 180]
+    assert [e["length"] for e in index["banners"]] == [90, 90, 80]
+    assert index["banners"][2]["fingerprint"] == config_fingerprint(
+        BANNER_CONFIGS["Star Rail"]["light_cone"]
+    )
+
+
+def test_loader_returns_memory_mapped_views(star_rail_store):
+    """Test that curves round-trip exactly as views of the mapped file."""
+    store = BinaryResultStore(star_rail_store)
+    config = BANNER_CONFIGS["Star Rail"]["light_cone"]
+    expected = ProbabilityCalculator(config).calculate_probability_arrays()
+
+    assert store.game == "Star Rail"
+    assert store.banners() == ["standard", "limited", "light_cone"]
+    for actual, reference in zip(store.curves("light_cone"), expected):
+        np.testing.assert_array_equal(actual, reference)
+        assert isinstance(actual.base, np.memmap)
+        assert not actual.flags.writeable
+
+
+def test_loader_errors(star_rail_store):
+    """Test unknown banners and columns."""
+    store = BinaryResultStore(star_rail_store)
+    with pytest.raises(DataError, match="Unknown banner"):
+        store.curve("bangboo")
+    with pytest.raises(DataError, match="Unknown column"):
+        store.curve("limited", "median")
@@ -0,0 +1,51 @@
+# Tests for core/cache.py
+import pytest
+
+from core.cache import CalculationCache, LRUCache, calculation_key
+from core.calculator import ProbabilityCalculator
+from core.config.banner_config import BANNER_CONFIGS
+
+
+def test_lru_eviction_and_counters():
+    """Test LRU eviction order and hit/miss counters."""
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "a" becomes most recently used
+    cache.put("c", 3)  # evicts "b"
+
+    assert "b" not in cache
+    assert cache.get("b") is None
+    assert cache.get_or_compute("c", lambda: 99) == 3
+    assert (cache.hits, cache.misses, len(cache)) == (2, 1, 2)
+
+    cache.clear()
+    assert (cache.hits, cache.misses, len(cache)) == (0, 0, 0)
+
+
+def test_invalid_cache_size():
+    """Test that an empty cache bound is rejected."""
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=0)
+
+
+def test_shared_parameters_are_computed_once():
+    """Test cross-game dedupe of banners with identical numbers."""
+    cache = CalculationCache()
+    configs = [c for banners in BANNER_CONFIGS.values() for c in banners.values()]
+    for config in configs:
+        cache.curves(config)
+
+    distinct = {calculation_key(config) for config in configs}
+    assert cache.misses == len(distinct) == len(cache)
+    assert cache.hits == len(configs) - len(distinct)
+
+    star_rail = cache.curves(BANNER_CONFIGS["Star Rail"]["limited"])
+    genshin = cache.curves(BANNER_CONFIGS["Genshin Impact"]["standard"])
+    assert star_rail is genshin
+    assert (
+        star_rail
+        == ProbabilityCalculator(
+            BANNER_CONFIGS["Star Rail"]["limited"]
+        ).calculate_probabilities()
+    )
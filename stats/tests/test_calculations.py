@@ -1,9 +1,38 @@
+import dataclasses
+
+import numpy as np
 import pytest
 from core.common.errors import ValidationError
 from core.calculator import ProbabilityCalculator
 from core.config.banner_config import BannerConfig
 
 
+def _reference_curves(config):
+    """Curves of the original roll-by-roll loop."""
+    per_roll = []
+    for roll_number in range(1, config.hard_pity + 1):
+        if roll_number <= config.soft_pity_start_after:
+            per_roll.append(config.base_rate)
+        elif roll_number == config.hard_pity:
+            per_roll.append(1.0)
+        else:
+            rolls_into_soft_pity = roll_number - config.soft_pity_start_after
+            per_roll.append(
+                min(1.0, config.base_rate + config.rate_increase * rolls_into_soft_pity)
+            )
+    first_5star = []
+    no_5star_prob = 1.0
+    for prob in per_roll:
+        first_5star.append(no_5star_prob * prob)
+        no_5star_prob *= 1.0 - prob
+    cumulative = []
+    running_prob = 0.0
+    for prob in first_5star:
+        running_prob += prob
+        cumulative.append(running_prob)
+    return per_roll, cumulative, first_5star
+
+
 class TestCalculator:
     @pytest.fixture
     def valid_config(self):
@@ -101,3 +130,37 @@ class TestCalculator:
 
         # First value should match base rate with small tolerance for floating point precision
         assert per_roll[0] == pytest.approx(calculator.config.base_rate, abs=1e-6)
+
+    def test_probability_arrays_match_reference_loop(self, calculator):
+        """Test that the NumPy engine reproduces the roll-by-roll definition."""
+        per_roll_ref, cumulative_ref, first_ref = _reference_curves(calculator.config)
+        per_roll, cumulative, first_5star = calculator.calculate_probability_arrays()
+
+        assert isinstance(per_roll, np.ndarray)
+        assert per_roll.tolist() == per_roll_ref
+        assert cumulative.tolist() == cumulative_ref
+        assert first_5star.tolist() == first_ref
+        assert calculator.calculate_probabilities() == (
+            per_roll_ref,
+            cumulative_ref,
+            first_ref,
+        )
+
+    def test_hard_pity_overrides_base_rate_without_soft_pity(self, valid_config):
+        """Test the one intended departure from the original loop.
+
+        With soft_pity_start_after == hard_pity the loop returned base_rate
+        on the last roll, so no 5* was guaranteed. The engine always
+        guarantees the hard pity roll; every other roll is unchanged.
+        """
+        config = dataclasses.replace(valid_config, soft_pity_start_after=90)
+        per_roll_ref, _, first_ref = _reference_curves(config)
+        per_roll, cumulative, first_5star = ProbabilityCalculator(
+            config
+        ).calculate_probability_arrays()
+
+        assert per_roll_ref[-1] == config.base_rate
+        assert per_roll[-1] == 1.0
+        assert per_roll[:-1].tolist() == per_roll_ref[:-1]
+        assert first_5star[:-1].tolist() == first_ref[:-1]
+        assert cumulative[-1] == pytest.approx(1.0)
@@ -0,0 +1,57 @@
+# Tests for core/conditional.py
+import numpy as np
+import pytest
+
+from core.calculator import ProbabilityCalculator
+from core.common.errors import ValidationError
+from core.conditional import ConditionalTable
+from core.config.banner_config import BANNER_CONFIGS
+from core.markov import MarkovChainEngine
+
+
+@pytest.fixture(scope="module")
+def limited_table():
+    """Return the conditional table of the Star Rail limited banner."""
+    return ConditionalTable(BANNER_CONFIGS["Star Rail"]["limited"])
+
+
+def test_table_shapes(limited_table):
+    """Test table dimensions."""
+    assert limited_table.any_five_star.shape == (90, 181)
+    assert limited_table.rate_up.shape == (2, 90, 181)
+    assert np.all(limited_table.any_five_star[:, 0] == 0.0)
+
+
+def test_zero_pity_matches_calculator(limited_table):
+    """Test that the zero-pity row is the cumulative curve."""
+    _, cumulative, _ = ProbabilityCalculator(
+        limited_table.config
+    ).calculate_probability_arrays()
+    np.testing.assert_allclose(limited_table.any_five_star[0, 1:91], cumulative)
+    np.testing.assert_allclose(limited_table.rate_up[1, 0, 1:91], cumulative)
+
+
+def test_rows_match_markov_chain(limited_table):
+    """Test rate-up rows against stepping the chain from each start state."""
+    engine = MarkovChainEngine(limited_table.config)
+    for pity, guaranteed in [(0, False), (62, True), (62, False), (89, False)]:
+        expected = engine.rate_up_cumulative(180, pity, guaranteed)
+        for pulls in (1, 20, 180):
+            assert limited_table.probability(pity, pulls, guaranteed) == pytest.approx(
+                expected[pulls - 1], abs=1e-12
+            )
+
+
+def test_high_pity_reaches_hard_pity(limited_table):
+    """Test that a player one pull from hard pity always gets a 5*."""
+    assert limited_table.any_five_star_probability(89, 1) == 1.0
+    assert limited_table.probability(89, 1, guaranteed=True) == pytest.approx(1.0)
+    assert limited_table.probability(89, 1) == pytest.approx(0.5)
+
+
+def test_out_of_range_queries(limited_table):
+    """Test that queries outside the table are rejected."""
+    with pytest.raises(ValidationError, match="Pulls must be between"):
+        limited_table.probability(0, 181)
+    with pytest.raises(ValidationError, match="Pity must be between"):
+        limited_table.any_five_star_probability(90, 1)
@@ -0,0 +1,80 @@
+# Tests for core/copies.py
+import numpy as np
+import pytest
+
+from core.calculator import ProbabilityCalculator
+from core.config.banner_config import BANNER_CONFIGS
+from core.copies import copies_distribution, fft_convolve, single_copy_pmf
+from core.markov import MarkovChainEngine
+
+
+@pytest.fixture
+def limited_config():
+    """Return the Genshin Impact limited banner config."""
+    return BANNER_CONFIGS["Genshin Impact"]["limited"]
+
+
+def test_fft_convolve_matches_numpy():
+    """Test FFT convolution against direct convolution."""
+    rng = np.random.default_rng(0)
+    a, b = rng.random(37), rng.random(90)
+    np.testing.assert_allclose(fft_convolve(a, b), np.convolve(a, b), atol=1e-12)
+
+
+def test_single_copy_matches_markov_chain(limited_config):
+    """Test the one-copy CDF against the pity x guarantee chain."""
+    engine = MarkovChainEngine(limited_config)
+    for pity, guaranteed in [(0, False), (60, False), (75, True)]:
+        pmf = single_copy_pmf(limited_config, pity=pity, guaranteed=guaranteed)
+        expected = engine.rate_up_cumulative(len(pmf) - 1, pity, guaranteed)
+        np.testing.assert_allclose(np.cumsum(pmf)[1:], expected, atol=1e-12)
+
+
+def test_fifty_fifty_mixture(limited_config):
+    """Test one copy equals r*f + (1-r)*f*f for a 50/50 banner."""
+    _, _, first_5star = ProbabilityCalculator(
+        limited_config
+    ).calculate_probability_arrays()
+    f = np.concatenate([[0.0], first_5star])
+    chance = limited_config.rate_up_chance
+    expected = (1 - chance) * np.convolve(f, f)
+    expected[: len(f)] += chance * f
+
+    pmf = single_copy_pmf(limited_config)
+    np.testing.assert_allclose(pmf, expected[: len(pmf)], atol=1e-12)
+
+
+def test_many_copies_match_direct_convolution(limited_config):
+    """Test power-by-squaring against repeated direct convolution."""
+    single = single_copy_pmf(limited_config)
+    expected = np.array([1.0])
+    for _ in range(7):
+        expected = np.convolve(expected, single)
+
+    distribution = copies_distribution(limited_config, 7)
+    np.testing.assert_allclose(
+        distribution.pmf, expected[: len(distribution.pmf)], atol=1e-12
+    )
+    assert distribution.cdf[-1] == pytest.approx(1.0)
+    assert distribution.probability_within(7 * 180) == pytest.approx(1.0)
+    assert distribution.probability_within(6) == pytest.approx(0.0, abs=1e-15)
+
+
+def test_copies_without_guarantee_use_epsilon():
+    """Test a banner whose lost rate-up rolls never become guaranteed."""
+    config = BANNER_CONFIGS["Star Rail"]["standard"]
+    _, _, first_5star = ProbabilityCalculator(config).calculate_probability_arrays()
+    mean_first = float(np.dot(np.arange(1, len(first_5star) + 1), first_5star))
+
+    distribution = copies_distribution(config, 2, epsilon=1e-10)
+    mean = float(np.dot(np.arange(len(distribution.pmf)), distribution.pmf))
+
+    assert 1.0 - distribution.cdf[-1] <= 3e-10
+    # Each copy needs a geometric number of 5* with mean 1 / rate_up_chance
+    assert mean == pytest.approx(2 * mean_first / config.rate_up_chance, rel=1e-6)
+
+
+def test_zero_copies():
+    """Test that zero copies need zero pulls."""
+    distribution = copies_distribution(BANNER_CONFIGS["Star Rail"]["limited"], 0)
+    assert distribution.pmf.tolist() == [1.0]
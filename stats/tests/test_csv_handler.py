@@ -74,3 +74,35 @@ def test_csv_output_handler_write_special_characters(csv_handler, tmp_path):
         read_rows = [row for row in reader]
         expected_rows_str = [[str(cell) for cell in row] for row in rows]
         assert read_rows == expected_rows_str
+
+
+def test_csv_output_handler_write_generator(csv_handler, tmp_path):
+    """Test streaming rows from a generator."""
+    header = ["Roll", "Square"]
+    filename = tmp_path / "streamed.csv"
+
+    csv_handler.write(str(filename), header, ([i, i * i] for i in range(1000)))
+
+    with open(filename, mode="r", newline="", encoding="utf-8") as file:
+        read_rows = list(csv.reader(file))
+    assert read_rows[0] == header
+    assert len(read_rows) == 1001
+    assert read_rows[-1] == ["999", "998001"]
+
+
+def test_csv_output_handler_invalid_row_keeps_previous_file(csv_handler, tmp_path):
+    """Test that a bad row mid-stream leaves the old file and no temp files."""
+    header = ["ID", "Name"]
+    filename = tmp_path / "atomic.csv"
+    csv_handler.write(str(filename), header, [[1, "Alice"]])
+
+    def rows():
+        yield [2, "Bob"]
+        yield [3]  # Wrong length
+
+    with pytest.raises(ValueError, match="Row length must match header length"):
+        csv_handler.write(str(filename), header, rows())
+
+    with open(filename, mode="r", newline="", encoding="utf-8") as file:
+        assert list(csv.reader(file)) == [header, ["1", "Alice"]]
+    assert os.listdir(tmp_path) == ["atomic.csv"]
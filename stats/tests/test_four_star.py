@@ -0,0 +1,85 @@
+# Tests for core/four_star.py
+import numpy as np
+import pytest
+
+from core.common.errors import ValidationError
+from core.config.banner_config import BANNER_CONFIGS
+from core.four_star import FourStarEngine
+
+
+@pytest.fixture(scope="module")
+def engine():
+    """Return the 4* engine of the Genshin Impact limited banner."""
+    return FourStarEngine(BANNER_CONFIGS["Genshin Impact"]["limited"])
+
+
+def brute_force_counts(engine, pulls, pity, four_star_pity):
+    """Reference: recurse over every pull outcome."""
+    counts = np.zeros(pulls + 1)
+
+    def visit(step, p5, p4, count, weight):
+        if step == pulls:
+            counts[count] += weight
+            return
+        h5 = engine.hazard[p5]
+        h4 = 1 - h5 if p4 + 1 >= 10 else min(engine.config.four_star_rate, 1 - h5)
+        visit(step + 1, 0, 0, count, weight * h5)
+        if h4 > 0:
+            visit(step + 1, p5 + 1, 0, count + 1, weight * h4)
+        if 1 - h5 - h4 > 0:
+            visit(step + 1, p5 + 1, p4 + 1, count, weight * (1 - h5 - h4))
+
+    visit(0, pity, four_star_pity, 0, 1.0)
+    return counts
+
+
+def test_transition_is_stochastic(engine):
+    """Test state count and that every column sums to one."""
+    assert engine.n_states == 900
+    np.testing.assert_allclose(engine.transition.to_dense().sum(axis=0), 1.0)
+
+
+@pytest.mark.parametrize("pity,four_star_pity", [(0, 0), (85, 7), (88, 9)])
+def test_counts_match_brute_force(engine, pity, four_star_pity):
+    """Test the 4* count distribution against explicit enumeration."""
+    np.testing.assert_allclose(
+        engine.four_star_count_distribution(6, pity, four_star_pity),
+        brute_force_counts(engine, 6, pity, four_star_pity),
+        atol=1e-14,
+    )
+
+
+def test_ten_pull_guarantee(engine):
+    """Test that ten pulls without a 5* always hold a 4*."""
+    counts = engine.four_star_count_distribution(10)
+    # Missing every 4* needs a 5*, and then nine more pulls without a 4*
+    assert 0 < counts[0] < 1 - np.prod(1 - engine.hazard[:10])
+    assert counts.sum() == pytest.approx(1.0)
+
+
+def test_featured_probability(engine):
+    """Test the specific featured 4* chance against simple limits."""
+    counts = engine.four_star_count_distribution(30)
+    any_four_star = 1 - counts[0]
+    assert engine.featured_probability(
+        30, featured_chance=1.0, featured_count=1
+    ) == pytest.approx(any_four_star)
+    assert engine.featured_probability(
+        30, featured_count=1, guaranteed=True
+    ) == pytest.approx(any_four_star)
+
+    # Without a guarantee each 4* is the wanted one with chance 1/6
+    k = np.arange(len(counts))
+    expected = counts @ (1 - (5 / 6) ** k)
+    assert engine.featured_probability(30, guarantee_on_loss=False) == pytest.approx(
+        expected
+    )
+    assert engine.featured_probability(30) > expected
+
+
+def test_invalid_state(engine):
+    """Test that out-of-range pity is rejected."""
+    with pytest.raises(ValidationError):
+        engine.state_index(0, 10)
+    with pytest.raises(ValidationError):
+        engine.state_index(90, 0)
@@ -0,0 +1,64 @@
+# Tests for core/joint.py
+import numpy as np
+import pytest
+
+from core.common.errors import ValidationError
+from core.config.banner_config import BANNER_CONFIGS
+from core.copies import copies_distribution
+from core.joint import BannerGoal, JointDistributionEngine
+
+LIMITED = BANNER_CONFIGS["Star Rail"]["limited"]
+LIGHT_CONE = BANNER_CONFIGS["Star Rail"]["light_cone"]
+
+
+def test_character_and_light_cone_convolve():
+    """Test the joint PMF against direct convolution of the banner PMFs."""
+    engine = JointDistributionEngine()
+    joint = engine.distribution(
+        [BannerGoal(LIMITED, copies=2), BannerGoal(LIGHT_CONE, pity=30)]
+    )
+
+    expected = np.convolve(
+        copies_distribution(LIMITED, 2).pmf,
+        copies_distribution(LIGHT_CONE, 1, pity=30).pmf,
+    )
+    np.testing.assert_allclose(joint.pmf, expected[: len(joint.pmf)], atol=1e-12)
+    assert joint.cdf[-1] == pytest.approx(1.0)
+    assert joint.probability_within(-1) == 0.0
+    assert joint.probability_within(10_000) == pytest.approx(1.0)
+
+
+def test_three_banners_match_pairwise_convolution():
+    """Test that one FFT product equals repeated pairwise convolution."""
+    zzz = BANNER_CONFIGS["Zenless Zone Zero"]
+    goals = [
+        BannerGoal(zzz["limited"]),
+        BannerGoal(zzz["w_engine"]),
+        BannerGoal(zzz["bangboo"], copies=2),
+    ]
+    joint = JointDistributionEngine().distribution(goals)
+
+    expected = np.array([1.0])
+    for goal in goals:
+        expected = np.convolve(
+            expected, copies_distribution(goal.config, goal.copies).pmf
+        )
+    np.testing.assert_allclose(joint.pmf, expected[: len(joint.pmf)], atol=1e-12)
+
+
+def test_single_banner_pmfs_are_cached_across_games():
+    """Test that banners with equal parameters share one cached PMF."""
+    engine = JointDistributionEngine()
+    engine.distribution([BannerGoal(LIMITED)])
+    engine.distribution(
+        [BannerGoal(BANNER_CONFIGS["Genshin Impact"]["limited"]), BannerGoal(LIMITED)]
+    )
+    assert (engine.cache.hits, engine.cache.misses) == (2, 1)
+
+
+def test_empty_and_invalid_goals():
+    """Test the empty combination and negative copies."""
+    engine = JointDistributionEngine()
+    assert engine.distribution([]).pmf.tolist() == [1.0]
+    with pytest.raises(ValidationError):
+        engine.distribution([BannerGoal(LIMITED, copies=-1)])
@@ -0,0 +1,138 @@
+# Tests for core/config/loader.py
+import dataclasses
+import json
+
+import pytest
+
+from core.common.errors import ConfigurationError, ValidationError
+from core.config.banner_config import BANNER_CONFIGS, BannerConfig
+from core.config.loader import (
+    FIELDS,
+    ConfigValidationError,
+    load_configs,
+    parse_configs,
+)
+
+SHIPPED = [config for banners in BANNER_CONFIGS.values() for config in banners.values()]
+
+
+def _row(config: BannerConfig) -> dict:
+    """Config as a file row, with the rate-up rule as a table."""
+    row = dataclasses.asdict(config)
+    if row["rate_up_rule"] is None:
+        del row["rate_up_rule"]
+    if row["rate_up_chance"] is None:
+        del row["rate_up_chance"]
+    return row
+
+
+@pytest.fixture
+def rows():
+    """Fixture providing every shipped config as a file row."""
+    return [_row(config) for config in SHIPPED]
+
+
+def test_rows_and_columns_round_trip(rows):
+    """Test that both layouts rebuild the shipped configs exactly."""
+    table = parse_configs({"banners": rows})
+    assert list(table.configs()) == SHIPPED
+
+    # Unset optional fields are null in the column layout
+    columns = {name: [row.get(name) for row in rows] for name in FIELDS}
+    assert list(parse_configs({"banners": columns}).configs()) == SHIPPED
+
+
+def test_json_and_toml_files(tmp_path, rows):
+    """Test loading the same rows from JSON and TOML files."""
+    json_path = tmp_path / "sweep.json"
+    json_path.write_text(json.dumps({"banners": rows}))
+    toml_path = tmp_path / "sweep.toml"
+    toml_path.write_text(
+        '[[banners]]\ngame_name = "Star Rail"\nbanner_type = "Limited"\n'
+        "base_rate = 0.006\nfour_star_rate = 0.051\nsoft_pity_start_after = 73\n"
+        "hard_pity = 90\nrate_increase = 0.07\nguaranteed_rate_up = true\n"
+        "rate_up_chance = 0.5\n"
+    )
+
+    assert list(load_configs(str(json_path)).configs()) == SHIPPED
+    assert list(load_configs(str(toml_path)).configs()) == [
+        BANNER_CONFIGS["Star Rail"]["limited"]
+    ]
+    with pytest.raises(ConfigurationError):
+        load_configs(str(tmp_path / "sweep.yaml"))
+
+
+def test_every_invalid_row_is_reported(rows):
+    """Test that all invalid rows are reported with their indices."""
+    rows[1]["hard_pity"] = 500
+    rows[2]["base_rate"] = "0.006"
+    rows[3]["banner_type"] = "Light Cone"
+    rows[4]["guaranteed_rate_up"] = 1
+    del rows[5]["four_star_rate"]
+    rows[6]["rate_up_rule"] = {"featured_chance": 2.0}
+    rows[7]["hard_pity"] = 90.0
+    rows[8]["game_name"] = ["Star Rail"]
+
+    with pytest.raises(ConfigValidationError) as excinfo:
+        parse_configs({"banners": rows})
+    assert excinfo.value.errors == {
+        1: ["invalid pity values"],
+        2: ["base_rate must be a number"],
+        3: ["invalid banner type"],
+        4: ["guaranteed_rate_up must be a boolean"],
+        5: ["missing four_star_rate"],
+        6: ["invalid rate_up_rule: Featured chance must be between 0 and 1"],
+        7: ["hard_pity must be an integer"],
+        8: ["game_name must be a string"],
+    }
+    assert isinstance(excinfo.value, ValidationError)
+
+
+def test_nan_rates_are_out_of_range(rows):
+    """Test that NaN rates are rejected while unset chances are accepted."""
+    nan = float("nan")
+    rows[0]["base_rate"] = nan
+    rows[1]["rate_increase"] = nan
+    rows[2]["rate_up_chance"] = nan
+    rows[3]["base_rate"] = "0.006"
+
+    with pytest.raises(ConfigValidationError) as excinfo:
+        parse_configs({"banners": rows})
+    assert excinfo.value.errors == {
+        0: ["base_rate must be between 0 and 1"],
+        1: ["rate_increase must be between 0 and 1"],
+        2: ["rate_up_chance must be between 0 and 1"],
+        3: ["base_rate must be a number"],
+    }
+
+    # A fully numeric column takes the vectorized path
+    columns = {name: [row.get(name) for row in rows[4:6]] for name in FIELDS}
+    columns["rate_up_chance"] = [0.5, nan]
+    with pytest.raises(ConfigValidationError) as excinfo:
+        parse_configs({"banners": columns})
+    assert excinfo.value.errors == {1: ["rate_up_chance must be between 0 and 1"]}
+
+
+def test_large_sweep_report_is_truncated(rows):
+    """Test that a sweep full of invalid rows keeps a short message."""
+    row = dict(rows[0], base_rate=1.5)
+    columns = {name: [value] * 10_000 for name, value in row.items()}
+    with pytest.raises(ConfigValidationError) as excinfo:
+        parse_configs({"banners": columns})
+    assert len(excinfo.value.errors) == 10_000
+    assert str(excinfo.value).endswith("... and 9980 more rows")
+
+
+@pytest.mark.parametrize(
+    "document",
+    [
+        {},
+        {"banners": 3},
+        {"banners": [{"unknown": 1}]},
+        {"banners": {"hard_pity": [90], "soft_pity_start_after": [73, 74]}},
+    ],
+)
+def test_malformed_documents(document):
+    """Test documents without a usable banners entry."""
+    with pytest.raises(ConfigurationError):
+        parse_configs(document)
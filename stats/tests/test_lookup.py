@@ -0,0 +1,70 @@
+# Tests for output/lookup.py
+import numpy as np
+import pytest
+
+from core.common.errors import DataError, ValidationError
+from core.conditional import ConditionalTable
+from core.config.banner_config import BANNER_CONFIGS, config_fingerprint
+from core.rate_up import rate_up_machine
+from output.lookup import LookupTable, write_lookup
+from runner import build_lookup_artifact
+
+HORIZON = 200
+
+
+@pytest.fixture(scope="module")
+def lookup_path(tmp_path_factory):
+    """Write the artifact of every shipped banner and return its path."""
+    path = str(tmp_path_factory.mktemp("lookup") / "banner_lookup.bin")
+    build_lookup_artifact(path, horizon=HORIZON)
+    return path
+
+
+def test_lookups_match_conditional_tables(lookup_path):
+    """Test every banner, guarantee state and a range of pities and horizons."""
+    lookup = LookupTable(lookup_path)
+    assert isinstance(lookup.data, np.memmap)
+    assert lookup.horizon == HORIZON
+
+    for game, banners in BANNER_CONFIGS.items():
+        for banner, config in banners.items():
+            table = ConditionalTable(config, max_pulls=HORIZON)
+            assert lookup.fingerprint(game, banner) == config_fingerprint(config)
+            has_guarantee = rate_up_machine(config).guaranteed_state != 0
+            guarantees = [False, True] if has_guarantee else [False]
+            for guaranteed in guarantees:
+                for pity in (0, config.hard_pity // 2, config.hard_pity - 1):
+                    expected = [
+                        table.probability(pity, pulls, guaranteed)
+                        for pulls in range(HORIZON + 1)
+                    ]
+                    np.testing.assert_array_equal(
+                        lookup.curve(game, banner, pity, guaranteed), expected
+                    )
+    assert lookup.probability("Star Rail", "limited", 0, 0) == 0.0
+    assert lookup.banners()[0] == ("Star Rail", "standard")
+
+
+def test_invalid_queries(lookup_path):
+    """Test unknown banners and states or horizons outside the artifact."""
+    lookup = LookupTable(lookup_path)
+    with pytest.raises(DataError):
+        lookup.probability("Star Rail", "missing", 0, 10)
+    with pytest.raises(ValidationError):
+        lookup.probability("Star Rail", "limited", 90, 10)
+    with pytest.raises(ValidationError):
+        lookup.probability("Star Rail", "limited", 0, HORIZON + 1)
+    with pytest.raises(ValidationError):
+        lookup.probability("Zenless Zone Zero", "bangboo", 0, 10, guaranteed=True)
+
+
+def test_empty_artifact_and_bad_file(tmp_path):
+    """Test an artifact without banners and a file of another format."""
+    path = str(tmp_path / "empty.bin")
+    write_lookup(path, {}, horizon=10)
+    assert LookupTable(path).banners() == []
+
+    other = tmp_path / "other.bin"
+    other.write_bytes(b"not a lookup artifact")
+    with pytest.raises(DataError):
+        LookupTable(str(other))
@@ -0,0 +1,55 @@
+# Tests for output/manifest.py
+import dataclasses
+import logging
+
+import pytest
+
+from core.config.banner_config import BANNER_CONFIGS
+from output.manifest import MANIFEST_FILENAME, Manifest, input_digest
+
+OPTIONS = {"format": "csv", "decimal_places": 6}
+
+
+def test_digest_tracks_inputs():
+    """Test that the digest changes with configs, engine version and options."""
+    banners = dict(BANNER_CONFIGS["Star Rail"])
+    digest = input_digest("Star Rail", banners, "1", OPTIONS)
+
+    assert digest == input_digest("Star Rail", dict(banners), "1", OPTIONS)
+    assert digest != input_digest("Star Rail", banners, "2", OPTIONS)
+    assert digest != input_digest(
+        "Star Rail", banners, "1", {**OPTIONS, "decimal_places": 4}
+    )
+
+    changed = dict(banners)
+    changed["standard"] = dataclasses.replace(banners["standard"], hard_pity=89)
+    assert digest != input_digest("Star Rail", changed, "1", OPTIONS)
+
+
+def test_round_trip_and_is_current(tmp_path):
+    """Test that recorded digests survive a save and need the file to exist."""
+    manifest = Manifest(str(tmp_path))
+    manifest.record("game.csv", "abc")
+    manifest.save()
+
+    loaded = Manifest(str(tmp_path))
+    assert loaded.get("game.csv") == "abc"
+    assert not loaded.is_current("game.csv", "abc")
+
+    (tmp_path / "game.csv").write_text("data")
+    assert loaded.is_current("game.csv", "abc")
+    assert not loaded.is_current("game.csv", "def")
+
+
+@pytest.mark.parametrize("content", ["{not json", '{"version": 1}', "[1, 2]"])
+def test_corrupt_manifest_starts_empty(tmp_path, caplog, content):
+    """Test that a damaged manifest is ignored with a warning."""
+    (tmp_path / MANIFEST_FILENAME).write_text(content)
+    (tmp_path / "game.csv").write_text("data")
+
+    with caplog.at_level(logging.WARNING):
+        manifest = Manifest(str(tmp_path))
+
+    assert manifest.entries == {}
+    assert not manifest.is_current("game.csv", "abc")
+    assert "Ignoring invalid manifest" in caplog.text
@@ -0,0 +1,99 @@
+# Tests for core/markov.py and core/sparse.py
+import numpy as np
+import pytest
+
+from core.calculator import ProbabilityCalculator
+from core.common.errors import ValidationError
+from core.config.banner_config import BANNER_CONFIGS
+from core.markov import MarkovChainEngine
+from core.sparse import SparseOperator
+
+
+@pytest.fixture
+def limited_engine():
+    """Return a chain for the Star Rail limited banner."""
+    return MarkovChainEngine(BANNER_CONFIGS["Star Rail"]["limited"])
+
+
+def test_sparse_operator_matches_dense():
+    """Test sparse products against the dense equivalent."""
+    operator = SparseOperator(
+        [0, 2, 2, 1], [1, 0, 0, 2], [0.5, 0.25, 0.25, 1.0], (3, 3)
+    )
+    dense = operator.to_dense()
+    x = np.array([1.0, 2.0, 3.0])
+    matrix = np.arange(6.0).reshape(3, 2)
+
+    assert dense[2, 0] == 0.5
+    np.testing.assert_allclose(operator.matvec(x), dense @ x)
+    np.testing.assert_allclose(operator.matvec(matrix), dense @ matrix)
+    np.testing.assert_allclose(
+        operator.matrix_power(5), np.linalg.matrix_power(dense, 5)
+    )
+
+
+def test_chain_preserves_probability_mass(limited_engine):
+    """Test that the transition operator is column-stochastic."""
+    distribution = limited_engine.evolve(limited_engine.initial_distribution(), 137)
+    assert distribution.sum() == pytest.approx(1.0)
+
+
+def test_guaranteed_start_matches_calculator(limited_engine):
+    """Test that a guaranteed start reduces to the first 5* curve."""
+    _, cumulative, _ = ProbabilityCalculator(
+        limited_engine.config
+    ).calculate_probability_arrays()
+
+    curve = limited_engine.rate_up_cumulative(90, guaranteed=True)
+    np.testing.assert_allclose(curve, cumulative, rtol=1e-12)
+
+
+def test_fifty_fifty_matches_convolution(limited_engine):
+    """Test the 50/50 curve against the direct convolution formula."""
+    _, cumulative, first_5star = ProbabilityCalculator(
+        limited_engine.config
+    ).calculate_probability_arrays()
+    chance = limited_engine.config.rate_up_chance
+    pulls = 180
+    # Chance of any 5* within n pulls, padded so index n is n pulls
+    any_by = np.concatenate([[0.0], cumulative, np.ones(pulls)])
+
+    expected = [
+        sum(
+            first_5star[k - 1] * (chance + (1 - chance) * any_by[n - k])
+            for k in range(1, min(n, 90) + 1)
+        )
+        for n in range(1, pulls + 1)
+    ]
+    curve = limited_engine.rate_up_cumulative(pulls)
+
+    np.testing.assert_allclose(curve, expected, rtol=1e-12)
+    assert curve[-1] == pytest.approx(1.0)
+
+
+def test_matrix_power_matches_stepping(limited_engine):
+    """Test repeated squaring against pull-by-pull evolution."""
+    curve = limited_engine.rate_up_cumulative(150, pity=40)
+    for pulls in (1, 64, 150):
+        assert limited_engine.rate_up_probability(pulls, pity=40) == pytest.approx(
+            curve[pulls - 1], rel=1e-12
+        )
+
+
+def test_bangboo_has_no_fifty_fifty():
+    """Test that a 100% rate-up banner matches the first 5* curve."""
+    config = BANNER_CONFIGS["Zenless Zone Zero"]["bangboo"]
+    _, cumulative, _ = ProbabilityCalculator(config).calculate_probability_arrays()
+
+    curve = MarkovChainEngine(config).rate_up_cumulative(config.hard_pity)
+    np.testing.assert_allclose(curve, cumulative, rtol=1e-12)
+
+
+def test_invalid_states(limited_engine):
+    """Test that unreachable player states are rejected."""
+    with pytest.raises(ValidationError, match="Pity must be between"):
+        limited_engine.initial_distribution(pity=90)
+    with pytest.raises(ValidationError, match="no rate-up guarantee"):
+        MarkovChainEngine(BANNER_CONFIGS["Star Rail"]["standard"]).state_index(
+            guaranteed=True
+        )
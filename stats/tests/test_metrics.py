@@ -0,0 +1,60 @@
+# Tests for core/common/metrics.py
+import json
+
+import pytest
+
+from core.common.metrics import RunMetrics
+
+
+def test_stage_accumulates_time_and_counts():
+    """Test that repeated stages add up per (stage, game, banner) key."""
+    metrics = RunMetrics()
+    for _ in range(2):
+        with metrics.stage("calculate", "Star Rail", "limited") as record:
+            record.rows += 90
+    metrics.add("write", "Star Rail", seconds=0.5, rows=180, bytes_written=1024)
+
+    calculate = metrics.get("calculate", "Star Rail", "limited")
+    assert calculate.calls == 2
+    assert calculate.rows == 180
+    assert calculate.seconds >= 0.0
+    assert metrics.seconds(["write"], "Star Rail") == pytest.approx(0.5)
+    assert metrics.totals()["write"].bytes_written == 1024
+
+
+def test_stage_records_time_when_block_raises():
+    """Test that a failing block still counts as a call."""
+    metrics = RunMetrics()
+    with pytest.raises(RuntimeError):
+        with metrics.stage("calculate"):
+            raise RuntimeError("boom")
+    assert metrics.get("calculate").calls == 1
+
+
+def test_disabled_metrics_record_nothing():
+    """Test that a disabled collector stays empty."""
+    metrics = RunMetrics(enabled=False)
+    with metrics.stage("calculate", "Star Rail") as record:
+        record.rows += 1
+    metrics.add("write", rows=5)
+    assert metrics.records() == []
+
+
+def test_dump(tmp_path):
+    """Test the JSON layout of dumped metrics."""
+    metrics = RunMetrics()
+    metrics.add("write", "Star Rail", rows=3)
+    path = tmp_path / "metrics.json"
+    metrics.dump(str(path))
+
+    data = json.loads(path.read_text())
+    assert data["stages"][0]["game"] == "Star Rail"
+    assert data["totals"][0] == {
+        "stage": "write",
+        "game": None,
+        "banner": None,
+        "seconds": 0.0,
+        "rows": 3,
+        "bytes_written": 0,
+        "calls": 1,
+    }
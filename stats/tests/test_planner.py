@@ -0,0 +1,110 @@
+# Tests for core/planner.py
+import itertools
+
+import numpy as np
+import pytest
+
+from core.common.errors import ValidationError
+from core.config.banner_config import BANNER_CONFIGS
+from core.copies import copies_distribution
+from core.planner import (
+    BannerState,
+    BudgetPlanner,
+    Goal,
+    income_pulls,
+    pulls_from_currency,
+)
+
+LIMITED = BANNER_CONFIGS["Star Rail"]["limited"]
+LIGHT_CONE = BANNER_CONFIGS["Star Rail"]["light_cone"]
+
+
+def test_currency_conversion():
+    """Test whole pulls from currency and daily income."""
+    assert pulls_from_currency(1000) == 6
+    assert income_pulls(90, 42) == 23
+
+
+def test_single_goal_matches_copies_distribution():
+    """Test one goal against the copies CDF."""
+    planner = BudgetPlanner([Goal(LIMITED, copies=3)])
+    expected = copies_distribution(LIMITED, 3).probability_within(250)
+    assert planner.probability(250) == pytest.approx(expected)
+
+
+def test_two_banners_convolve():
+    """Test that independent banners share one budget by convolution."""
+    planner = BudgetPlanner([Goal(LIMITED), Goal(LIGHT_CONE)])
+    combined = np.convolve(
+        copies_distribution(LIMITED, 1).pmf, copies_distribution(LIGHT_CONE, 1).pmf
+    )
+    assert planner.probability(200) == pytest.approx(combined[:201].sum())
+    np.testing.assert_allclose(
+        planner.probability_curve(200)[[50, 120, 200]],
+        np.cumsum(combined)[[50, 120, 200]],
+        atol=1e-12,
+    )
+
+
+def test_banner_state_applies_to_first_goal_only():
+    """Test that a second goal on the same banner starts fresh."""
+    states = {("Star Rail", "Limited"): BannerState(pity=80, guaranteed=True)}
+    planner = BudgetPlanner([Goal(LIMITED), Goal(LIMITED)], states)
+    first = copies_distribution(LIMITED, 1, pity=80, guaranteed=True).pmf
+    second = copies_distribution(LIMITED, 1).pmf
+    assert planner.probability(150) == pytest.approx(
+        np.convolve(first, second)[:151].sum()
+    )
+
+
+def test_plan_picks_best_order_with_income():
+    """Test that the plan is at least as good as every fixed order."""
+    goals = [Goal(LIMITED, copies=2), Goal(LIGHT_CONE)]
+    planner = BudgetPlanner(goals)
+    plan = planner.plan(150, income_per_phase=60)
+
+    forward = planner.probability(150, 60, goals)
+    backward = planner.probability(150, 60, goals[::-1])
+    assert plan.probability == pytest.approx(max(forward, backward))
+    assert plan.order[0] == (goals[0] if forward >= backward else goals[1])
+
+
+def test_plan_search_matches_every_order():
+    """Test the pruned order search against trying every order."""
+    genshin = BANNER_CONFIGS["Genshin Impact"]
+    goals = [
+        Goal(LIMITED),
+        Goal(LIGHT_CONE, copies=2),
+        Goal(genshin["limited"]),
+        Goal(LIMITED, copies=2),
+        Goal(genshin["weapon"]),
+    ]
+    states = {("Star Rail", "Limited"): BannerState(pity=60)}
+    planner = BudgetPlanner(goals, states)
+    for budget, income in [(150, 80), (300, 40), (600, 10)]:
+        plan = planner.plan(budget, income)
+        best = max(
+            planner.probability(budget, income, order)
+            for order in itertools.permutations(goals)
+        )
+        assert plan.probability == pytest.approx(best, abs=1e-10)
+        assert planner.probability(budget, income, plan.order) == pytest.approx(
+            plan.probability
+        )
+
+
+def test_plan_without_income_keeps_order():
+    """Test that without income every order is equally good."""
+    goals = [Goal(LIMITED, copies=2), Goal(LIGHT_CONE), Goal(LIMITED)]
+    states = {("Star Rail", "Limited"): BannerState(pity=70)}
+    planner = BudgetPlanner(goals, states)
+    plan = planner.plan(300)
+    assert plan.order == tuple(goals)
+    for order in itertools.permutations(goals):
+        assert planner.probability(300, 0, order) == pytest.approx(plan.probability)
+
+
+def test_invalid_goal():
+    """Test that goals need at least one copy."""
+    with pytest.raises(ValidationError):
+        BudgetPlanner([Goal(LIMITED, copies=0)])
@@ -0,0 +1,66 @@
+# Tests for core/quantiles.py
+import numpy as np
+import pytest
+
+from core.batch import BatchParameters, calculate_batch
+from core.calculator import ProbabilityCalculator
+from core.config.banner_config import BANNER_CONFIGS
+from core.quantiles import (
+    UNREACHABLE,
+    median_pulls,
+    percentile_table,
+    pulls_for_probability,
+)
+
+
+def linear_scan(cumulative, target):
+    """Reference implementation: first roll whose cumulative reaches target."""
+    for roll, value in enumerate(cumulative, 1):
+        if value >= target:
+            return roll
+    return UNREACHABLE
+
+
+@pytest.fixture
+def cumulative():
+    """Return the cumulative curve of the Star Rail limited banner."""
+    config = BANNER_CONFIGS["Star Rail"]["limited"]
+    return ProbabilityCalculator(config).calculate_probabilities()[1]
+
+
+def test_single_curve_matches_linear_scan(cumulative):
+    """Test quantiles of one curve against a linear scan."""
+    targets = np.linspace(0.0, 1.0, 101)
+    result = pulls_for_probability(cumulative, targets)
+
+    assert result.shape == (101,)
+    assert result.tolist() == [linear_scan(cumulative, t) for t in targets]
+
+
+def test_exact_boundaries(cumulative):
+    """Test targets equal to curve values and beyond the curve."""
+    assert pulls_for_probability(cumulative, cumulative[9]) == 10
+    assert pulls_for_probability(cumulative, 1.5) == UNREACHABLE
+    assert pulls_for_probability(cumulative, -0.1) == 1
+    assert median_pulls(cumulative) == linear_scan(cumulative, 0.5)
+
+
+def test_batched_over_configs():
+    """Test many curves and targets in one call."""
+    rng = np.random.default_rng(3)
+    n = 500
+    result = calculate_batch(
+        BatchParameters.from_columns(
+            base_rate=rng.uniform(0.005, 0.02, n),
+            soft_pity_start_after=rng.integers(50, 75, n),
+            hard_pity=np.full(n, 90),
+            rate_increase=rng.uniform(0.01, 0.1, n),
+        )
+    )
+    table = percentile_table(result.cumulative, [50, 90, 99])
+
+    assert table.shape == (n, 3)
+    for row in (0, 17, n - 1):
+        expected = [linear_scan(result.cumulative[row], t) for t in (0.5, 0.9, 0.99)]
+        assert table[row].tolist() == expected
+    assert np.all(np.diff(table, axis=1) >= 0)
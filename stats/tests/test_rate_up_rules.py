@@ -0,0 +1,93 @@
+# Tests for core/config/rate_up_rules.py and core/rate_up.py
+import dataclasses
+
+import numpy as np
+import pytest
+
+from core.common.errors import ValidationError
+from core.config.banner_config import BANNER_CONFIGS
+from core.config.rate_up_rules import (
+    ALWAYS_FEATURED,
+    EPITOMIZED_PATH,
+    FIFTY_FIFTY,
+    RateUpRule,
+    legacy_rule,
+)
+from core.copies import single_copy_pmf
+from core.markov import MarkovChainEngine
+from core.rate_up import compile_rule, rate_up_machine
+from core.simulation import MonteCarloSimulator
+from core.summary import rate_up_attempt_moments
+
+WEAPON = BANNER_CONFIGS["Genshin Impact"]["weapon"]
+
+
+@pytest.mark.parametrize(
+    "rule",
+    [FIFTY_FIFTY, EPITOMIZED_PATH, ALWAYS_FEATURED, RateUpRule(0.5, 3, 2, 0.1, 2)],
+)
+def test_outcomes_sum_to_one(rule):
+    """Test that every state's win and loss chances add up to one."""
+    machine = compile_rule(rule)
+    np.testing.assert_allclose(machine.win_chance + machine.loss.sum(axis=1), 1.0)
+
+
+def test_legacy_fields_compile_to_original_machine():
+    """Test the rule derived from rate_up_chance and guaranteed_rate_up."""
+    machine = compile_rule(legacy_rule(0.5, True))
+    np.testing.assert_array_equal(machine.win_chance, [0.5, 1.0])
+    np.testing.assert_array_equal(machine.loss, [[0.0, 0.5], [0.0, 0.0]])
+    assert machine.guaranteed_state == 1
+
+    no_guarantee = rate_up_machine(BANNER_CONFIGS["Star Rail"]["standard"])
+    assert no_guarantee.n_states == 1
+    assert no_guarantee.guaranteed_state == 0
+
+
+def test_machines_are_cached_and_read_only():
+    """Test that equal rules share one compiled, immutable machine."""
+    machine = compile_rule(RateUpRule(featured_chance=0.5, guarantee_after=1))
+    assert machine is compile_rule(FIFTY_FIFTY)
+    with pytest.raises(ValueError):
+        machine.win_chance[0] = 1.0
+    for array in (machine.win_chance, machine.loss):
+        with pytest.raises(ValueError):
+            array.flags.writeable = True
+
+
+def test_epitomized_path_needs_at_most_two_5stars():
+    """Test the fate point cap on the Genshin weapon banner."""
+    mean, variance = rate_up_attempt_moments([WEAPON])
+    # The wanted weapon comes first with chance 0.75 / 2
+    assert mean[0] == pytest.approx(2 - 0.375)
+    assert variance[0] == pytest.approx(0.375 * 0.625)
+
+
+def test_capture_raises_featured_chance():
+    """Test that capturing lost rolls increases the win chance."""
+    rule = dataclasses.replace(FIFTY_FIFTY, capture_chance=0.1)
+    assert compile_rule(rule).win_chance[0] == pytest.approx(0.55)
+
+
+def test_engines_agree_on_rule_banner():
+    """Test Markov chain, FFT and simulation on the Epitomized Path banner."""
+    pmf = single_copy_pmf(WEAPON)
+    markov = MarkovChainEngine(WEAPON).rate_up_cumulative(len(pmf) - 1)
+    np.testing.assert_allclose(np.cumsum(pmf)[1:], markov, atol=1e-12)
+    assert len(pmf) <= 2 * WEAPON.hard_pity + 1
+
+    simulated = MonteCarloSimulator(WEAPON, 100_000, seed=3).run()
+    simulated_cdf = np.cumsum(simulated.rate_up_pmf())
+    np.testing.assert_allclose(
+        simulated_cdf, np.cumsum(pmf)[: len(simulated_cdf)], atol=0.01
+    )
+
+
+def test_invalid_rules():
+    """Test rule and config validation."""
+    with pytest.raises(ValidationError):
+        RateUpRule(featured_chance=1.5)
+    with pytest.raises(ValidationError):
+        RateUpRule(featured_count=0)
+    with pytest.raises(ValidationError):
+        dataclasses.replace(WEAPON, rate_up_rule="50/50")
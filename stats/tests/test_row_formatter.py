@@ -0,0 +1,98 @@
+# Tests for output/row_formatter.py
+from decimal import ROUND_HALF_UP, Decimal
+
+import numpy as np
+import pytest
+
+from core.calculator import ProbabilityCalculator
+from core.config.banner_config import BANNER_CONFIGS
+from output.row_formatter import (
+    DECIMAL_PLACES,
+    MAX_VECTOR_DECIMAL_PLACES,
+    format_column,
+    format_number,
+    format_results,
+)
+
+
+def reference_format(value, decimal_places=DECIMAL_PLACES):
+    """Original per-cell formatter: float -> str -> Decimal -> quantize -> str."""
+    return str(
+        Decimal(str(value)).quantize(
+            Decimal("0." + "0" * decimal_places), rounding=ROUND_HALF_UP
+        )
+    )
+
+
+@pytest.fixture
+def sample_values():
+    """Return shipped curves, random values, exact ties and signed zeros."""
+    rng = np.random.default_rng(11)
+    curves = [
+        value
+        for banners in BANNER_CONFIGS.values()
+        for config in banners.values()
+        for curve in ProbabilityCalculator(config).calculate_probabilities()
+        for value in curve
+    ]
+    ties = [float(f"{k}.5e-{DECIMAL_PLACES}") for k in range(0, 2000)]
+    ties += [float(f"0.{k:06d}5") for k in range(0, 2000)]
+    return np.array(
+        curves
+        + rng.random(5000).tolist()
+        + (rng.random(2000) * 1e-5).tolist()
+        + (rng.standard_normal(1000) * 10).tolist()
+        + ties
+        + [0.0, -0.0, 1.0, -1e-9, 0.9999995, 0.0000005, 123456.7890125]
+    )
+
+
+def test_format_column_matches_reference(sample_values):
+    """Test that the bulk formatter reproduces the original output exactly."""
+    expected = [reference_format(value) for value in sample_values.tolist()]
+    assert format_column(sample_values) == expected
+
+
+@pytest.mark.parametrize("decimal_places", [0, 1, 3, 6, 8, 12])
+def test_format_column_matches_format_number(sample_values, decimal_places):
+    """Test the bulk formatter against format_number at other precisions."""
+    expected = [format_number(v, decimal_places) for v in sample_values.tolist()]
+    assert format_column(sample_values, decimal_places) == expected
+
+
+@pytest.mark.filterwarnings("error")
+@pytest.mark.parametrize(
+    "decimal_places",
+    [MAX_VECTOR_DECIMAL_PLACES, MAX_VECTOR_DECIMAL_PLACES + 1, 19, 25],
+)
+def test_format_column_high_precision(sample_values, decimal_places):
+    """Test precisions past int64 range without overflow or cast warnings."""
+    # Decimal's default 28-digit context bounds the magnitudes at 25 places
+    values = sample_values[np.abs(sample_values) < 10]
+    expected = [format_number(v, decimal_places) for v in values.tolist()]
+    assert format_column(values, decimal_places) == expected
+
+
+def test_format_number_uses_fixed_point():
+    """Test that small values stay in fixed-point notation past 6 places."""
+    assert format_number(0.0, 8) == "0.00000000"
+    assert format_number(1.5e-7, 8) == "0.00000015"
+    assert format_number(0.0000005) == "0.000001"
+
+
+def test_format_results_precision():
+    """Test the decimal places knob of format_results."""
+    config = BANNER_CONFIGS["Star Rail"]["limited"]
+    curves = ProbabilityCalculator(config).calculate_probabilities()
+    rows = format_results(config, *curves, decimal_places=9)
+
+    assert len(rows) == config.hard_pity
+    assert rows[0] == [
+        "Star Rail",
+        "Limited",
+        "1",
+        "0.006000000",
+        "0.006000000",
+        "0.006000000",
+    ]
+    assert rows[-1][3] == "1.000000000"
@@ -1,14 +1,23 @@
 """Pytest tests for BannerStatisticsRunner."""
 
+import csv
+import dataclasses
+import json
 import os
+import subprocess
+import sys
 import tempfile
 from typing import List
 
 import pytest
 
+from core.cache import CalculationCache
+from core.calculator import ProbabilityCalculator
+from core.common.errors import ConfigurationError
 from core.config.banner_config import BannerConfig, BANNER_CONFIGS, GAME_TYPES
+from output.binary_store import BinaryResultStore
 from output.csv_handler import CSVOutputHandler
-from runner import BannerStatisticsRunner
+from runner import BannerStatisticsRunner, main, select_configs
 
 
 class MockCSVOutputHandler(CSVOutputHandler):
@@ -40,6 +49,9 @@ class MockCSVOutputHandler(CSVOutputHandler):
             header: CSV headers
             rows: CSV data rows
         """
+        # Rows may be a one-shot generator; keep a copy for the assertions
+        rows = list(rows)
+
         # First, call the parent method to maintain original validation
         super().write(filename, header, rows)
 
@@ -76,8 +88,8 @@ def temp_output_dir():
 
 
 @pytest.fixture
-def mock_output_handler():
-    """Create a mock CSV output handler."""
+def mock_output_handler(temp_output_dir):
+    """Create a mock CSV output handler writing under a temporary directory."""
     return MockCSVOutputHandler()
 
 
@@ -179,10 +191,336 @@ def test_error_handling(mock_output_handler, mock_logger, monkeypatch):
         output_handler=mock_output_handler, logger=mock_logger
     )
 
-    # Run should not raise an exception
-    runner.run()
+    # Run should not raise an exception, only report the failure
+    assert not runner.run()
 
     # Verify error was logged
     assert any(
         "Error calculating probabilities" in log for log in mock_logger.error_logs
     )
+
+
+def test_run_shares_cache_across_games(mock_output_handler, mock_logger):
+    """Test that banners with identical numbers are computed once."""
+    runner = BannerStatisticsRunner(
+        output_handler=mock_output_handler, logger=mock_logger
+    )
+    runner.run()
+
+    total = sum(len(banners) for banners in BANNER_CONFIGS.values())
+    assert runner.cache.misses < total
+    assert runner.cache.hits + runner.cache.misses == total
+    assert any("Calculation cache" in log for log in mock_logger.info_logs)
+
+
+def read_outputs(directory):
+    """Read every CSV written under a directory."""
+    outputs = {}
+    for name in sorted(os.listdir(directory)):
+        with open(os.path.join(directory, name), encoding="utf-8") as file:
+            outputs[name] = file.read()
+    return outputs
+
+
+@pytest.mark.parametrize("executor_type", ["process", "thread"])
+def test_parallel_run_matches_serial(temp_output_dir, mock_logger, executor_type):
+    """Test that parallel runs write the same files as serial runs."""
+    BannerStatisticsRunner(logger=mock_logger).run()
+    serial = read_outputs("csv_output")
+
+    BannerStatisticsRunner(
+        logger=mock_logger, workers=3, executor_type=executor_type
+    ).run()
+    assert read_outputs("csv_output") == serial
+
+
+def test_parallel_error_isolation(mock_output_handler, mock_logger, monkeypatch):
+    """Test that a failing banner does not stop the others in parallel mode."""
+    original = ProbabilityCalculator.calculate_probabilities
+
+    def failing_for_weapon(self):
+        if self.config.banner_type == "Weapon":
+            raise ValueError("Test calculation error")
+        return original(self)
+
+    monkeypatch.setattr(
+        "core.calculator.ProbabilityCalculator.calculate_probabilities",
+        failing_for_weapon,
+    )
+    runner = BannerStatisticsRunner(
+        output_handler=mock_output_handler,
+        logger=mock_logger,
+        workers=2,
+        executor_type="thread",
+    )
+    runner.run()
+
+    assert len(mock_output_handler.written_files) == len(BANNER_CONFIGS)
+    assert any("weapon" in log for log in mock_logger.error_logs)
+    genshin_rows = mock_output_handler.rows[1]
+    assert {row[1] for row in genshin_rows} == {"Standard", "Limited"}
+
+
+def test_parallel_run_recomputes_evicted_cache_entries(
+    mock_output_handler, mock_logger
+):
+    """Test that a key cached at submit time but evicted later is recomputed."""
+    weapon = BANNER_CONFIGS["Genshin Impact"]["weapon"]
+    cache = CalculationCache(2)
+    cache.curves(weapon)
+    runner = BannerStatisticsRunner(
+        output_handler=mock_output_handler,
+        logger=mock_logger,
+        cache=cache,
+        workers=2,
+        executor_type="thread",
+    )
+    runner.run()
+
+    assert mock_logger.error_logs == []
+    genshin_rows = mock_output_handler.rows[1]
+    assert {row[1] for row in genshin_rows} == {"Standard", "Limited", "Weapon"}
+
+
+def test_invalid_executor_type():
+    """Test that unknown executor types are rejected."""
+    with pytest.raises(ConfigurationError):
+        BannerStatisticsRunner(executor_type="fiber")
+
+
+def test_binary_output_format(temp_output_dir, mock_logger):
+    """Test that the npy format writes loadable curves for every game."""
+    BannerStatisticsRunner(logger=mock_logger, output_format="npy").run()
+
+    store = BinaryResultStore(os.path.join("csv_output", "genshin_impact_all_banners"))
+    assert store.banners() == list(BANNER_CONFIGS["Genshin Impact"])
+    assert store.curve("weapon")[-1] == pytest.approx(1.0)
+    assert not any(name.endswith(".csv") for name in os.listdir("csv_output"))
+
+
+def test_incremental_run_skips_unchanged_games(tmp_path, mock_logger):
+    """Test that a second incremental run only rewrites changed games."""
+    configs = {
+        game: dict(BANNER_CONFIGS[game]) for game in ("Star Rail", "Genshin Impact")
+    }
+    output_dir = str(tmp_path / "out")
+    BannerStatisticsRunner(
+        banner_configs=configs, output_dir=output_dir, incremental=True
+    ).run()
+
+    configs["Genshin Impact"]["weapon"] = dataclasses.replace(
+        configs["Genshin Impact"]["weapon"], hard_pity=79
+    )
+    handler = MockCSVOutputHandler()
+    BannerStatisticsRunner(
+        banner_configs=configs,
+        output_handler=handler,
+        logger=mock_logger,
+        output_dir=output_dir,
+        incremental=True,
+    ).run()
+
+    assert handler.written_files == [
+        os.path.join(output_dir, "genshin_impact_all_banners.csv")
+    ]
+    assert "Skipping Star Rail: inputs unchanged" in mock_logger.info_logs
+
+
+@pytest.mark.parametrize(
+    "output_format, removed",
+    [
+        ("csv", "star_rail_all_banners_summary.csv"),
+        ("npy", "star_rail_all_banners.json"),
+    ],
+)
+def test_incremental_run_restores_companion_files(
+    tmp_path, mock_logger, output_format, removed
+):
+    """Test that a deleted companion file makes its game stale."""
+    output_dir = tmp_path / "out"
+    options = {
+        "banner_configs": {"Star Rail": BANNER_CONFIGS["Star Rail"]},
+        "logger": mock_logger,
+        "output_dir": str(output_dir),
+        "output_format": output_format,
+        "incremental": True,
+        "summary": True,
+    }
+    BannerStatisticsRunner(**options).run()
+    (output_dir / removed).unlink()
+
+    BannerStatisticsRunner(**options).run()
+
+    assert (output_dir / removed).exists()
+    assert "Skipping Star Rail: inputs unchanged" not in mock_logger.info_logs
+
+
+def test_full_run_keeps_manifest_in_step(tmp_path, mock_logger):
+    """Test that a full run between incremental runs updates the manifest."""
+    output_dir = str(tmp_path / "out")
+    star_rail = dict(BANNER_CONFIGS["Star Rail"])
+    options = {"logger": mock_logger, "output_dir": output_dir}
+    BannerStatisticsRunner(
+        banner_configs={"Star Rail": star_rail}, incremental=True, **options
+    ).run()
+    BannerStatisticsRunner(
+        banner_configs={"Star Rail": {"limited": star_rail["limited"]}}, **options
+    ).run()
+
+    handler = MockCSVOutputHandler()
+    BannerStatisticsRunner(
+        banner_configs={"Star Rail": star_rail},
+        output_handler=handler,
+        incremental=True,
+        **options,
+    ).run()
+
+    assert handler.written_files == [
+        os.path.join(output_dir, "star_rail_all_banners.csv")
+    ]
+    with open(handler.written_files[0]) as file:
+        banners = {row[1] for row in list(csv.reader(file))[1:]}
+    assert len(banners) == len(star_rail)
+
+
+def test_run_metrics(tmp_path, mock_logger):
+    """Test per-stage metrics of a run and their JSON dump."""
+    output_dir = tmp_path / "out"
+    metrics_path = tmp_path / "metrics.json"
+    runner = BannerStatisticsRunner(
+        banner_configs={"Star Rail": BANNER_CONFIGS["Star Rail"]},
+        logger=mock_logger,
+        output_dir=str(output_dir),
+        metrics_path=str(metrics_path),
+    )
+    runner.run()
+
+    metrics = runner.metrics
+    for banner_type, config in BANNER_CONFIGS["Star Rail"].items():
+        assert (
+            metrics.get("calculate", "Star Rail", banner_type).rows == config.hard_pity
+        )
+        assert metrics.get("format", "Star Rail", banner_type).rows == config.hard_pity
+    write = metrics.get("write", "Star Rail")
+    csv_path = output_dir / "star_rail_all_banners.csv"
+    assert write.bytes_written == csv_path.stat().st_size
+    assert write.rows == sum(c.hard_pity for c in BANNER_CONFIGS["Star Rail"].values())
+    assert metrics.get("config_load").rows == len(BANNER_CONFIGS["Star Rail"])
+    assert metrics.get("run").calls == 1
+
+    data = json.loads(metrics_path.read_text())
+    assert {total["stage"] for total in data["totals"]} == {
+        "run",
+        "config_load",
+        "calculate",
+        "format",
+        "write",
+    }
+
+
+def test_metrics_disabled_by_default(mock_output_handler, mock_logger):
+    """Test that a default run records no metrics."""
+    runner = BannerStatisticsRunner(
+        output_handler=mock_output_handler, logger=mock_logger
+    )
+    runner.run()
+    assert runner.metrics.records() == []
+
+
+def test_summary_output(tmp_path, mock_logger):
+    """Test that the opt-in summary CSV has one row per banner."""
+    output_dir = tmp_path / "out"
+    BannerStatisticsRunner(
+        banner_configs={"Genshin Impact": BANNER_CONFIGS["Genshin Impact"]},
+        logger=mock_logger,
+        output_dir=str(output_dir),
+        summary=True,
+    ).run()
+
+    with open(output_dir / "genshin_impact_all_banners_summary.csv") as file:
+        rows = list(csv.reader(file))
+    assert rows[0][:4] == [
+        "Game",
+        "Banner Type",
+        "Expected Pulls",
+        "Standard Deviation",
+    ]
+    assert [row[1] for row in rows[1:]] == ["Standard", "Limited", "Weapon"]
+    assert float(rows[2][2]) == pytest.approx(62.062, abs=1e-3)
+
+
+def test_select_configs():
+    """Test game and banner selection by name and file stem."""
+    selected = select_configs(
+        BANNER_CONFIGS, ["star_rail", "GENSHIN IMPACT"], ["limited"]
+    )
+    assert {game: list(banners) for game, banners in selected.items()} == {
+        "Star Rail": ["limited"],
+        "Genshin Impact": ["limited"],
+    }
+    assert list(select_configs(BANNER_CONFIGS, banners=["bangboo"])) == [
+        "Zenless Zone Zero"
+    ]
+    assert select_configs(BANNER_CONFIGS) == BANNER_CONFIGS
+    with pytest.raises(ConfigurationError):
+        select_configs(BANNER_CONFIGS, ["Unknown"])
+    with pytest.raises(ConfigurationError):
+        select_configs(BANNER_CONFIGS, ["star_rail"], ["bangboo"])
+
+
+def test_cli_runs_selected_banner(tmp_path, capsys):
+    """Test that the CLI writes only the selected game and banner."""
+    output_dir = tmp_path / "out"
+    assert main(["-g", "star_rail", "-b", "light_cone", "-o", str(output_dir)]) == 0
+    assert os.listdir(output_dir) == ["star_rail_all_banners.csv"]
+    with open(output_dir / "star_rail_all_banners.csv") as file:
+        banners = {row[1] for row in list(csv.reader(file))[1:]}
+    assert banners == {"Light Cone"}
+
+    assert main(["--list", "-g", "Zenless Zone Zero"]) == 0
+    assert capsys.readouterr().out.startswith("Zenless Zone Zero: standard")
+    with pytest.raises(SystemExit):
+        main(["-b", "missing"])
+
+
+@pytest.mark.parametrize(
+    "option",
+    [
+        ["--workers", "0"],
+        ["--decimal-places", "-1"],
+        ["--decimal-places", "21"],
+        ["--horizon", "5"],
+        ["--lookup", "--horizon", "-1"],
+    ],
+)
+def test_cli_rejects_invalid_options(option, capsys):
+    """Test that out-of-range or inapplicable options are usage errors."""
+    with pytest.raises(SystemExit) as excinfo:
+        main(["--list", *option])
+    assert excinfo.value.code == 2
+    assert f"{option[-2]} " in capsys.readouterr().err.splitlines()[-1]
+
+
+def test_cli_exit_code_reports_failures(tmp_path, monkeypatch):
+    """Test that run() and the CLI report a game that was not written."""
+
+    def fail(*args, **kwargs):
+        raise Exception("Test calculation error")
+
+    monkeypatch.setattr(
+        "core.calculator.ProbabilityCalculator.calculate_probabilities", fail
+    )
+    assert main(["-g", "star_rail", "-o", str(tmp_path)]) == 1
+
+
+def test_cli_imports_numpy_lazily():
+    """Test that importing the runner and listing banners skip NumPy."""
+    code = (
+        "import sys, runner; runner.main(['--list']); assert 'numpy' not in sys.modules"
+    )
+    subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        capture_output=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
@@ -0,0 +1,163 @@
+# Tests for service/app.py and service/server.py
+import asyncio
+import json
+from typing import Dict, List, Tuple
+
+import pytest
+
+from core.conditional import ConditionalTable
+from core.config.banner_config import BANNER_CONFIGS
+from service.app import HTTPError, StatsApp
+from service.server import StatsServer
+
+LIMITED = BANNER_CONFIGS["Genshin Impact"]["limited"]
+
+
+@pytest.fixture(scope="module")
+def app():
+    """Fixture providing an app over the shipped configs."""
+    return StatsApp()
+
+
+def _json(app: StatsApp, target: str):
+    return json.loads(app.handle(target).body)
+
+
+def test_probability_matches_conditional_table(app):
+    """Test that probability queries match a ConditionalTable."""
+    result = _json(
+        app,
+        "/probability?game=genshin_impact&banner=limited&pity=40&pulls=60"
+        "&guaranteed=true",
+    )
+    table = ConditionalTable(LIMITED)
+    assert result["any_5star"] == pytest.approx(table.any_five_star_probability(40, 60))
+    assert result["rate_up"] == pytest.approx(table.probability(40, 60, True))
+
+
+def test_quantiles_and_banner_listing(app):
+    """Test quantile queries and the banner index."""
+    result = _json(app, "/quantiles?game=Genshin Impact&banner=limited&p=50&p=99")
+    assert result["percentiles"] == [50.0, 99.0]
+    assert result["any_5star"][0] < result["any_5star"][1] <= LIMITED.hard_pity
+    assert result["rate_up"][1] <= 2 * LIMITED.hard_pity
+    assert "bangboo" in _json(app, "/banners")["zenless_zone_zero"]
+
+
+def test_responses_are_cached_by_normalized_query(app):
+    """Test that reordered query parameters reuse one cached response."""
+    first = app.handle("/curve?game=star_rail&banner=standard")
+    second = app.handle("/curve?banner=standard&game=star_rail")
+    assert second is first
+    assert first.etag.startswith('"')
+
+
+def test_table_horizon_grows_geometrically():
+    """Test that growing pull queries reuse tables with doubled horizons."""
+    app = StatsApp()
+    config = BANNER_CONFIGS["Star Rail"]["limited"]
+    horizons = []
+    for pulls in range(config.hard_pity, 4 * config.hard_pity + 1, 7):
+        app.handle(f"/probability?game=star_rail&banner=limited&pulls={pulls}")
+        table = app.tables.get(config)
+        assert table is not None
+        if not horizons or horizons[-1] != table.max_pulls:
+            horizons.append(table.max_pulls)
+    assert horizons == [2 * config.hard_pity, 4 * config.hard_pity]
+
+
+@pytest.mark.parametrize(
+    "target,status",
+    [
+        ("/missing", 404),
+        ("/curve?game=star_rail&banner=missing", 404),
+        ("/curve?game=star_rail", 400),
+        ("/probability?game=star_rail&banner=limited&pulls=x", 400),
+        ("/probability?game=star_rail&banner=limited&pulls=10&pity=500", 400),
+        ("/quantiles?game=star_rail&banner=limited&p=101", 400),
+    ],
+)
+def test_invalid_queries(app, target, status):
+    """Test the status of unknown routes and invalid parameters."""
+    with pytest.raises(HTTPError) as excinfo:
+        app.handle(target)
+    assert excinfo.value.status == status
+
+
+async def _exchange(
+    port: int, requests: List[bytes]
+) -> List[Tuple[int, Dict[str, str], bytes]]:
+    """Send requests on one connection and read every response."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    responses = []
+    for request in requests:
+        writer.write(request)
+        head = await reader.readuntil(b"\r\n\r\n")
+        status_line, *lines = head.decode("latin-1").split("\r\n")
+        headers = {}
+        for line in lines:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.lower()] = value.strip()
+        body = await reader.readexactly(int(headers["content-length"]))
+        responses.append((int(status_line.split(" ")[1]), headers, body))
+    assert await reader.read() == b""
+    writer.close()
+    return responses
+
+
+def test_keep_alive_etag_and_close():
+    """Test several requests on one connection, a 304, a 405 and closing."""
+
+    async def scenario():
+        server = await StatsServer(StatsApp()).start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        target = "/probability?game=star_rail&banner=limited&pulls=90"
+        get = f"GET {target} HTTP/1.1\r\n\r\n".encode()
+        post = b"POST / HTTP/1.1\r\nConnection: close\r\n\r\n"
+        async with server:
+            first = await _exchange(port, [get, post])
+            conditional = (
+                f"GET {target} HTTP/1.1\r\nIf-None-Match: {first[0][1]['etag']}\r\n"
+                "Connection: close\r\n\r\n"
+            ).encode()
+            second = await _exchange(port, [get, conditional])
+        return first + second
+
+    responses = asyncio.run(scenario())
+    assert [response[0] for response in responses] == [200, 405, 200, 304]
+    assert json.loads(responses[0][2])["pulls"] == 90
+    assert responses[2][1]["connection"] == "keep-alive"
+    assert responses[3][1]["connection"] == "close"
+    assert responses[3][2] == b""
+
+
+def test_request_bodies_are_framed():
+    """Test that a body is skipped on keep-alive and bad framing closes."""
+
+    async def scenario():
+        server = await StatsServer(StatsApp()).start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        smuggled = b"GET /health HTTP/1.1\r\n\r\n"
+        post = b"POST / HTTP/1.1\r\nContent-Length: %d\r\n\r\n%s" % (
+            len(smuggled),
+            smuggled,
+        )
+        get = b"GET /banners HTTP/1.1\r\nConnection: close\r\n\r\n"
+        async with server:
+            framed = await _exchange(port, [post, get])
+            rejected = [
+                (await _exchange(port, [request]))[0]
+                for request in (
+                    b"POST / HTTP/1.1\r\nContent-Length: 100000\r\n\r\n",
+                    b"POST / HTTP/1.1\r\nContent-Length: -1\r\n\r\n",
+                    b"POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n",
+                )
+            ]
+        return framed, rejected
+
+    framed, rejected = asyncio.run(scenario())
+    assert [response[0] for response in framed] == [405, 200]
+    assert "genshin_impact" in json.loads(framed[1][2])
+    assert [response[0] for response in rejected] == [413, 400, 501]
+    assert all(response[1]["connection"] == "close" for response in rejected)
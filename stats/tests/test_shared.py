@@ -0,0 +1,88 @@
+# Tests for core/shared.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from core.calculator import ProbabilityCalculator
+from core.config.banner_config import BANNER_CONFIGS
+from core.shared import SharedCalculator
+
+LIMITED = BANNER_CONFIGS["Star Rail"]["limited"]
+
+
+@pytest.fixture
+def slow_calculator(monkeypatch):
+    """Fixture holding calculations until released, failing for chosen banners."""
+    release = threading.Event()
+    started = []
+    failing = set()
+    original = ProbabilityCalculator.calculate_probability_arrays
+
+    def calculate(self):
+        started.append(self.config)
+        release.wait(timeout=5)
+        if self.config in failing:
+            raise RuntimeError("failed")
+        return original(self)
+
+    monkeypatch.setattr(
+        ProbabilityCalculator, "calculate_probability_arrays", calculate
+    )
+    return release, started, failing
+
+
+def test_concurrent_requests_share_one_computation(slow_calculator):
+    """Test that identical in-flight requests wait for a single computation."""
+    release, started, _ = slow_calculator
+    shared = SharedCalculator()
+    genshin = BANNER_CONFIGS["Genshin Impact"]["limited"]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [
+            pool.submit(shared.curves, LIMITED if i % 2 else genshin) for i in range(8)
+        ]
+        while not started:
+            pass
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert len(started) == 1  # Equal parameters across games share one key
+    assert shared.computations == 1
+    assert all(result is results[0] for result in results)
+    expected = ProbabilityCalculator(LIMITED).calculate_probability_arrays()
+    for array, reference in zip(results[0], expected):
+        np.testing.assert_array_equal(array, reference)
+
+
+def test_published_arrays_are_read_only():
+    """Test that cached curves cannot be modified in place."""
+    shared = SharedCalculator()
+    per_roll, cumulative, _ = shared.curves(LIMITED)
+    with pytest.raises(ValueError):
+        per_roll[0] = 1.0
+    with pytest.raises(ValueError):
+        cumulative.flags.writeable = True
+    assert shared.curves(LIMITED)[1] is cumulative
+    assert len(shared) == 1
+    shared.clear()
+    assert len(shared) == 0
+
+
+def test_failure_reaches_every_waiter_and_is_not_cached(slow_calculator):
+    """Test that an error is raised to all waiters and the key is retried."""
+    release, started, failing = slow_calculator
+    failing.add(LIMITED)
+    shared = SharedCalculator()
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(shared.curves, LIMITED) for _ in range(4)]
+        while not started:
+            pass
+        release.set()
+        for future in futures:
+            with pytest.raises(RuntimeError):
+                future.result()
+
+    assert shared.computations == 0
+    assert len(shared) == 0
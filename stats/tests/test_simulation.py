@@ -0,0 +1,56 @@
+# Tests for core/simulation.py
+import numpy as np
+import pytest
+
+from core.config.banner_config import BANNER_CONFIGS
+from core.copies import single_copy_pmf
+from core.calculator import ProbabilityCalculator
+from core.simulation import MonteCarloSimulator
+
+
+@pytest.fixture
+def limited_config():
+    """Return the Star Rail limited banner config."""
+    return BANNER_CONFIGS["Star Rail"]["limited"]
+
+
+def test_results_independent_of_workers(limited_config):
+    """Test that worker count does not change the result."""
+    serial = MonteCarloSimulator(
+        limited_config, 10_000, chunk_size=1_000, seed=42, workers=1
+    ).run()
+    parallel = MonteCarloSimulator(
+        limited_config, 10_000, chunk_size=1_000, seed=42, workers=3
+    ).run()
+
+    np.testing.assert_array_equal(
+        serial.first_5star_counts, parallel.first_5star_counts
+    )
+    np.testing.assert_array_equal(serial.rate_up_counts, parallel.rate_up_counts)
+    assert serial.seed == 42
+
+
+def test_histograms_count_every_sample(limited_config):
+    """Test that every sequence lands in both histograms."""
+    result = MonteCarloSimulator(limited_config, 2_500, chunk_size=1_000, seed=1).run()
+
+    assert result.first_5star_counts.sum() == 2_500
+    assert result.rate_up_counts.sum() == 2_500
+    assert len(result.first_5star_counts) <= limited_config.hard_pity + 1
+    assert len(result.rate_up_counts) <= 2 * limited_config.hard_pity + 1
+
+
+def test_simulation_matches_analytic_curves(limited_config):
+    """Test the empirical CDFs against the analytic ones."""
+    result = MonteCarloSimulator(limited_config, 200_000, seed=7).run()
+    _, cumulative, _ = ProbabilityCalculator(
+        limited_config
+    ).calculate_probability_arrays()
+    rate_up_cdf = np.cumsum(single_copy_pmf(limited_config))
+
+    first_cdf = np.cumsum(result.first_5star_pmf())[1:]
+    np.testing.assert_allclose(first_cdf, cumulative[: len(first_cdf)], atol=0.01)
+    simulated_rate_up = np.cumsum(result.rate_up_pmf())
+    np.testing.assert_allclose(
+        simulated_rate_up, rate_up_cdf[: len(simulated_rate_up)], atol=0.01
+    )
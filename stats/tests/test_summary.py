@@ -0,0 +1,84 @@
+# Tests for core/summary.py
+import dataclasses
+
+import numpy as np
+import pytest
+
+from core.calculator import ProbabilityCalculator
+from core.common.errors import CalculationError
+from core.config.banner_config import BANNER_CONFIGS
+from core.copies import single_copy_pmf
+from core.quantiles import percentile_table
+from core.summary import (
+    pad_curves,
+    rate_up_attempt_moments,
+    summarize_pmf,
+    summarize_rate_up,
+)
+
+CONFIGS = [config for banners in BANNER_CONFIGS.values() for config in banners.values()]
+
+
+@pytest.fixture
+def first_5star():
+    """Return the zero-padded first 5* PMFs of every shipped banner."""
+    return pad_curves(
+        [ProbabilityCalculator(c).calculate_probabilities()[2] for c in CONFIGS]
+    )
+
+
+def test_summary_matches_direct_sums():
+    """Test mean, std and percentiles against a direct pass over one PMF."""
+    config = BANNER_CONFIGS["Star Rail"]["limited"]
+    _, cumulative, pmf = ProbabilityCalculator(config).calculate_probabilities()
+    mean = sum(roll * p for roll, p in enumerate(pmf, 1))
+    variance = sum((roll - mean) ** 2 * p for roll, p in enumerate(pmf, 1))
+
+    summary = summarize_pmf(pmf)
+
+    assert summary.mean[0] == pytest.approx(mean)
+    assert summary.std[0] == pytest.approx(variance**0.5)
+    np.testing.assert_array_equal(
+        summary.percentile_pulls[0], percentile_table(cumulative)
+    )
+
+
+def test_batch_matches_single(first_5star):
+    """Test that a padded batch summarizes each banner like a single one."""
+    batch = summarize_pmf(first_5star)
+    for i, config in enumerate(CONFIGS):
+        pmf = ProbabilityCalculator(config).calculate_probabilities()[2]
+        single = summarize_pmf(pmf)
+        assert batch.mean[i] == pytest.approx(single.mean[0])
+        assert batch.std[i] == pytest.approx(single.std[0])
+
+
+def test_rate_up_attempt_moments():
+    """Test N for a 50/50 guarantee and for a geometric loop."""
+    limited = BANNER_CONFIGS["Genshin Impact"]["limited"]
+    standard = BANNER_CONFIGS["Genshin Impact"]["standard"]
+    mean, variance = rate_up_attempt_moments([limited, standard])
+    np.testing.assert_allclose(mean, [1.5, 2.0])
+    np.testing.assert_allclose(variance, [0.25, 2.0])
+
+
+def test_rate_up_summary_matches_single_copy_pmf(first_5star):
+    """Test closed-form rate-up moments against the full single-copy PMF."""
+    summary = summarize_rate_up(CONFIGS, first_5star)
+    for i, config in enumerate(CONFIGS):
+        pmf = single_copy_pmf(config)
+        pulls = np.arange(len(pmf))
+        mean = pulls @ pmf
+        assert summary.mean[i] == pytest.approx(mean, rel=1e-9)
+        assert summary.std[i] == pytest.approx(
+            np.sqrt((pulls - mean) ** 2 @ pmf), rel=1e-6
+        )
+
+
+def test_unreachable_rate_up():
+    """Test that a rate-up unit that can never drop is rejected."""
+    config = dataclasses.replace(
+        BANNER_CONFIGS["Star Rail"]["standard"], rate_up_chance=0.0
+    )
+    with pytest.raises(CalculationError):
+        rate_up_attempt_moments([config])